@@ -1,5 +1,6 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+import ipaddress
 import sys
 import os
 from datetime import datetime
@@ -7,12 +8,21 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.port_scanner import PortScanner
-from core.network_discovery import NetworkDiscovery, get_local_network
+from core.network_discovery import (DEFAULT_TCP_PORTS, DISCOVERY_METHODS, MAX_DISCOVERY_PORTS, NetworkDiscovery,
+                                    get_local_network)
 from core.threaded_scanner import FastPortScanner
+from core.port_spec import PortSet
+from core.service_registry import service_name
+from core.rate_limiter import configure_limiter
+from app.config.settings import get_config
 
 app = Flask(__name__)
 CORS(app)  
 
+# Eşzamanlı istekler süreç geneli prob sınırını adil paylaşır
+_config = get_config()
+configure_limiter(_config.PROBE_RATE_LIMIT, _config.MAX_INFLIGHT_PROBES)
+
 API_VERSION = "1.0.0"
 SERVICE_NAME = "NetScout API"
 
@@ -53,7 +63,15 @@ def scan_ports_api():
             }), 400
         
         target_ip = data.get('target', '127.0.0.1')
-        ports = data.get('ports', [80, 443, 22, 21, 3000])
+        try:
+            ports = PortSet.coerce(data.get('ports', [80, 443, 22, 21, 3000]))
+            if ports.udp:
+                raise ValueError('UDP portları taranmıyor, yalnızca TCP')
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'success': False,
+                'error': f'Geçersiz port listesi: {e}'
+            }), 400
         
         print(f"🎯 Port tarama: {target_ip} -> {ports}")
         
@@ -62,7 +80,7 @@ def scan_ports_api():
         
         return jsonify({
             'success': True,
-            'data': results,
+            'data': {**results, 'port_states': results['port_states'].to_dict()},
             'message': f'{len(results["open_ports"])} açık port bulundu',
             'timestamp': datetime.now().isoformat()
         })
@@ -101,6 +119,7 @@ def fast_scan_api():
                 'target': target_ip,
                 'port_range': f'{start_port}-{end_port}',
                 'open_ports': open_ports,
+                'services': {port: service_name(port) for port in open_ports},
                 'total_found': len(open_ports),
                 'threads_used': max_threads
             },
@@ -121,21 +140,52 @@ def network_discovery_api():
         data = request.get_json() or {}
         network = data.get('network', None)
         
+        method = data.get('method', 'auto')
+        if method not in DISCOVERY_METHODS:
+            return jsonify({
+                'success': False,
+                'error': f"Geçersiz keşif yöntemi, izin verilenler: {', '.join(DISCOVERY_METHODS)}"
+            }), 400
+        
+        tcp_ports = data.get('tcp_ports')
+        try:
+            if network:
+                network = str(ipaddress.IPv4Network(str(network).strip(), strict=False))
+            if tcp_ports:
+                port_set = PortSet.coerce(tcp_ports)
+                if port_set.udp:
+                    raise ValueError('UDP portları keşifte kullanılmıyor, yalnızca TCP')
+                if len(port_set) > MAX_DISCOVERY_PORTS:
+                    raise ValueError(f'En fazla {MAX_DISCOVERY_PORTS} TCP keşif portu verilebilir')
+                tcp_ports = list(port_set)
+            else:
+                tcp_ports = DEFAULT_TCP_PORTS
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'success': False,
+                'error': f'Geçersiz keşif parametresi: {e}'
+            }), 400
+        
         if not network:
             network, local_ip = get_local_network()
             print(f"🏠 Otomatik ağ tespiti: {network}")
         else:
             print(f"🌐 Manuel ağ tarama: {network}")
         
-        discovery = NetworkDiscovery()
-        alive_hosts = discovery.discover_network(network)
+        resolve_names = bool(data.get('resolve_hostnames', False))
+        
+        discovery = NetworkDiscovery(method=method, tcp_ports=tcp_ports)
+        alive_hosts = discovery.discover_network(network, resolve_names=resolve_names)
+        hostnames = discovery.resolve_hostnames(alive_hosts) if resolve_names and alive_hosts else {}
         
         return jsonify({
             'success': True,
             'data': {
                 'network': network,
                 'alive_hosts': alive_hosts,
-                'total_hosts': len(alive_hosts)
+                'total_hosts': len(alive_hosts),
+                'discovery_method': discovery.method,
+                'hostnames': hostnames
             },
             'message': f'{len(alive_hosts)} canlı host bulundu',
             'timestamp': datetime.now().isoformat()
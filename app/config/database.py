@@ -1,5 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import inspect, literal, text
 
 
 db=SQLAlchemy()
@@ -19,9 +20,44 @@ def init_database(app):
         try:
             db.create_all()
             print("🗄️  Database tables created successfully!")
+            added = upgrade_schema()
+            if added:
+                print(f"🔧 Database upgraded, added columns: {', '.join(added)}")
         except Exception as e:
             print(f"❌ Database creation error: {e}")
 
+def upgrade_schema():
+    """Add model columns missing from existing tables.
+
+    ``db.create_all()`` only creates missing tables; a database created by an
+    older version keeps its old columns and every query on the model fails
+    with "no such column". New columns are nullable or have a scalar default,
+    so they can be added in place with ``ALTER TABLE ... ADD COLUMN``; rows
+    that already exist get the default.
+    """
+    dialect = db.engine.dialect
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=dialect)}"
+            if column.default is not None and column.default.is_scalar:
+                value = literal(column.default.arg, column.type).compile(
+                    dialect=dialect, compile_kwargs={'literal_binds': True})
+                ddl += f" DEFAULT {value}"
+            with db.engine.begin() as connection:
+                connection.execute(text(ddl))
+            added.append(f"{table.name}.{column.name}")
+    
+    return added
+
 
 class DatabaseManager:
     """Database operations manager"""
@@ -7,6 +7,18 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour
+    CHECKPOINT_DIR = os.environ.get('CHECKPOINT_DIR') or 'checkpoints'
+    CHECKPOINT_INTERVAL = float(os.environ.get('CHECKPOINT_INTERVAL') or 15)  # seconds
+    RESULT_CACHE_TTL = float(os.environ.get('RESULT_CACHE_TTL') or 60)  # seconds, 0 disables
+    RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE') or 100000)  # (ip, port) entries
+    # Process-wide probe limits shared fairly by concurrent scans; 0 = unlimited
+    PROBE_RATE_LIMIT = float(os.environ.get('PROBE_RATE_LIMIT') or 0)  # probes/sec
+    MAX_INFLIGHT_PROBES = int(os.environ.get('MAX_INFLIGHT_PROBES') or 4096)
+    # Reverse DNS (PTR) cache shared by discovery runs
+    REVERSE_DNS_TTL = float(os.environ.get('REVERSE_DNS_TTL') or 3600)  # seconds, names found
+    REVERSE_DNS_NEGATIVE_TTL = float(os.environ.get('REVERSE_DNS_NEGATIVE_TTL') or 300)  # seconds, no PTR record
+    REVERSE_DNS_WORKERS = int(os.environ.get('REVERSE_DNS_WORKERS') or 256)  # concurrent lookups
+    REVERSE_DNS_DEADLINE = float(os.environ.get('REVERSE_DNS_DEADLINE') or 10)  # seconds per discovery run
 
 
 class DevelopmentConfig(Config):
@@ -3,7 +3,7 @@ from email import message
 from flask import Blueprint, request, jsonify
 from typing import Dict, Any
 from app.services.scan_service import ScanService
-from app.schemas.scan_dtos import PortScanRequest, FastScanRequest
+from app.schemas.scan_dtos import PortScanRequest, FastScanRequest, MultiScanRequest, RescanRequest, NetworkDiscoveryRequest
 from app.schemas.response_dtos import SuccessResponse, ErrorResponse
 from app.utils.logger import controller_logger, log_function_entry, log_function_exit
 from pydantic import ValidationError
@@ -116,6 +116,143 @@ def create_fast_scan():
             details={"error": str(e)}
         ).dict()), 500
 
+@scan_bp.route('/multi', methods=['POST'])
+def create_multi_scan():
+    """Multi-target interleaved scan endpoint"""
+    log_function_entry(controller_logger, "create_multi_scan")
+    
+    try:
+        controller_logger.info("📨 Processing multi-target scan request...")
+        data = request.get_json()
+        
+        if not data:
+            return jsonify(ErrorResponse(
+                message="JSON data required",
+                error_code="NO_DATA"
+            ).dict()), 400
+        
+        controller_logger.info("🔍 Validating multi-target scan request...")
+        try:
+            scan_request = MultiScanRequest(**data)
+            controller_logger.info(f"✅ Multi-target validation passed: {len(scan_request.targets)} target specs")
+        except ValidationError as e:
+            controller_logger.error(f"❌ Multi-target validation failed: {e}")
+            return jsonify(ErrorResponse(
+                message="Validation failed",
+                error_code="VALIDATION_ERROR",
+                details=e.errors()
+            ).dict()), 400
+        
+        controller_logger.info(f"⚡ Starting multi-target scan: {scan_request.start_port}-{scan_request.end_port}")
+        result = scan_service.create_multi_scan(scan_request)
+        controller_logger.info(f"🎯 Multi-target scan completed: {result['targets_scanned']} targets")
+        
+        response = SuccessResponse(
+            message=f"Multi-target scan completed for {result['targets_scanned']} targets",
+            data=result
+        )
+        
+        log_function_exit(controller_logger, "create_multi_scan", "SuccessResponse")
+        return jsonify(response.dict()), 200
+        
+    except Exception as e:
+        controller_logger.error(f"💥 Multi-target scan error: {str(e)}")
+        return jsonify(ErrorResponse(
+            message="Multi-target scan failed",
+            error_code="SCAN_ERROR",
+            details={"error": str(e)}
+        ).dict()), 500
+
+@scan_bp.route('/rescan', methods=['POST'])
+def create_rescan():
+    """Incremental rescan endpoint: diff against each target's previous scan"""
+    log_function_entry(controller_logger, "create_rescan")
+    
+    try:
+        controller_logger.info("📨 Processing rescan request...")
+        data = request.get_json()
+        
+        if not data:
+            return jsonify(ErrorResponse(
+                message="JSON data required",
+                error_code="NO_DATA"
+            ).dict()), 400
+        
+        controller_logger.info("🔍 Validating rescan request...")
+        try:
+            scan_request = RescanRequest(**data)
+            controller_logger.info(f"✅ Rescan validation passed: {len(scan_request.targets)} target specs")
+        except ValidationError as e:
+            controller_logger.error(f"❌ Rescan validation failed: {e}")
+            return jsonify(ErrorResponse(
+                message="Validation failed",
+                error_code="VALIDATION_ERROR",
+                details=e.errors()
+            ).dict()), 400
+        
+        controller_logger.info(f"⚡ Starting rescan: sample ratio {scan_request.sample_ratio}")
+        result = scan_service.create_rescan(scan_request)
+        controller_logger.info(f"🎯 Rescan completed: {len(result['changes'])} targets changed")
+        
+        response = SuccessResponse(
+            message=f"Rescan completed for {result['targets_scanned']} targets, "
+                    f"{len(result['changes'])} changed",
+            data=result
+        )
+        
+        log_function_exit(controller_logger, "create_rescan", "SuccessResponse")
+        return jsonify(response.dict()), 200
+        
+    except Exception as e:
+        controller_logger.error(f"💥 Rescan error: {str(e)}")
+        return jsonify(ErrorResponse(
+            message="Rescan failed",
+            error_code="SCAN_ERROR",
+            details={"error": str(e)}
+        ).dict()), 500
+
+@scan_bp.route('/discover', methods=['POST'])
+def create_network_discovery():
+    """Network discovery endpoint: sweep a range and store alive hosts with their hostnames"""
+    log_function_entry(controller_logger, "create_network_discovery")
+    
+    try:
+        controller_logger.info("📨 Processing network discovery request...")
+        data = request.get_json(silent=True) or {}
+        
+        controller_logger.info("🔍 Validating discovery request...")
+        try:
+            discovery_request = NetworkDiscoveryRequest(**data)
+            controller_logger.info(f"✅ Discovery validation passed: {discovery_request.network or 'local network'}")
+        except ValidationError as e:
+            controller_logger.error(f"❌ Discovery validation failed: {e}")
+            return jsonify(ErrorResponse(
+                message="Validation failed",
+                error_code="VALIDATION_ERROR",
+                details=e.errors()
+            ).dict()), 400
+        
+        controller_logger.info(f"⚡ Starting network discovery: method {discovery_request.method}")
+        result = scan_service.create_network_discovery(discovery_request)
+        controller_logger.info(f"🎯 Discovery completed: {result['total_hosts_found']} hosts, "
+                               f"{result['hostnames_resolved']} hostnames")
+        
+        response = SuccessResponse(
+            message=f"{result['total_hosts_found']} alive hosts found in {result['network_range']}",
+            data=result
+        )
+        
+        log_function_exit(controller_logger, "create_network_discovery", "SuccessResponse")
+        return jsonify(response.dict()), 200
+        
+    except Exception as e:
+        controller_logger.error(f"💥 Network discovery error: {str(e)}")
+        return jsonify(ErrorResponse(
+            message="Network discovery failed",
+            error_code="DISCOVERY_ERROR",
+            details={"error": str(e)}
+        ).dict()), 500
+
 @scan_bp.route('/history', methods=['GET'])
 def get_scan_history():
     """Get scan history"""
@@ -180,6 +317,68 @@ def get_scan_by_id(scan_id: int):
             error_code="FETCH_ERROR"
         ).dict()), 500
 
+@scan_bp.route('/<int:scan_id>/resume', methods=['POST'])
+def resume_scan(scan_id: int):
+    """Resume an interrupted scan from its checkpoint"""
+    log_function_entry(controller_logger, "resume_scan", scan_id=scan_id)
+    
+    try:
+        controller_logger.info(f"♻️  Resuming scan ID: {scan_id}")
+        result = scan_service.resume_scan(scan_id)
+        
+        if not result:
+            controller_logger.warning(f"⚠️  Scan not found: {scan_id}")
+            return jsonify(ErrorResponse(
+                message=f"Scan {scan_id} not found",
+                error_code="NOT_FOUND"
+            ).dict()), 404
+        
+        response = SuccessResponse(
+            message=f"Scan {scan_id} resumed and completed",
+            data=result
+        )
+        
+        log_function_exit(controller_logger, "resume_scan", "SuccessResponse")
+        return jsonify(response.dict()), 200
+        
+    except ValueError as e:
+        controller_logger.warning(f"⚠️  Scan {scan_id} cannot be resumed: {str(e)}")
+        return jsonify(ErrorResponse(
+            message=str(e),
+            error_code="NOT_RESUMABLE"
+        ).dict()), 409
+    except Exception as e:
+        controller_logger.error(f"💥 Resume error: {str(e)}")
+        return jsonify(ErrorResponse(
+            message="Failed to resume scan",
+            error_code="SCAN_ERROR",
+            details={"error": str(e)}
+        ).dict()), 500
+
+@scan_bp.route('/resumable', methods=['GET'])
+def get_resumable_scans():
+    """List interrupted scans that have a checkpoint"""
+    log_function_entry(controller_logger, "get_resumable_scans")
+    
+    try:
+        scans = scan_service.get_resumable_scans()
+        controller_logger.info(f"✅ Found {len(scans)} resumable scans")
+        
+        response = SuccessResponse(
+            message=f"Retrieved {len(scans)} resumable scans",
+            data={'scans': scans, 'count': len(scans)}
+        )
+        
+        log_function_exit(controller_logger, "get_resumable_scans", f"{len(scans)} scans")
+        return jsonify(response.dict()), 200
+        
+    except Exception as e:
+        controller_logger.error(f"💥 Resumable scans fetch error: {str(e)}")
+        return jsonify(ErrorResponse(
+            message="Failed to fetch resumable scans",
+            error_code="FETCH_ERROR"
+        ).dict()), 500
+
 @scan_bp.route('/stats', methods=['GET'])
 def get_scan_statistics():
     """Get scan statistics"""
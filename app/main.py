@@ -101,6 +101,8 @@ def register_error_handlers(app: Flask, logger):
                 '/api/info',
                 '/api/v2/scan/ports',
                 '/api/v2/scan/fast',
+                '/api/v2/scan/multi',
+                '/api/v2/scan/discover',
                 '/api/v2/scan/history'
             ]
         }), 404
@@ -152,6 +154,8 @@ if __name__ == '__main__':
     print("   GET  /api/info             - API information")
     print("   POST /api/v2/scan/ports    - Port scanning")
     print("   POST /api/v2/scan/fast     - Fast scanning")
+    print("   POST /api/v2/scan/multi    - Multi-target scanning")
+    print("   POST /api/v2/scan/discover - Network discovery with hostnames")
     print("   GET  /api/v2/scan/history  - Scan history")
     print("   GET  /api/v2/scan/<id>     - Specific scan")
     print("   GET  /api/v2/scan/stats    - Statistics")
@@ -2,6 +2,10 @@ from datetime import datetime
 from app.models.base import BaseModel
 from app.config.database import db
 import json
+from core.checkpoint import checkpoint_in_use
+from core.port_spec import PortSet
+from core.port_state import PortStateMap
+from core.streaming import CLOSED, OPEN
 
 class Scan(BaseModel):
     """Port scan model"""
@@ -17,12 +21,25 @@ class Scan(BaseModel):
     ports_scanned = db.Column(db.Text, nullable=True)  # JSON string
     start_port = db.Column(db.Integer, nullable=True)
     end_port = db.Column(db.Integer, nullable=True)
+    port_spec = db.Column(db.Text, nullable=True)  # Port spec: taranan portlar ("1-1024,8080")
     threads_used = db.Column(db.Integer, default=1)
     
+    # İlerleme ve AIMD eşzamanlılık penceresi
+    probes_completed = db.Column(db.Integer, default=0)
+    congestion_window = db.Column(db.Integer, nullable=True)
+    peak_congestion_window = db.Column(db.Integer, nullable=True)
+    
     # Sonuçlar
     open_ports = db.Column(db.Text, nullable=True)  # JSON string
     closed_ports_count = db.Column(db.Integer, default=0)
+    port_states = db.Column(db.Text, nullable=True)  # JSON string: [[start, end, state], ...]
+    banners = db.Column(db.Text, nullable=True)  # JSON string: {port: banner}
     total_ports_scanned = db.Column(db.Integer, default=0)
+    host_down = db.Column(db.Boolean, default=False)  # Cevapsız host; kalan problar atlandı
+    time_budget = db.Column(db.Float, nullable=True)  # Saniye cinsinden süre bütçesi
+    unscanned_ports = db.Column(db.Text, nullable=True)  # Port spec: "8000-8100,9000" (bütçe bitti)
+    checkpoint_file = db.Column(db.String(255), nullable=True)  # Devam için checkpoint dosyası
+    port_diff = db.Column(db.Text, nullable=True)  # JSON: {previous_scan_id, opened, closed, first_seen}
     
     # Timing
     start_time = db.Column(db.DateTime, default=datetime.utcnow)
@@ -58,6 +75,70 @@ class Scan(BaseModel):
             return json.loads(self.ports_scanned)
         return []
     
+    def set_port_states(self, port_states):
+        """Set per-port states as run-length encoded JSON"""
+        self.port_states = json.dumps(port_states.to_runs()) if port_states is not None else None
+    
+    def get_port_states(self):
+        """Get per-port states as a PortStateMap"""
+        if self.port_states:
+            return PortStateMap.from_runs(json.loads(self.port_states))
+        return None
+    
+    def set_banners(self, banners):
+        """Set service banners ({port: banner}) as JSON"""
+        self.banners = json.dumps({str(port): banner for port, banner in banners.items()}) if banners else None
+    
+    def get_banners(self):
+        """Get service banners as {port: banner}"""
+        if self.banners:
+            return {int(port): banner for port, banner in json.loads(self.banners).items()}
+        return {}
+    
+    def get_probed_ports(self):
+        """Get the ports this scan actually probed as a PortSet (None if unknown)"""
+        if self.port_spec:
+            ports = PortSet.parse(self.port_spec)
+        elif self.start_port and self.end_port:
+            ports = PortSet.from_range(self.start_port, self.end_port)
+        else:
+            return None
+        unscanned = self.get_unscanned_ports()
+        return ports - unscanned if unscanned else ports
+    
+    def get_baseline_states(self):
+        """Get port states to diff a rescan against; ports the scan never probed stay unknown"""
+        states = self.get_port_states()
+        if states is not None:
+            return states
+        # Per-port states not stored: every probed port was open or not open.
+        # A down host's remaining probes were skipped, so only its open ports are known
+        probed = None if self.host_down else self.get_probed_ports()
+        states = PortStateMap.from_runs([[start, end, CLOSED] for start, end in probed.tcp] if probed else [])
+        for port in self.get_open_ports():
+            states.set(port, OPEN)
+        return states
+    
+    def set_port_diff(self, port_diff):
+        """Set the diff against the previous scan as JSON"""
+        self.port_diff = json.dumps(port_diff) if port_diff is not None else None
+    
+    def get_port_diff(self):
+        """Get the diff against the previous scan"""
+        if self.port_diff:
+            return json.loads(self.port_diff)
+        return None
+    
+    def set_unscanned_ports(self, port_set):
+        """Set ports left unscanned (time budget) as a compact port spec"""
+        self.unscanned_ports = port_set.to_spec() if port_set else None
+    
+    def get_unscanned_ports(self):
+        """Get ports left unscanned as a PortSet"""
+        if self.unscanned_ports:
+            return PortSet.parse(self.unscanned_ports)
+        return None
+    
     def complete_scan(self, open_ports, total_scanned=0):
         """Mark scan as completed"""
         self.end_time = datetime.utcnow()
@@ -85,10 +166,22 @@ class Scan(BaseModel):
             'ports_scanned': self.get_scanned_ports(),
             'start_port': self.start_port,
             'end_port': self.end_port,
+            'port_spec': self.port_spec,
             'threads_used': self.threads_used,
+            'probes_completed': self.probes_completed,
+            'congestion_window': self.congestion_window,
+            'peak_congestion_window': self.peak_congestion_window,
             'open_ports': self.get_open_ports(),
             'closed_ports_count': self.closed_ports_count,
+            'port_states': json.loads(self.port_states) if self.port_states else None,
+            'banners': self.get_banners(),
             'total_ports_scanned': self.total_ports_scanned,
+            'host_down': self.host_down,
+            'time_budget': self.time_budget,
+            'unscanned_ports': self.unscanned_ports,
+            'resumable': (bool(self.checkpoint_file) and self.status != 'completed'
+                          and not checkpoint_in_use(self.checkpoint_file)),
+            'port_diff': self.get_port_diff(),
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'duration_seconds': self.duration_seconds,
@@ -3,6 +3,8 @@ from datetime import datetime, timedelta
 from sqlalchemy import desc, func
 from app.repositories.base_repository import BaseRepository
 from app.models.scan import Scan
+from core.port_spec import PortSet
+from core.port_state import PortStateMap
 
 class ScanRepository(BaseRepository):
     def __init__(self):
@@ -29,6 +31,20 @@ class ScanRepository(BaseRepository):
             Scan.is_active == True
         ).order_by(desc(Scan.created_at)).all()
     
+    def get_latest_completed_scans(self, target_ips: List[str], chunk_size: int = 500) -> Dict[str, Scan]:
+        # Hedef başına en son tamamlanan tarama; id'ler oluşturma sırasıyla artar
+        latest = {}
+        target_ips = list(target_ips)
+        for start in range(0, len(target_ips), chunk_size):
+            latest_ids = self.session.query(func.max(Scan.id)).filter(
+                Scan.target_ip.in_(target_ips[start:start + chunk_size]),
+                Scan.status == 'completed',
+                Scan.is_active == True
+            ).group_by(Scan.target_ip)
+            for scan in self.session.query(Scan).filter(Scan.id.in_(latest_ids)):
+                latest[scan.target_ip] = scan
+        return latest
+    
     def get_scans_by_status(self, status: str) -> List[Scan]:
         return self.get_by_filter(status=status)
     
@@ -41,7 +57,27 @@ class ScanRepository(BaseRepository):
     def get_failed_scans(self) -> List[Scan]:
         return self.get_scans_by_status('failed')
     
-    def complete_scan(self, scan_id: int, open_ports: List[int], total_scanned: int = 0) -> Optional[Scan]:
+    def get_resumable_scans(self) -> List[Scan]:
+        return self.session.query(Scan).filter(
+            Scan.status != 'completed',
+            Scan.checkpoint_file.isnot(None),
+            Scan.is_active == True
+        ).order_by(desc(Scan.created_at)).all()
+    
+    def update_progress(self, scan_id: int, probes_completed: int, congestion_window: int,
+                        peak_congestion_window: Optional[int] = None) -> Optional[Scan]:
+        return self.update(
+            scan_id,
+            probes_completed=probes_completed,
+            congestion_window=congestion_window,
+            peak_congestion_window=peak_congestion_window or congestion_window
+        )
+    
+    def complete_scan(self, scan_id: int, open_ports: List[int], total_scanned: int = 0,
+                      port_states: Optional[PortStateMap] = None,
+                      banners: Optional[Dict[int, str]] = None,
+                      unscanned_ports: Optional[PortSet] = None,
+                      port_diff: Optional[Dict[str, Any]] = None, **extra) -> Optional[Scan]:
         scan = self.get_by_id(scan_id)
         if not scan:
             return None
@@ -54,11 +90,20 @@ class ScanRepository(BaseRepository):
             'end_time': end_time,
             'duration_seconds': duration,
             'total_ports_scanned': total_scanned,
-            'closed_ports_count': total_scanned - len(open_ports)
+            'closed_ports_count': total_scanned - len(open_ports),
+            **extra
         }
         
         # Set open ports as JSON
         scan.set_open_ports(open_ports)
+        if port_states is not None:
+            scan.set_port_states(port_states)
+        if banners:
+            scan.set_banners(banners)
+        if unscanned_ports:
+            scan.set_unscanned_ports(unscanned_ports)
+        if port_diff is not None:
+            scan.set_port_diff(port_diff)
         
         return self.update(scan_id, **updates)
     
@@ -1,11 +1,40 @@
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import List, Optional, Dict, Any, Union
+from pydantic import BaseModel, Field, root_validator, validator
 from datetime import datetime
+import ipaddress
+
+from core.port_spec import PortSet
+from core.network_discovery import DISCOVERY_METHODS, MAX_DISCOVERY_PORTS
+
+SCAN_ENGINES = ('threaded', 'async', 'batch', 'sharded', 'syn')
+MAX_MULTI_SCAN_TARGETS = 65536
+MAX_THREADS = 500
+MAX_CONCURRENCY = 20000
+MAX_SYN_RATE = 1000000
+
+def tcp_port_spec(value) -> str:
+    """Normalize a port spec to a canonical string; validated per range, not per port.
+    
+    The connect/SYN engines only probe TCP, so UDP entries are rejected
+    instead of being silently dropped.
+    """
+    port_set = PortSet.coerce(value)
+    if port_set.udp:
+        raise ValueError('UDP ports are not supported by the TCP scan engines')
+    if not port_set.tcp:
+        raise ValueError('Port spec must include TCP ports')
+    return port_set.to_spec()
 
 class PortScanRequest(BaseModel):
     target: str = Field(..., description="Target IP address or hostname")
-    ports: List[int] = Field(..., description="List of ports to scan")
+    ports: Union[str, List[int]] = Field(..., description="Port spec (e.g. '1-1024,3306,top:100') or list of ports")
     timeout: Optional[int] = Field(3, ge=1, le=30, description="Timeout in seconds")
+    order_by_likelihood: Optional[bool] = Field(False, description="Probe the most likely open ports first")
+    grab_banners: Optional[bool] = Field(False, description="Read service banners from open ports while the scan runs")
+    banner_timeout: Optional[float] = Field(2.0, ge=0.1, le=10, description="Read timeout for banner grabbing, separate from the probe timeout")
+    host_down_after: Optional[int] = Field(0, ge=0, le=10000, description="Mark a host down after this many unanswered probes with no reply seen and a failed liveness check (0 disables)")
+    fast_teardown: Optional[bool] = Field(True, description="Close probe sockets with RST (SO_LINGER 0) so local ports skip TIME_WAIT")
+    use_cache: Optional[bool] = Field(True, description="Serve ports probed within the cache TTL from the result cache instead of re-probing")
     
     @validator('target')
     def validate_target(cls, v):
@@ -17,28 +46,203 @@ class PortScanRequest(BaseModel):
     def validate_ports(cls, v):
         if not v:
             raise ValueError('Ports list cannot be empty')
-        for port in v:
-            if not (1 <= port <= 65535):
-                raise ValueError(f'Port {port} must be between 1 and 65535')
-        return v
+        return tcp_port_spec(v)
+    
+    @property
+    def port_set(self) -> PortSet:
+        return PortSet.parse(self.ports)
 
 class FastScanRequest(BaseModel):
     target: str = Field(..., description="Target IP address")
     start_port: int = Field(1, ge=1, le=65535, description="Start port")
     end_port: int = Field(1000, ge=1, le=65535, description="End port")
-    threads: Optional[int] = Field(100, ge=1, le=500, description="Number of threads")
-    timeout: Optional[int] = Field(1, ge=1, le=10, description="Timeout per port")
+    ports: Optional[str] = Field(None, description="Port spec (e.g. '1-1024,3306,top:100'); overrides start_port/end_port")
+    top_ports: Optional[int] = Field(None, ge=1, le=65535, description="Scan the N most likely open ports (probed in likelihood order)")
+    order_by_likelihood: Optional[bool] = Field(False, description="Probe the most likely open ports first")
+    threads: Optional[int] = Field(100, ge=1, le=MAX_THREADS, description="Number of threads")
+    timeout: Optional[int] = Field(1, ge=1, le=10, description="Initial timeout per port, before RTT samples exist")
+    min_timeout: Optional[float] = Field(0.1, ge=0.01, le=10, description="Lower bound for RTT-derived probe timeouts")
+    max_timeout: Optional[float] = Field(3.0, ge=0.05, le=30, description="Upper bound for RTT-derived probe timeouts")
+    adaptive_concurrency: Optional[bool] = Field(True, description="Grow/shrink in-flight probes (AIMD) up to threads/concurrency")
+    engine: Optional[str] = Field('threaded', description="Scan engine: 'threaded', 'async', 'batch', 'sharded' or 'syn' (requires root)")
+    concurrency: Optional[int] = Field(5000, ge=1, le=MAX_CONCURRENCY, description="Max in-flight connects (async/batch engines, per worker for sharded)")
+    workers: Optional[int] = Field(None, ge=1, le=256, description="Worker processes for the sharded engine (default: CPU count)")
+    syn_rate: Optional[int] = Field(10000, ge=1, le=MAX_SYN_RATE, description="SYN packets per second (syn engine)")
+    grab_banners: Optional[bool] = Field(False, description="Read service banners from open ports while the scan runs")
+    banner_timeout: Optional[float] = Field(2.0, ge=0.1, le=10, description="Read timeout for banner grabbing, separate from the probe timeout")
+    host_down_after: Optional[int] = Field(0, ge=0, le=10000, description="Mark a host down after this many unanswered probes with no reply seen and a failed liveness check (0 disables)")
+    fast_teardown: Optional[bool] = Field(True, description="Close probe sockets with RST (SO_LINGER 0) so local ports skip TIME_WAIT")
+    checkpoint: Optional[bool] = Field(True, description="Periodically save progress so the scan can be resumed after a crash or restart (not for the syn engine)")
+    time_budget: Optional[float] = Field(None, ge=1, le=86400, description="Wall-clock budget in seconds; concurrency, timeouts and port order are tuned to fit and unscanned ports are recorded")
+    
+    @validator('engine')
+    def validate_engine(cls, v):
+        if v not in SCAN_ENGINES:
+            raise ValueError(f"Engine must be one of: {', '.join(SCAN_ENGINES)}")
+        return v
+    
+    @validator('max_timeout')
+    def validate_timeout_bounds(cls, v, values):
+        if values.get('min_timeout') is not None and v < values['min_timeout']:
+            raise ValueError('max_timeout must not be less than min_timeout')
+        return v
     
-    @validator('end_port')
-    def validate_port_range(cls, v, values):
-        if 'start_port' in values and v <= values['start_port']:
+    @root_validator(skip_on_failure=True)
+    def validate_port_range(cls, values):
+        # start_port/end_port are ignored when a spec or top_ports is given
+        if not values.get('ports') and not values.get('top_ports') and values['end_port'] <= values['start_port']:
             raise ValueError('End port must be greater than start port')
+        return values
+    
+    @validator('ports')
+    def validate_port_spec(cls, v):
+        if v is None:
+            return v
+        return tcp_port_spec(v)
+    
+    @property
+    def port_set(self) -> PortSet:
+        if self.top_ports:
+            top = PortSet.parse(f"top:{self.top_ports}")
+            return top | PortSet.parse(self.ports) if self.ports else top
+        if self.ports:
+            return PortSet.parse(self.ports)
+        return PortSet.from_range(self.start_port, self.end_port)
+    
+    @property
+    def likelihood_ordered(self) -> bool:
+        # Bütçeli taramada süre biterse kalan portlar en az olası olanlar olmalı
+        return bool(self.order_by_likelihood or self.top_ports or self.time_budget)
+
+class MultiScanRequest(BaseModel):
+    targets: List[str] = Field(..., description="Target IPs, hostnames or CIDR blocks")
+    start_port: int = Field(1, ge=1, le=65535, description="Start port")
+    end_port: int = Field(1000, ge=1, le=65535, description="End port")
+    ports: Optional[str] = Field(None, description="Port spec (e.g. '1-1024,3306,top:100'); overrides start_port/end_port")
+    top_ports: Optional[int] = Field(None, ge=1, le=65535, description="Scan the N most likely open ports (probed in likelihood order)")
+    order_by_likelihood: Optional[bool] = Field(False, description="Probe the most likely open ports first")
+    engine: Optional[str] = Field('batch', description="Scan engine: 'threaded', 'async', 'batch', 'sharded' or 'syn' (requires root)")
+    threads: Optional[int] = Field(100, ge=1, le=MAX_THREADS, description="Number of threads (threaded engine)")
+    concurrency: Optional[int] = Field(5000, ge=1, le=MAX_CONCURRENCY, description="Max in-flight connects (async/batch engines, per worker for sharded)")
+    workers: Optional[int] = Field(None, ge=1, le=256, description="Worker processes for the sharded engine (default: CPU count)")
+    syn_rate: Optional[int] = Field(10000, ge=1, le=MAX_SYN_RATE, description="SYN packets per second (syn engine)")
+    grab_banners: Optional[bool] = Field(False, description="Read service banners from open ports while the scan runs")
+    banner_timeout: Optional[float] = Field(2.0, ge=0.1, le=10, description="Read timeout for banner grabbing, separate from the probe timeout")
+    host_down_after: Optional[int] = Field(0, ge=0, le=10000, description="Mark a host down after this many unanswered probes with no reply seen and a failed liveness check (0 disables)")
+    fast_teardown: Optional[bool] = Field(True, description="Close probe sockets with RST (SO_LINGER 0) so local ports skip TIME_WAIT")
+    checkpoint: Optional[bool] = Field(True, description="Periodically save progress so the scan can be resumed after a crash or restart (not for the syn engine)")
+    timeout: Optional[int] = Field(1, ge=1, le=10, description="Initial timeout per port, before RTT samples exist")
+    min_timeout: Optional[float] = Field(0.1, ge=0.01, le=10, description="Lower bound for RTT-derived probe timeouts")
+    max_timeout: Optional[float] = Field(3.0, ge=0.05, le=30, description="Upper bound for RTT-derived probe timeouts")
+    adaptive_concurrency: Optional[bool] = Field(True, description="Grow/shrink in-flight probes (AIMD) up to threads/concurrency")
+    seed: Optional[int] = Field(None, description="Seed for the probe permutation")
+    
+    @validator('targets')
+    def validate_targets(cls, v):
+        targets = [t.strip() for t in v if t and t.strip()]
+        if not targets:
+            raise ValueError('Targets list cannot be empty')
+        
+        total = 0
+        for target in targets:
+            try:
+                total += ipaddress.ip_network(target, strict=False).num_addresses
+            except ValueError:
+                total += 1
+        if total > MAX_MULTI_SCAN_TARGETS:
+            raise ValueError(f'Targets expand to {total} hosts, maximum is {MAX_MULTI_SCAN_TARGETS}')
+        return targets
+    
+    @validator('engine')
+    def validate_engine(cls, v):
+        if v not in SCAN_ENGINES:
+            raise ValueError(f"Engine must be one of: {', '.join(SCAN_ENGINES)}")
+        return v
+    
+    @validator('max_timeout')
+    def validate_timeout_bounds(cls, v, values):
+        if values.get('min_timeout') is not None and v < values['min_timeout']:
+            raise ValueError('max_timeout must not be less than min_timeout')
+        return v
+    
+    @root_validator(skip_on_failure=True)
+    def validate_port_range(cls, values):
+        # start_port/end_port are ignored when a spec or top_ports is given
+        if not values.get('ports') and not values.get('top_ports') and values['end_port'] < values['start_port']:
+            raise ValueError('End port must not be less than start port')
+        return values
+    
+    @validator('ports')
+    def validate_port_spec(cls, v):
+        if v is None:
+            return v
+        return tcp_port_spec(v)
+    
+    @property
+    def port_set(self) -> PortSet:
+        if self.top_ports:
+            top = PortSet.parse(f"top:{self.top_ports}")
+            return top | PortSet.parse(self.ports) if self.ports else top
+        if self.ports:
+            return PortSet.parse(self.ports)
+        return PortSet.from_range(self.start_port, self.end_port)
+    
+    @property
+    def likelihood_ordered(self) -> bool:
+        return bool(self.order_by_likelihood or self.top_ports)
+
+class RescanRequest(MultiScanRequest):
+    sample_ratio: Optional[float] = Field(1.0, gt=0, le=1, description="Fraction of the remaining port space probed after previously open ports are reconfirmed")
+    checkpoint: Optional[bool] = Field(False, description="Incremental rescans are short and not checkpointed")
+    
+    @validator('engine')
+    def validate_rescan_engine(cls, v):
+        # Sharded worker'lar yalnızca planlayıcıdan prob üretir
+        if v == 'sharded':
+            raise ValueError("Incremental rescans do not support the sharded engine")
+        return v
+    
+    @validator('checkpoint')
+    def validate_checkpoint(cls, v):
+        if v:
+            raise ValueError('Incremental rescans cannot be checkpointed')
         return v
 
 class NetworkDiscoveryRequest(BaseModel):
     network: Optional[str] = Field(None, description="Network range (e.g., 192.168.1.0/24)")
     timeout: Optional[int] = Field(1, ge=1, le=10, description="Ping timeout")
     threads: Optional[int] = Field(50, ge=1, le=200, description="Number of threads")
+    method: Optional[str] = Field('auto', description="'auto' (ICMP, then TCP for silent hosts), 'icmp' or 'tcp'")
+    tcp_ports: Optional[Union[str, List[int]]] = Field('22,80,443,3389', description="Ports where a SYN-ACK or RST proves a host is up")
+    resolve_hostnames: Optional[bool] = Field(True, description="Resolve PTR names of alive hosts (cached)")
+    
+    @validator('network')
+    def validate_network(cls, v):
+        if v is None:
+            return v
+        try:
+            return str(ipaddress.IPv4Network(v.strip(), strict=False))
+        except ValueError:
+            raise ValueError(f"Invalid IPv4 network: {v}")
+    
+    @validator('method')
+    def validate_method(cls, v):
+        if v not in DISCOVERY_METHODS:
+            raise ValueError(f"Discovery method must be one of: {', '.join(DISCOVERY_METHODS)}")
+        return v
+    
+    @validator('tcp_ports')
+    def validate_tcp_ports(cls, v):
+        if v is None:
+            return v
+        port_set = PortSet.coerce(v)
+        if len(port_set) > MAX_DISCOVERY_PORTS:
+            raise ValueError(f"At most {MAX_DISCOVERY_PORTS} TCP discovery ports are allowed")
+        return port_set.to_spec()
+    
+    @property
+    def tcp_port_list(self) -> List[int]:
+        return list(PortSet.parse(self.tcp_ports)) if self.tcp_ports else []
 
 class ScanResponse(BaseModel):
     scan_id: int
@@ -59,6 +263,8 @@ class PortInfo(BaseModel):
     service: str
     status: str = "open"
     banner: Optional[str] = None
+    product: Optional[str] = None
+    version: Optional[str] = None
 
 class ScanResultResponse(BaseModel):
     scan_id: int
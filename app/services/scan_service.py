@@ -1,27 +1,63 @@
 from typing import List, Optional, Dict, Any
 from app.repositories.scan_repository import ScanRepository
 from app.repositories.host_repository import HostRepository
-from app.schemas.scan_dtos import PortScanRequest, FastScanRequest
+import math
+import os
+import random
+import time
+from itertools import islice, zip_longest
+from app.config.settings import get_config
+from app.schemas.scan_dtos import (PortScanRequest, FastScanRequest, MultiScanRequest, RescanRequest,
+                                   NetworkDiscoveryRequest, MAX_THREADS, MAX_CONCURRENCY, MAX_SYN_RATE)
 from app.utils.logger import service_logger, log_function_entry, log_function_exit
 from core.port_scanner import PortScanner
 from core.threaded_scanner import FastPortScanner
+from core.async_scanner import AsyncPortScanner
+from core.batch_scanner import BatchPortScanner
+from core.scan_planner import ScanPlanner
+from core.sharded_scanner import ShardedScanner
+from core.syn_scanner import SynPortScanner
+from core.banner_grabber import BannerGrabber
+from core.scan_budget import ScanBudget
+from core.checkpoint import CheckpointInUse, ScanCheckpoint, checkpoint_in_use
+from core.network_discovery import NetworkDiscovery, get_local_network
+from core.reverse_dns import shared_resolver
+from core.result_cache import shared_cache
+from core.rate_limiter import configure_limiter
+from core.socket_limits import concurrency_cap, ephemeral_cap
+from core.streaming import CLOSED, FILTERED, OPEN, collect_open
+from core.port_state import UNKNOWN, PortStateMap
+from core.fingerprints import describe_service
+from core.port_spec import PortSet
+from core.top_ports import order_by_likelihood
 
 class ScanService:
     def __init__(self):
         self.scan_repo = ScanRepository()
         self.host_repo = HostRepository()
+        config = get_config()
+        self.checkpoint_dir = config.CHECKPOINT_DIR
+        self.checkpoint_interval = config.CHECKPOINT_INTERVAL
+        self.result_cache = shared_cache(config.RESULT_CACHE_TTL, config.RESULT_CACHE_SIZE)
+        self.resolver = shared_resolver(config.REVERSE_DNS_TTL, config.REVERSE_DNS_NEGATIVE_TTL,
+                                        workers=config.REVERSE_DNS_WORKERS)
+        self.dns_deadline = config.REVERSE_DNS_DEADLINE
+        limiter = configure_limiter(config.PROBE_RATE_LIMIT, config.MAX_INFLIGHT_PROBES)
+        service_logger.info(f"🚦 Probe limiter: {limiter.rate or 'unlimited'} probes/s, "
+                            f"{limiter.max_inflight or 'unlimited'} in flight")
         service_logger.info("🔧 ScanService initialized")
     
     def create_port_scan(self, request: PortScanRequest) -> Dict[str, Any]:
         log_function_entry(service_logger, "create_port_scan", 
-                          target=request.target, ports=len(request.ports))
+                          target=request.target, ports=request.ports)
         
         try:
             service_logger.info(f"📝 Creating scan record for {request.target}")
+            port_set = request.port_set
             scan = self.scan_repo.create_scan(
                 target_ip=request.target,
                 scan_type='port',
-                total_ports_scanned=len(request.ports)
+                total_ports_scanned=len(port_set)
             )
             service_logger.info(f"✅ Scan record created with ID: {scan.id}")
             
@@ -30,21 +66,38 @@ class ScanService:
             host = self.host_repo.find_or_create_host(request.target)
             service_logger.info(f"🏠 Host ready: {host.ip_address} (ID: {host.id})")
             
-            # 3. Execute scan
+            # 3. Serve recently probed ports from the result cache
+            grabber = self._banner_grabber(request)
+            ports = order_by_likelihood(port_set) if request.order_by_likelihood else port_set
+            cached = self._cached_results(request.target, ports, grabber) if request.use_cache else {}
+            if cached:
+                service_logger.info(f"🗃️  {len(cached)}/{len(port_set)} ports served from result cache")
+                ports = [port for port in ports if port not in cached]
+            
+            # 4. Execute scan
             service_logger.info(f"⚡ Starting port scan...")
-            scanner = PortScanner(timeout=request.timeout)
-            results = scanner.scan_ports(request.target, request.ports)
+            scanner = PortScanner(timeout=request.timeout, host_down_after=request.host_down_after,
+                                  fast_teardown=request.fast_teardown)
+            results = scanner.scan_ports(request.target, ports, banner_grabber=grabber)
             service_logger.info(f"🎯 Scan completed: {len(results['open_ports'])} open ports found")
+            if results['host_down']:
+                service_logger.warning(f"⚠️  {request.target} marked down, remaining probes skipped")
+            else:
+                self._cache_results(request.target, results)
+            self._merge_cached(results, cached)
             
-            # 4. Update scan with results
+            # 5. Update scan with results
             service_logger.info(f"💾 Saving scan results...")
             open_ports = [port['port'] for port in results['open_ports']]
-            self.scan_repo.complete_scan(scan.id, open_ports, len(request.ports))
+            banners = {port['port']: port['banner'] for port in results['open_ports'] if port.get('banner')}
+            self.scan_repo.complete_scan(scan.id, open_ports, len(port_set),
+                                         port_states=results['port_states'], banners=banners,
+                                         host_down=results['host_down'])
             service_logger.info(f"✅ Scan results saved")
             
-            # 5. Update host status
+            # 6. Update host status
             service_logger.info(f"🔄 Updating host status...")
-            self.host_repo.update_host_status(request.target, True)
+            self.host_repo.update_host_status(request.target, not results['host_down'])
             
             response = {
                 'scan_id': scan.id,
@@ -52,7 +105,10 @@ class ScanService:
                 'scan_type': 'port',
                 'status': 'completed',
                 'open_ports': results['open_ports'],
-                'total_ports_scanned': len(request.ports),
+                'total_ports_scanned': len(port_set),
+                'port_states': results['port_states'].to_dict(),
+                'cached_ports': sorted(cached),
+                'host_down': results['host_down'],
                 'host_id': host.id
             }
             
@@ -65,67 +121,586 @@ class ScanService:
                 self.scan_repo.fail_scan(scan.id, str(e))
             raise e
     
+    def _cached_results(self, target: str, ports, grabber: Optional[BannerGrabber]) -> Dict[int, Dict[str, Any]]:
+        cached = self.result_cache.lookup(target, ports)
+        if grabber is not None:
+            # Banner istenen taramada banner'sız saklanmış açık portlar yeniden denenir
+            cached = {port: entry for port, entry in cached.items()
+                      if entry['state'] != OPEN or 'banner' in entry}
+        return cached
+    
+    def _cache_results(self, target: str, results: Dict[str, Any]):
+        # Kapalı işaretlenen hostun filtreli sonuçları geçicidir, saklanmaz
+        states = results['port_states']
+        for state in (CLOSED, FILTERED):
+            for port in states.ports(state):
+                self.result_cache.put(target, port, state)
+        for port_info in results['open_ports']:
+            info = {key: value for key, value in port_info.items() if key != 'port'}
+            self.result_cache.put(target, port_info['port'], OPEN, **info)
+    
+    def _merge_cached(self, results: Dict[str, Any], cached: Dict[int, Dict[str, Any]]):
+        for port_info in results['open_ports']:
+            port_info['cached'] = False
+        if not cached:
+            return
+        for port, entry in cached.items():
+            results['port_states'].set(port, entry['state'])
+            if entry['state'] == OPEN:
+                info = {key: value for key, value in entry.items() if key != 'state'}
+                results['open_ports'].append({'port': port, **info, 'cached': True})
+            else:
+                results['closed_ports_count'] += 1
+        results['open_ports'].sort(key=lambda port_info: port_info['port'])
+    
     def create_fast_scan(self, request: FastScanRequest) -> Dict[str, Any]:
         log_function_entry(service_logger, "create_fast_scan",
                           target=request.target, 
-                          port_range=f"{request.start_port}-{request.end_port}",
-                          threads=request.threads)
+                          ports=str(request.port_set),
+                          threads=request.threads, engine=request.engine)
         
         try:
+            port_set = request.port_set
+            workers = request.threads if request.engine == 'threaded' else request.concurrency
+            
             # 1. Create scan record
             service_logger.info(f"📝 Creating fast scan record...")
             scan = self.scan_repo.create_scan(
                 target_ip=request.target,
                 scan_type='fast',
-                start_port=request.start_port,
-                end_port=request.end_port,
-                threads_used=request.threads
+                start_port=port_set.first(),
+                end_port=port_set.last(),
+                port_spec=port_set.to_spec(),
+                threads_used=workers
             )
             service_logger.info(f"✅ Fast scan record created: {scan.id}")
             
-            # 2. Find or create host
-            host = self.host_repo.find_or_create_host(request.target)
-            service_logger.info(f"🏠 Host ready: {host.ip_address}")
-            
-            # 3. Execute fast scan
-            service_logger.info(f"⚡ Starting fast scan with {request.threads} threads...")
-            scanner = FastPortScanner(max_threads=request.threads)
-            open_ports = scanner.scan_port_range_threaded(
-                request.target, 
-                request.start_port, 
-                request.end_port
-            )
+            checkpoint = self._new_checkpoint(scan.id, 'fast', request, {request.target: scan.id})
+            try:
+                response = self._execute_fast_scan(scan, request, checkpoint)
+            finally:
+                if checkpoint is not None:
+                    checkpoint.release()
+            log_function_exit(service_logger, "create_fast_scan", response)
+            return response
             
-            total_scanned = request.end_port - request.start_port + 1
-            service_logger.info(f"🎯 Fast scan completed: {len(open_ports)}/{total_scanned} ports open")
+        except Exception as e:
+            service_logger.error(f"❌ Fast scan failed: {str(e)}")
+            if 'scan' in locals():
+                self.scan_repo.fail_scan(scan.id, str(e))
+            raise e
+    
+    def _execute_fast_scan(self, scan, request: FastScanRequest,
+                           checkpoint: Optional[ScanCheckpoint] = None) -> Dict[str, Any]:
+        port_set = request.port_set
+        workers = request.threads if request.engine == 'threaded' else request.concurrency
+        
+        # 2. Find or create host
+        host = self.host_repo.find_or_create_host(request.target)
+        service_logger.info(f"🏠 Host ready: {host.ip_address}")
+        
+        # 3. Execute fast scan
+        budget = self._scan_budget(request)
+        seed = checkpoint.meta['seed'] if checkpoint is not None else None
+        planner = self._plan([request.target], port_set, request, seed=seed)
+        scanner = self._build_engine(request, progress_callback=self._progress_recorder(scan.id),
+                                     budget=budget, probe_count=len(planner), checkpoint=checkpoint)
+        service_logger.info(f"⚡ Starting {request.engine} fast scan with {workers} workers...")
+        grabber = self._banner_grabber(request)
+        open_ports = self._run_scanner(scanner, planner, grabber, budget, checkpoint).get(request.target, [])
+        banners = grabber.banners_for(request.target) if grabber else {}
+        services = self._describe_services(open_ports, grabber.services_for(request.target) if grabber else None)
+        
+        host_down = request.target in scanner.down_hosts()
+        unscanned = budget.unscanned(planner).get(request.target) if budget is not None else None
+        
+        total_scanned = len(port_set) - (len(unscanned) if unscanned else 0)
+        service_logger.info(f"🎯 Fast scan completed: {len(open_ports)}/{total_scanned} ports open")
+        if host_down:
+            service_logger.warning(f"⚠️  {request.target} marked down, remaining probes skipped")
+        if unscanned:
+            service_logger.warning(f"⏱️  Time budget exhausted, {len(unscanned)} ports left unscanned")
+        
+        # 4. Update scan results
+        service_logger.info(f"💾 Saving fast scan results...")
+        self.scan_repo.complete_scan(scan.id, open_ports, total_scanned, banners=banners,
+                                     host_down=host_down, time_budget=request.time_budget,
+                                     unscanned_ports=unscanned, checkpoint_file=None,
+                                     **scanner.congestion_stats())
+        if checkpoint is not None:
+            checkpoint.remove()
+        
+        # 5. Update host
+        self.host_repo.update_host_status(request.target, not host_down)
+        
+        return {
+            'scan_id': scan.id,
+            'target': request.target,
+            'scan_type': 'fast',
+            'status': 'completed',
+            'open_ports': open_ports,
+            'banners': banners,
+            'services': services,
+            'total_ports_scanned': total_scanned,
+            'host_down': host_down,
+            'time_budget': request.time_budget,
+            'unscanned_ports': unscanned.to_spec() if unscanned else None,
+            'unscanned_count': len(unscanned) if unscanned else 0,
+            'resumed': checkpoint.resumed if checkpoint is not None else False,
+            'threads_used': workers,
+            'engine': request.engine,
+            **scanner.congestion_stats(),
+            'host_id': host.id
+        }
+    
+    def create_multi_scan(self, request: MultiScanRequest) -> Dict[str, Any]:
+        log_function_entry(service_logger, "create_multi_scan",
+                          targets=len(request.targets),
+                          ports=str(request.port_set),
+                          engine=request.engine)
+        
+        scans = {}
+        try:
+            port_set = request.port_set
+            workers = request.threads if request.engine == 'threaded' else request.concurrency
             
-            # 4. Update scan results
-            service_logger.info(f"💾 Saving fast scan results...")
-            self.scan_repo.complete_scan(scan.id, open_ports, total_scanned)
+            # 1. Create one scan record per target
+            for target in ScanPlanner(request.targets, port_set, shuffle=False).targets():
+                scans[target] = self.scan_repo.create_scan(
+                    target_ip=target,
+                    scan_type='multi',
+                    start_port=port_set.first(),
+                    end_port=port_set.last(),
+                    port_spec=port_set.to_spec(),
+                    threads_used=workers
+                )
+            service_logger.info(f"✅ {len(scans)} scan records created")
             
-            # 5. Update host
-            self.host_repo.update_host_status(request.target, True)
+            first_id = next(iter(scans.values())).id
+            checkpoint = self._new_checkpoint(first_id, 'multi', request,
+                                              {target: scan.id for target, scan in scans.items()})
+            try:
+                response = self._execute_multi_scan(scans, request, checkpoint)
+            finally:
+                if checkpoint is not None:
+                    checkpoint.release()
+            log_function_exit(service_logger, "create_multi_scan", response)
+            return response
+            
+        except Exception as e:
+            service_logger.error(f"❌ Multi-target scan failed: {str(e)}")
+            for scan in scans.values():
+                self.scan_repo.fail_scan(scan.id, str(e))
+            raise e
+    
+    def _execute_multi_scan(self, scans: Dict[str, Any], request: MultiScanRequest,
+                            checkpoint: Optional[ScanCheckpoint] = None) -> Dict[str, Any]:
+        # 2. Plan interleaved (target, port) probes
+        seed = checkpoint.meta['seed'] if checkpoint is not None else request.seed
+        planner = self._plan(request.targets, request.port_set, request, seed=seed)
+        total_ports = len(planner.ports)
+        workers = request.threads if request.engine == 'threaded' else request.concurrency
+        service_logger.info(f"🗺️  Planned {len(planner)} probes across {planner.target_count} targets")
+        
+        # 3. Execute interleaved scan
+        service_logger.info(f"⚡ Starting {request.engine} multi-target scan with {workers} workers...")
+        scanner = self._build_engine(request, checkpoint=checkpoint)
+        grabber = self._banner_grabber(request)
+        results = self._run_scanner(scanner, planner, grabber, checkpoint=checkpoint)
+        down_hosts = set(scanner.down_hosts())
+        service_logger.info(f"🎯 Multi-target scan completed: {len(results)} hosts with open ports, "
+                            f"{len(down_hosts)} marked down")
+        
+        # 4. Save results per target
+        service_logger.info(f"💾 Saving multi-target scan results...")
+        hosts = []
+        for target, scan in scans.items():
+            open_ports = results.get(target, [])
+            banners = grabber.banners_for(target) if grabber and open_ports else {}
+            self.scan_repo.complete_scan(scan.id, open_ports, total_ports, banners=banners,
+                                         host_down=target in down_hosts, checkpoint_file=None,
+                                         **scanner.congestion_stats())
+            if target in down_hosts:
+                self.host_repo.update_host_status(target, False)
+            elif open_ports:
+                self.host_repo.find_or_create_host(target)
+                self.host_repo.update_host_status(target, True)
+                hosts.append({'target': target, 'scan_id': scan.id, 'open_ports': open_ports,
+                              'banners': banners,
+                              'services': self._describe_services(
+                                  open_ports, grabber.services_for(target) if grabber else None)})
+        if checkpoint is not None:
+            checkpoint.remove()
+        
+        return {
+            'scan_ids': [scan.id for scan in scans.values()],
+            'scan_type': 'multi',
+            'status': 'completed',
+            'targets_scanned': len(scans),
+            'total_probes': len(planner),
+            'hosts_with_open_ports': hosts,
+            'down_hosts': sorted(down_hosts),
+            'resumed': checkpoint.resumed if checkpoint is not None else False,
+            'engine': request.engine,
+            **scanner.congestion_stats()
+        }
+    
+    def create_rescan(self, request: RescanRequest) -> Dict[str, Any]:
+        log_function_entry(service_logger, "create_rescan",
+                          targets=len(request.targets),
+                          ports=str(request.port_set),
+                          sample_ratio=request.sample_ratio)
+        
+        scans = {}
+        try:
+            # 1. Baseline: latest completed scan per target
+            port_set = request.port_set
+            planner = self._plan(request.targets, port_set, request, seed=request.seed)
+            previous = self.scan_repo.get_latest_completed_scans(planner.targets())
+            baseline = {target: scan.get_baseline_states() for target, scan in previous.items()}
+            reconfirm = sum(states.count(OPEN) for states in baseline.values())
+            service_logger.info(f"🗺️  {len(previous)}/{planner.target_count} targets have a baseline, "
+                                f"{reconfirm} open ports to reconfirm")
+            
+            # 2. Create one scan record per target
+            for target in planner.targets():
+                scans[target] = self.scan_repo.create_scan(
+                    target_ip=target,
+                    scan_type='rescan',
+                    start_port=port_set.first(),
+                    end_port=port_set.last(),
+                    port_spec=port_set.to_spec(),
+                    threads_used=request.threads if request.engine == 'threaded' else request.concurrency
+                )
+            
+            # 3. Reconfirm known open ports, then sample the rest of the space
+            scanner = self._build_engine(request)
+            states = {}
+            sampled = math.ceil(len(planner) * request.sample_ratio)
+            probes = self._rescan_probes(planner, baseline, sampled, states)
+            results = scanner.iter_probes(probes, total=reconfirm + sampled)
+            open_ports = collect_open(self._alert_changes(results, baseline, states))
+            down_hosts = set(scanner.down_hosts())
+            
+            # 4. Save per-target diff against the baseline
+            service_logger.info(f"💾 Saving rescan results...")
+            changes = []
+            for target, scan in scans.items():
+                current = states.get(target, PortStateMap())
+                previous_scan = previous.get(target)
+                # Baseline'ı olmayan hedefin açık portları "yeni açıldı" değil ilk kez görülendir
+                diff = current.diff(baseline.get(target, PortStateMap()))
+                port_diff = {'previous_scan_id': previous_scan.id if previous_scan else None, **diff}
+                self.scan_repo.complete_scan(scan.id, open_ports.get(target, []), len(current),
+                                             port_states=current, port_diff=port_diff,
+                                             host_down=target in down_hosts, **scanner.congestion_stats())
+                if diff['opened'] or diff['closed']:
+                    changes.append({'target': target, 'scan_id': scan.id, **port_diff})
+                if target in down_hosts:
+                    self.host_repo.update_host_status(target, False)
+                elif target in open_ports:
+                    self.host_repo.find_or_create_host(target)
+                    self.host_repo.update_host_status(target, True)
             
             response = {
-                'scan_id': scan.id,
-                'target': request.target,
-                'scan_type': 'fast',
+                'scan_ids': [scan.id for scan in scans.values()],
+                'scan_type': 'rescan',
                 'status': 'completed',
-                'open_ports': open_ports,
-                'total_ports_scanned': total_scanned,
-                'threads_used': request.threads,
-                'host_id': host.id
+                'targets_scanned': len(scans),
+                'reconfirmed_ports': reconfirm,
+                'total_probes': sum(len(current) for current in states.values()),
+                'changes': changes,
+                'down_hosts': sorted(down_hosts),
+                'engine': request.engine,
+                **scanner.congestion_stats()
             }
             
-            log_function_exit(service_logger, "create_fast_scan", response)
+            log_function_exit(service_logger, "create_rescan", response)
             return response
             
         except Exception as e:
-            service_logger.error(f"❌ Fast scan failed: {str(e)}")
-            if 'scan' in locals():
+            service_logger.error(f"❌ Rescan failed: {str(e)}")
+            for scan in scans.values():
                 self.scan_repo.fail_scan(scan.id, str(e))
             raise e
     
+    def _rescan_probes(self, planner: ScanPlanner, baseline: Dict[str, PortStateMap],
+                       sampled: int, states: Dict[str, PortStateMap]):
+        # Gönderilen prob cevap gelene kadar filtreli sayılır (SYN cevapsızları raporlamaz)
+        def issue(target, port):
+            states.setdefault(target, PortStateMap()).set(port, FILTERED)
+            return target, port
+        
+        # Faz 1: önceden açık portlar, hedefler arasında sırayla
+        known = [[(target, port) for port in states_map.ports(OPEN)] for target, states_map in baseline.items()]
+        for group in zip_longest(*known):
+            for probe in group:
+                if probe is not None:
+                    yield issue(*probe)
+        
+        # Faz 2: kalan uzay planlayıcı sırasıyla, ilk ``sampled`` prob
+        for target, port in islice(planner, sampled):
+            previous = baseline.get(target)
+            if previous is not None and previous.get(port) == OPEN:
+                continue
+            yield issue(target, port)
+    
+    def _alert_changes(self, results, baseline: Dict[str, PortStateMap], states: Dict[str, PortStateMap]):
+        # Değişiklik sonuç geldiği anda loglanır; tarama sonunu beklemez
+        for result in results:
+            target, port, state = result['target'], result['port'], result['state']
+            states[target].set(port, state)
+            previous = baseline.get(target)
+            if previous is not None:
+                # Önceki taramanın denemediği port değişiklik sayılmaz
+                was = previous.get(port)
+                if was == OPEN and state != OPEN:
+                    service_logger.warning(f"🔔 {target}:{port} is no longer open ({state})")
+                elif was != UNKNOWN and was != OPEN and state == OPEN:
+                    service_logger.warning(f"🔔 {target}:{port} is newly open")
+            yield result
+    
+    def create_network_discovery(self, request: NetworkDiscoveryRequest) -> Dict[str, Any]:
+        log_function_entry(service_logger, "create_network_discovery",
+                          network=request.network, method=request.method,
+                          resolve_hostnames=request.resolve_hostnames)
+        
+        network = request.network or get_local_network()[0]
+        discovery = NetworkDiscovery(timeout=request.timeout, method=request.method,
+                                     tcp_ports=request.tcp_port_list, resolver=self.resolver)
+        
+        # 1. Sweep; PTR lookups start in the background as hosts come up
+        started = time.monotonic()
+        alive_hosts = discovery.discover_network(network, max_threads=request.threads,
+                                                 resolve_names=request.resolve_hostnames)
+        service_logger.info(f"📡 {len(alive_hosts)} alive hosts in {network} via {discovery.method}")
+        
+        # 2. Collect hostnames (cached, concurrent, bounded by the deadline)
+        hostnames = {}
+        if request.resolve_hostnames and alive_hosts:
+            hostnames = discovery.resolve_hostnames(alive_hosts, deadline=self.dns_deadline)
+        
+        # 3. Upsert hosts with their names
+        service_logger.info(f"💾 Saving {len(alive_hosts)} hosts...")
+        hosts = []
+        for ip in alive_hosts:
+            host = self.host_repo.find_or_create_host(ip)
+            updates = {'is_alive': True, 'network_range': network}
+            if hostnames.get(ip):
+                updates['hostname'] = hostnames[ip]
+            hosts.append(self.host_repo.update(host.id, **updates).to_dict())
+        
+        response = {
+            'network_range': network,
+            'total_hosts_found': len(hosts),
+            'alive_hosts': hosts,
+            'hostnames_resolved': sum(1 for hostname in hostnames.values() if hostname),
+            'scan_duration': round(time.monotonic() - started, 3),
+            'discovery_method': discovery.method,
+            'dns_cache': self.resolver.stats()
+        }
+        
+        log_function_exit(service_logger, "create_network_discovery", response)
+        return response
+    
+    def resume_scan(self, scan_id: int) -> Optional[Dict[str, Any]]:
+        log_function_entry(service_logger, "resume_scan", scan_id=scan_id)
+        
+        scan = self.scan_repo.get_by_id(scan_id)
+        if not scan:
+            service_logger.warning(f"⚠️  Scan not found: {scan_id}")
+            return None
+        if scan.status == 'completed':
+            raise ValueError(f"Scan {scan_id} is already completed")
+        if not scan.checkpoint_file or not os.path.exists(scan.checkpoint_file):
+            raise ValueError(f"Scan {scan_id} has no checkpoint to resume from")
+        
+        checkpoint = ScanCheckpoint.load(scan.checkpoint_file, interval=self.checkpoint_interval)
+        try:
+            # Kilidi tutan süreç taramayı hâlâ yürütüyor; ikinci bir çalıştırma başlatılmaz
+            checkpoint.acquire()
+        except CheckpointInUse:
+            raise ValueError(f"Scan {scan_id} is still running")
+        if not os.path.exists(scan.checkpoint_file):
+            # Kilidi almadan hemen önce tamamlandı
+            checkpoint.remove()
+            raise ValueError(f"Scan {scan_id} is already completed")
+        kind = checkpoint.meta['kind']
+        scans = {target: self.scan_repo.get_by_id(sid) for target, sid in checkpoint.meta['scan_ids'].items()}
+        service_logger.info(f"♻️  Resuming {kind} scan {scan_id} from probe positions {checkpoint.positions}")
+        
+        try:
+            for resumed in scans.values():
+                self.scan_repo.update(resumed.id, status='running')
+            if kind == 'fast':
+                response = self._execute_fast_scan(scan, FastScanRequest(**checkpoint.meta['request']), checkpoint)
+            else:
+                response = self._execute_multi_scan(scans, MultiScanRequest(**checkpoint.meta['request']), checkpoint)
+        except Exception as e:
+            service_logger.error(f"❌ Resumed scan failed: {str(e)}")
+            for resumed in scans.values():
+                self.scan_repo.fail_scan(resumed.id, str(e))
+            raise e
+        finally:
+            checkpoint.release()
+        
+        log_function_exit(service_logger, "resume_scan", response)
+        return response
+    
+    def get_resumable_scans(self) -> List[Dict[str, Any]]:
+        # Çöken/yeniden başlatılan süreçten kalan, checkpoint'i olan taramalar;
+        # kilidi canlı bir süreçte olanlar hâlâ çalışıyordur
+        return [scan.to_dict() for scan in self.scan_repo.get_resumable_scans()
+                if os.path.exists(scan.checkpoint_file) and not checkpoint_in_use(scan.checkpoint_file)]
+    
+    def _new_checkpoint(self, scan_id: int, kind: str, request,
+                        scan_ids: Dict[str, int]) -> Optional[ScanCheckpoint]:
+        if not request.checkpoint or request.engine == 'syn':
+            # Durumsuz SYN motoru cevapsız probları raporlamaz; tamamlanan önek bilinemez
+            return None
+        path = os.path.join(self.checkpoint_dir, f"scan-{scan_id}.json")
+        meta = {
+            'kind': kind,
+            'request': request.dict(),
+            # Permütasyon devamda aynı kalmalı
+            'seed': request.seed if getattr(request, 'seed', None) is not None else random.getrandbits(32),
+            'scan_ids': scan_ids
+        }
+        checkpoint = ScanCheckpoint(path, meta, interval=self.checkpoint_interval).acquire()
+        checkpoint.save()
+        for sid in scan_ids.values():
+            self.scan_repo.update(sid, checkpoint_file=path)
+        return checkpoint
+    
+    def _build_engine(self, request, progress_callback=None, budget: Optional[ScanBudget] = None,
+                      probe_count: int = 0, checkpoint: Optional[ScanCheckpoint] = None):
+        if request.engine == 'syn':
+            # Stateless: pencere/RTT yok, son problar için max_timeout kadar beklenir
+            rate = request.syn_rate
+            if budget is not None:
+                rate = budget.tune_rate(probe_count, request.max_timeout, rate, MAX_SYN_RATE)
+                service_logger.info(f"⏱️  Time budget {budget.seconds}s: sending {rate} SYN/s")
+            return SynPortScanner(rate=rate, wait=request.max_timeout,
+                                  progress_callback=progress_callback,
+                                  host_down_after=request.host_down_after)
+        
+        options = {
+            'timeout': request.timeout,
+            'min_timeout': request.min_timeout,
+            'max_timeout': request.max_timeout,
+            'adaptive': request.adaptive_concurrency,
+            'progress_callback': progress_callback,
+            'host_down_after': request.host_down_after,
+            'fast_teardown': request.fast_teardown
+        }
+        workers = request.workers or os.cpu_count() or 1
+        if request.engine == 'threaded':
+            concurrency, max_concurrency = request.threads, concurrency_cap(MAX_THREADS)
+        elif request.engine == 'sharded':
+            # fd limiti worker başına, ephemeral portlar tüm worker'lar için ortak
+            concurrency = request.concurrency * workers
+            max_concurrency = ephemeral_cap(concurrency_cap(MAX_CONCURRENCY) * workers)
+        else:
+            concurrency, max_concurrency = request.concurrency, concurrency_cap(MAX_CONCURRENCY)
+        
+        if budget is not None:
+            # Tüm problar bütçeye sığacak kadar pencere; sığmıyorsa timeout kısalır
+            # Thread havuzu uçuştakilerin yanında kuyrukta da prob bekletir;
+            # kesimden sonra kuyruk da boşaltılacağından pay ona göre ayrılır
+            drain_rounds = FastPortScanner.QUEUE_FACTOR if request.engine == 'threaded' else 1
+            concurrency, timeout = budget.tune(probe_count, request.max_timeout, request.min_timeout,
+                                               concurrency, max_concurrency, drain_rounds=drain_rounds)
+            options.update({
+                'timeout': timeout,
+                'min_timeout': min(request.min_timeout, timeout),
+                'max_timeout': timeout,
+                # Pencere baştan tam açılır; filtreli hostta AIMD hiç büyümez
+                'adaptive': False
+            })
+            service_logger.info(f"⏱️  Time budget {budget.seconds}s: {concurrency} in-flight probes, "
+                                f"{timeout:.2f}s probe timeout")
+        
+        if request.engine == 'async':
+            return AsyncPortScanner(max_concurrency=concurrency, **options)
+        if request.engine == 'batch':
+            return BatchPortScanner(batch_size=concurrency, **options)
+        if request.engine == 'sharded':
+            return ShardedScanner(workers=workers, batch_size=math.ceil(concurrency / workers),
+                                  budget=budget, checkpoint=checkpoint, **options)
+        return FastPortScanner(max_threads=concurrency, **options)
+    
+    def _scan_budget(self, request) -> Optional[ScanBudget]:
+        if not request.time_budget:
+            return None
+        # Banner okuma taramadan sonra bitirilir; payı bütçeden ayrılır
+        reserve = request.banner_timeout * 2 if request.grab_banners else 0.0
+        return ScanBudget(request.time_budget, reserve=reserve).start()
+    
+    def _banner_grabber(self, request) -> Optional[BannerGrabber]:
+        if not request.grab_banners:
+            return None
+        return BannerGrabber(read_timeout=request.banner_timeout, connect_timeout=request.banner_timeout)
+    
+    def _describe_services(self, open_ports: List[int],
+                           identified: Optional[Dict[int, Dict[str, Any]]] = None) -> Dict[int, Dict[str, Any]]:
+        # Port kayıt tablosundan ad; banner imzası varsa ürün/sürüm ile zenginleştir
+        identified = identified or {}
+        return {port: describe_service(port, match=identified.get(port)) for port in open_ports}
+    
+    def _plan(self, targets: List[str], port_set: PortSet, request, seed: Optional[int] = None) -> ScanPlanner:
+        if request.likelihood_ordered:
+            # Olası portlar önce: permütasyon yerine sıralı gezinme
+            return ScanPlanner(targets, order_by_likelihood(port_set), shuffle=False)
+        return ScanPlanner(targets, port_set, seed=seed)
+    
+    def _run_scanner(self, scanner, planner: ScanPlanner, grabber: Optional[BannerGrabber] = None,
+                     budget: Optional[ScanBudget] = None,
+                     checkpoint: Optional[ScanCheckpoint] = None) -> Dict[str, List[int]]:
+        # Sharded motor bütçe ve checkpoint'i shard'lar içinde uygular
+        sharded = isinstance(scanner, ShardedScanner)
+        start = checkpoint.position() if checkpoint is not None and not sharded else 0
+        probes = planner.iter_from(start) if start else planner
+        if budget is not None and not sharded:
+            budget.issued = [start]
+            probes = budget.limit(probes)
+        if checkpoint is not None and not sharded:
+            probes = checkpoint.track(probes)
+        
+        # Banner okuma açık portlar akıştan geldikçe, tarama sürerken başlar
+        results = scanner.iter_probes(probes, total=len(planner) - start)
+        if checkpoint is not None and not sharded:
+            results = checkpoint.tap(results, down_hosts=scanner.down_hosts)
+        if grabber is not None:
+            results = grabber.tap(results)
+        try:
+            open_ports = collect_open(results)
+        except BaseException:
+            if checkpoint is not None:
+                checkpoint.save()
+            raise
+        
+        if checkpoint is not None:
+            # Önceki çalıştırmalarda bulunanlar da sonuca katılır
+            for target in checkpoint.results:
+                if grabber is not None:
+                    for port in set(checkpoint.found(target)) - set(open_ports.get(target, ())):
+                        grabber.submit(target, port)
+                open_ports[target] = checkpoint.found(target)
+            checkpoint.save()
+        if grabber is not None:
+            grabber.wait()
+        return open_ports
+    
+    def _progress_recorder(self, scan_id: int):
+        def record(stats: Dict[str, Any]):
+            self.scan_repo.update_progress(
+                scan_id,
+                stats['completed'],
+                stats['congestion_window'],
+                stats['peak_congestion_window']
+            )
+        return record
+    
     def get_scan_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         log_function_entry(service_logger, "get_scan_history", limit=limit)
         
@@ -0,0 +1,189 @@
+import asyncio
+import socket
+import time
+from datetime import datetime
+
+from core.congestion import CongestionWindow, ScanProgress, congestion_stats
+from core.host_health import HostHealth
+from core.rate_limiter import probe_limiter
+from core.rtt_estimator import RTTEstimator
+from core.socket_limits import concurrency_cap, fast_teardown
+from core.streaming import FILTERED, OPEN, acollect_open, classify, iterate_async, port_result
+from core.top_ports import top_ports
+
+class AsyncPortScanner:
+    def __init__(self, max_concurrency=5000, timeout=1, min_timeout=0.1, max_timeout=None,
+                 adaptive=True, progress_callback=None, host_down_after=0, limiter=None,
+                 fast_teardown=True):
+        self.max_concurrency = concurrency_cap(max_concurrency)
+        self.fast_teardown = fast_teardown
+        self.timeout = timeout
+        self.rtt = RTTEstimator(initial_timeout=timeout, min_timeout=min_timeout, max_timeout=max_timeout)
+        self.congestion = CongestionWindow(initial=min(64, self.max_concurrency), maximum=self.max_concurrency, adaptive=adaptive)
+        self.health = HostHealth(down_after=host_down_after)
+        self.share = (limiter or probe_limiter()).share()
+        self.progress_callback = progress_callback
+        self.progress = None
+        self.in_flight = 0
+        self.results = {}
+
+    def congestion_stats(self):
+        return congestion_stats(self.congestion, self.progress)
+
+    def down_hosts(self):
+        return self.health.down_hosts()
+
+    async def probe_port(self, target_ip, port):
+        loop = asyncio.get_running_loop()
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        except OSError:
+            # fd/bellek tükendi (EMFILE, ENFILE, ENOBUFS): prob kaybolmaz,
+            # filtreli raporlanır ve pencere daralır; hosta yüklenmez
+            self.congestion.on_timeout()
+            return FILTERED
+        started = time.monotonic()
+        try:
+            if self.fast_teardown:
+                fast_teardown(sock)
+            sock.setblocking(False)
+            await asyncio.wait_for(loop.sock_connect(sock, (target_ip, port)), self.rtt.timeout_for(target_ip))
+            self.rtt.observe(target_ip, time.monotonic() - started)
+            self.congestion.on_response()
+            self.health.observe(target_ip, 0)
+            return OPEN
+        except asyncio.TimeoutError:
+            self.congestion.on_timeout()
+            self.health.observe(target_ip, None)
+            return FILTERED
+        except OSError as e:
+            self.rtt.observe_result(target_ip, e.errno, time.monotonic() - started)
+            self.congestion.on_result(e.errno)
+            self.health.observe(target_ip, e.errno)
+            return classify(e.errno)
+        finally:
+            sock.close()
+
+    async def scan_single_port(self, target_ip, port):
+        return await self.probe_port(target_ip, port) == OPEN
+
+    async def _probe(self, target_ip, port, slot_freed, results):
+        try:
+            state = await self.probe_port(target_ip, port)
+            self.progress.tick(open_found=1 if state == OPEN else 0)
+            await results.put(port_result(target_ip, port, state))
+        finally:
+            self.in_flight -= 1
+            slot_freed.set()
+
+    async def aiter_probes(self, probes, total=None):
+        if total is None and hasattr(probes, '__len__'):
+            total = len(probes)
+        self.progress = ScanProgress(self.congestion, total=total, callback=self.progress_callback)
+        slot_freed = asyncio.Event()
+        results = asyncio.Queue(self.max_concurrency)
+        pending = set()
+
+        async def produce():
+            try:
+                for target_ip, port in self.health.filter_probes(probes):
+                    # Uçuştaki bağlantı sayısı AIMD penceresiyle sınırlı
+                    while self.in_flight >= self.congestion.size:
+                        slot_freed.clear()
+                        await slot_freed.wait()
+                    # Süreç geneli sınır: event loop bloklanmadan beklenir
+                    wait = self.share.try_acquire()
+                    while wait:
+                        await asyncio.sleep(wait)
+                        wait = self.share.try_acquire()
+
+                    self.in_flight += 1
+                    task = asyncio.ensure_future(self._probe(target_ip, port, slot_freed, results))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                    # Başlamadan iptal edilen görev de payı geri verir
+                    task.add_done_callback(lambda _: self.share.release())
+
+                if pending:
+                    await asyncio.gather(*pending)
+            except asyncio.CancelledError:
+                raise
+            except BaseException:
+                # Tüketici results.get()'te asılı kalmaz; hata ``await producer``'da yükselir
+                await results.put(None)
+                raise
+            await results.put(None)
+
+        with self.share:
+            producer = asyncio.ensure_future(produce())
+            try:
+                while True:
+                    result = await results.get()
+                    if result is None:
+                        break
+                    yield result
+                await producer
+            finally:
+                # Erken bırakılan ya da hatayla biten akışın kalan probları iptal edilir
+                if not producer.done():
+                    producer.cancel()
+                for task in list(pending):
+                    task.cancel()
+                await asyncio.gather(producer, *pending, return_exceptions=True)
+
+    def iter_probes(self, probes, total=None):
+        return iterate_async(lambda: self.aiter_probes(probes, total=total))
+
+    async def scan_probes_async(self, probes, total=None):
+        self.results = await acollect_open(self.aiter_probes(probes, total=total))
+        return self.results
+
+    def scan_probes(self, probes, total=None):
+        return asyncio.run(self.scan_probes_async(probes, total=total))
+
+    async def scan_ports_async(self, target_ip, ports):
+        total = len(ports) if hasattr(ports, '__len__') else None
+        results = await self.scan_probes_async(((target_ip, port) for port in ports), total=total)
+        return results.get(target_ip, [])
+
+    def scan_ports(self, target_ip, ports):
+        return asyncio.run(self.scan_ports_async(target_ip, ports))
+
+    def scan_top_ports(self, target_ip, count=1000):
+        return self.scan_ports(target_ip, top_ports(count))
+
+    def scan_port_range(self, target_ip, start_port, end_port):
+        print(f"\n🚀 ASYNC TARAMA MODU")
+        print(f"🎯 Hedef: {target_ip}")
+        print(f"📡 Port aralığı: {start_port}-{end_port}")
+        print(f"🔀 Eşzamanlı bağlantı: {self.max_concurrency}")
+        print(f"⏰ Başlangıç: {datetime.now().strftime('%H:%M:%S')}")
+        print("-" * 60)
+
+        start_time = time.time()
+
+        open_ports = asyncio.run(
+            self.scan_ports_async(target_ip, range(start_port, end_port + 1))
+        )
+
+        duration = time.time() - start_time
+
+        print("-" * 60)
+        print(f"⚡ Tarama süresi: {duration:.2f} saniye")
+        print(f"📊 Bulunan açık portlar: {len(open_ports)}")
+        print(f"🪟 Son pencere: {self.congestion.size} (en yüksek: {int(self.congestion.peak)})")
+        print(f"🎉 Açık portlar: {open_ports}")
+
+        return open_ports
+
+if __name__ == "__main__":
+    print("🚀 Async Port Scanner v1.0")
+    print("=" * 60)
+
+    target = input("Hedef IP (Enter=localhost): ").strip() or "127.0.0.1"
+    start = int(input("Başlangıç port: "))
+    end = int(input("Bitiş port: "))
+    concurrency = int(input("Eşzamanlı bağlantı (Enter=5000): ") or "5000")
+
+    scanner = AsyncPortScanner(max_concurrency=concurrency)
+    scanner.scan_port_range(target, start, end)
@@ -0,0 +1,97 @@
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.fingerprints import get_fingerprint_db
+from core.streaming import OPEN
+
+# Bağlanınca kendiliğinden selam göndermeyen HTTP servislerine yollanan prob
+HTTP_PROBE = b"HEAD / HTTP/1.0\r\n\r\n"
+HTTP_PORTS = frozenset({80, 81, 3000, 5000, 8000, 8008, 8080, 8081, 8888})
+
+def clean_banner(data, max_length=256):
+    text = data.decode('utf-8', errors='replace')
+    text = ''.join(c if c.isprintable() or c in '\r\n\t' else '.' for c in text)
+    return text.strip()[:max_length] or None
+
+class BannerGrabber:
+    """Açık portlarda servis selamını (banner) okuyan arka plan aşaması.
+
+    ``tap()`` tarama akışını olduğu gibi geçirirken açık portlar için okuma işini
+    kendi thread havuzuna verir; böylece banner okuma tarama bitmesini beklemez.
+    Okuma zaman aşımı tarama zaman aşımından bağımsızdır. ``identify`` açıksa ham
+    yanıt aynı işçide imza veritabanıyla eşleştirilir.
+    """
+
+    def __init__(self, read_timeout=2.0, connect_timeout=2.0, max_workers=32, max_bytes=1024,
+                 identify=True):
+        self.read_timeout = read_timeout
+        self.connect_timeout = connect_timeout
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.fingerprints = get_fingerprint_db() if identify else None
+        self.banners = {}
+        self.services = {}
+        self.lock = threading.Lock()
+        self._executor = None
+
+    def read(self, target_ip, port):
+        try:
+            with socket.create_connection((target_ip, port), timeout=self.connect_timeout) as sock:
+                sock.settimeout(self.read_timeout)
+                try:
+                    data = sock.recv(self.max_bytes)
+                except socket.timeout:
+                    data = b''
+                if not data and port in HTTP_PORTS:
+                    sock.sendall(HTTP_PROBE)
+                    data = sock.recv(self.max_bytes)
+        except OSError:
+            return b''
+        return data
+
+    def grab(self, target_ip, port):
+        data = self.read(target_ip, port)
+        return clean_banner(data) if data else None
+
+    def _grab_and_store(self, target_ip, port):
+        data = self.read(target_ip, port)
+        banner = clean_banner(data) if data else None
+        service = self.fingerprints.identify(data, port) if data and self.fingerprints else None
+        with self.lock:
+            if banner:
+                self.banners[(target_ip, port)] = banner
+            if service:
+                self.services[(target_ip, port)] = service
+        return banner
+
+    def submit(self, target_ip, port):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._executor.submit(self._grab_and_store, target_ip, port)
+
+    def tap(self, results):
+        # Akışı değiştirmeden geçirir, açık portlar için banner okumayı başlatır
+        for result in results:
+            if result['state'] == OPEN:
+                self.submit(result['target'], result['port'])
+            yield result
+
+    def wait(self):
+        """Bekleyen okumaları tamamlar ve {(hedef, port): banner} döner."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        return self.banners
+
+    def banners_for(self, target_ip):
+        return {port: banner for (target, port), banner in self.banners.items() if target == target_ip}
+
+    def services_for(self, target_ip):
+        return {port: service for (target, port), service in self.services.items() if target == target_ip}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wait()
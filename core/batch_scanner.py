@@ -0,0 +1,212 @@
+import errno
+import selectors
+import socket
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+
+from core.congestion import CongestionWindow, ScanProgress, congestion_stats
+from core.host_health import HostHealth
+from core.rate_limiter import probe_limiter
+from core.rtt_estimator import RTTEstimator
+from core.socket_limits import concurrency_cap, fast_teardown
+from core.streaming import FILTERED, OPEN, aiterate_sync, classify, collect_open, port_result
+from core.top_ports import top_ports
+
+IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+# Soket açılamadı: kaynaklar uçuştaki problar bitince geri gelir
+RESOURCE_ERRORS = {errno.EMFILE, errno.ENFILE, errno.ENOBUFS, errno.ENOMEM}
+
+class BatchPortScanner:
+    def __init__(self, batch_size=4096, timeout=1, min_timeout=0.1, max_timeout=None,
+                 adaptive=True, progress_callback=None, host_down_after=0, limiter=None,
+                 fast_teardown=True):
+        self.batch_size = concurrency_cap(batch_size)
+        self.fast_teardown = fast_teardown
+        self.timeout = timeout
+        self.rtt = RTTEstimator(initial_timeout=timeout, min_timeout=min_timeout, max_timeout=max_timeout)
+        self.congestion = CongestionWindow(initial=min(64, self.batch_size), maximum=self.batch_size, adaptive=adaptive)
+        self.health = HostHealth(down_after=host_down_after)
+        self.share = (limiter or probe_limiter()).share()
+        self.progress_callback = progress_callback
+        self.progress = None
+        self.results = {}
+
+        # Önceden ayrılmış slot tablosu: her uçuştaki prob bir indeks
+        self.slot_sock = [None] * self.batch_size
+        self.slot_target = [None] * self.batch_size
+        self.slot_port = array('i', [0] * self.batch_size)
+        self.slot_started = array('d', [0.0] * self.batch_size)
+        self.slot_deadline = array('d', [0.0] * self.batch_size)
+        self.free_slots = array('i', range(self.batch_size - 1, -1, -1))
+
+    def congestion_stats(self):
+        return congestion_stats(self.congestion, self.progress)
+
+    def down_hosts(self):
+        return self.health.down_hosts()
+
+    def _release(self, selector, slot):
+        sock = self.slot_sock[slot]
+        selector.unregister(sock)
+        sock.close()
+        self.slot_sock[slot] = None
+        self.slot_target[slot] = None
+        self.free_slots.append(slot)
+        self.share.release()
+
+    def _open_slot(self, selector, target_ip, port):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            if self.fast_teardown:
+                fast_teardown(sock)
+            sock.setblocking(False)
+            now = time.monotonic()
+            err = sock.connect_ex((target_ip, port))
+        except OSError:
+            sock.close()
+            raise
+
+        if err not in IN_PROGRESS:
+            sock.close()
+            self.share.release()
+            return self._finish(target_ip, port, err, time.monotonic() - now)
+
+        slot = self.free_slots.pop()
+        self.slot_sock[slot] = sock
+        self.slot_target[slot] = target_ip
+        self.slot_port[slot] = port
+        self.slot_started[slot] = now
+        self.slot_deadline[slot] = now + self.rtt.timeout_for(target_ip)
+        selector.register(sock, selectors.EVENT_WRITE, slot)
+        return None
+
+    def _finish(self, target_ip, port, err, rtt):
+        self.rtt.observe_result(target_ip, err, rtt)
+        self.congestion.on_result(err)
+        self.health.observe(target_ip, err)
+        state = classify(err)
+        self.progress.tick(open_found=1 if state == OPEN else 0)
+        return port_result(target_ip, port, state)
+
+    def _expire(self, selector, now):
+        expired = []
+        for slot in range(self.batch_size):
+            if self.slot_sock[slot] is not None and self.slot_deadline[slot] <= now:
+                expired.append(port_result(self.slot_target[slot], self.slot_port[slot], FILTERED))
+                self.health.observe(self.slot_target[slot], None)
+                self._release(selector, slot)
+                self.congestion.on_timeout()
+                self.progress.tick()
+        return expired
+
+    def iter_probes(self, probes, total=None):
+        if total is None and hasattr(probes, '__len__'):
+            total = len(probes)
+        self.progress = ScanProgress(self.congestion, total=total, callback=self.progress_callback)
+        probes = self.health.filter_probes(probes)
+        exhausted = False
+        retry = deque()
+        selector = selectors.DefaultSelector()
+        next_sweep = 0.0
+
+        with self.share:
+            try:
+                while True:
+                    wait = 0.0
+                    while not exhausted and len(self.free_slots) > self.batch_size - self.congestion.size:
+                        # Süreç geneli sınıra takılınca slotlar cevaplar gelirken dolar
+                        wait = self.share.try_acquire()
+                        if wait:
+                            break
+                        probe = retry.popleft() if retry else next(probes, None)
+                        if probe is None:
+                            self.share.release()
+                            exhausted = True
+                            break
+                        target_ip, port = probe
+                        try:
+                            result = self._open_slot(selector, target_ip, port)
+                        except OSError as e:
+                            self.share.release()
+                            if e.errno in RESOURCE_ERRORS and len(self.free_slots) < self.batch_size:
+                                # fd/arabellek tükendi: prob uçuştakiler bitince yeniden denenir
+                                retry.append(probe)
+                                self.congestion.on_timeout()
+                                break
+                            # Prob düşmez; cevap alınamadı olarak raporlanır
+                            self.progress.tick()
+                            result = port_result(target_ip, port, FILTERED)
+                        if result is not None:
+                            yield result
+
+                    if exhausted and len(self.free_slots) == self.batch_size:
+                        break
+
+                    events = selector.select(timeout=min(wait, 0.05) if wait else 0.05)
+                    now = time.monotonic()
+                    for key, _ in events:
+                        slot = key.data
+                        target_ip = self.slot_target[slot]
+                        err = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                        port = self.slot_port[slot]
+                        self._release(selector, slot)
+                        yield self._finish(target_ip, port, err, now - self.slot_started[slot])
+
+                    if now >= next_sweep:
+                        yield from self._expire(selector, now)
+                        next_sweep = now + 0.05
+            finally:
+                for slot in range(self.batch_size):
+                    if self.slot_sock[slot] is not None:
+                        self._release(selector, slot)
+                selector.close()
+
+    def aiter_probes(self, probes, total=None):
+        return aiterate_sync(lambda: self.iter_probes(probes, total=total))
+
+    def scan_probes(self, probes, total=None):
+        self.results = collect_open(self.iter_probes(probes, total=total))
+        return self.results
+
+    def scan_ports(self, target_ip, ports):
+        total = len(ports) if hasattr(ports, '__len__') else None
+        return self.scan_probes(((target_ip, port) for port in ports), total=total).get(target_ip, [])
+
+    def scan_top_ports(self, target_ip, count=1000):
+        return self.scan_ports(target_ip, top_ports(count))
+
+    def scan_port_range(self, target_ip, start_port, end_port):
+        print(f"\n🚀 BATCH (EPOLL) TARAMA MODU")
+        print(f"🎯 Hedef: {target_ip}")
+        print(f"📡 Port aralığı: {start_port}-{end_port}")
+        print(f"📦 Batch boyutu: {self.batch_size} (başlangıç penceresi: {self.congestion.size})")
+        print(f"⏰ Başlangıç: {datetime.now().strftime('%H:%M:%S')}")
+        print("-" * 60)
+
+        start_time = time.time()
+
+        open_ports = self.scan_ports(target_ip, range(start_port, end_port + 1))
+
+        duration = time.time() - start_time
+
+        print("-" * 60)
+        print(f"⚡ Tarama süresi: {duration:.2f} saniye")
+        print(f"📊 Bulunan açık portlar: {len(open_ports)}")
+        print(f"🪟 Son pencere: {self.congestion.size} (en yüksek: {int(self.congestion.peak)})")
+        print(f"🎉 Açık portlar: {open_ports}")
+
+        return open_ports
+
+if __name__ == "__main__":
+    print("🚀 Batch Port Scanner v1.0")
+    print("=" * 60)
+
+    target = input("Hedef IP (Enter=localhost): ").strip() or "127.0.0.1"
+    start = int(input("Başlangıç port: "))
+    end = int(input("Bitiş port: "))
+    batch = int(input("Batch boyutu (Enter=4096): ") or "4096")
+
+    scanner = BatchPortScanner(batch_size=batch)
+    scanner.scan_port_range(target, start, end)
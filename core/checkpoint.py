@@ -0,0 +1,243 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from core.streaming import OPEN
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_CHECKPOINT_DIR = os.environ.get('CHECKPOINT_DIR') or 'checkpoints'
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_INTERVAL = 15.0
+LOCK_SUFFIX = '.lock'
+
+class CheckpointInUse(RuntimeError):
+    """Checkpoint'i başka bir çalışan tarama tutuyor."""
+
+def checkpoint_in_use(path):
+    """``path``'in kilidi canlı bir süreçte mi (tarama hâlâ sürüyor mu)."""
+    if fcntl is None or not os.path.exists(path + LOCK_SUFFIX):
+        return False
+    try:
+        fd = os.open(path + LOCK_SUFFIX, os.O_RDWR)
+    except FileNotFoundError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        # Kilit alındıysa fd kapanınca bırakılır
+        os.close(fd)
+    return False
+
+class ProbeTracker:
+    """Sıralı bir prob akışında tamamlanmış öneki izler.
+
+    Problar akış sırasıyla numaralanır; sonuç gelen prob uçuştakilerden
+    düşer. ``watermark`` uçuştaki en eski probun sırasıdır: ondan önceki tüm
+    problar bitmiştir, devam ederken oradan başlanır. Bellek akış boyuyla
+    değil uçuştaki prob sayısıyla orantılıdır.
+    """
+
+    def __init__(self, start=0, key=None):
+        self.issued = start
+        self.key = key or (lambda item: item)
+        self._inflight = {}
+        self.lock = threading.Lock()
+
+    def track(self, items):
+        for item in items:
+            with self.lock:
+                self._inflight[self.key(item)] = self.issued
+                self.issued += 1
+            yield item
+
+    def done(self, key):
+        with self.lock:
+            self._inflight.pop(key, None)
+
+    def drop_targets(self, targets):
+        # Kapalı işaretlenen hostların atlanan probları hiç sonuç üretmez
+        if not targets:
+            return
+        targets = set(targets)
+        with self.lock:
+            for key in [key for key in self._inflight if key[0] in targets]:
+                del self._inflight[key]
+
+    @property
+    def watermark(self):
+        with self.lock:
+            return min(self._inflight.values()) if self._inflight else self.issued
+
+class ScanCheckpoint:
+    """Tarama ilerlemesinin diske periyodik ve atomik kaydı.
+
+    Dosya shard başına devam noktası (tamamlanmış prob öneki) ile o ana
+    kadarki bulguları tutar: port taramasında hedef -> açık portlar, ağ
+    keşfinde canlı hostlar (boş liste). ``meta`` taramayı yeniden kurmak için
+    gereken parametrelerdir (istek, seed). Yazma geçici dosya + ``os.replace``
+    ile yapılır; çökme anında eski ya da yeni kayıt kalır, yarım dosya kalmaz.
+
+    Taramayı yürüten süreç ``acquire`` ile ``<path>.lock`` üzerinde flock
+    tutar. Kilit süreç ölünce çekirdek tarafından bırakılır; böylece hâlâ
+    çalışan bir taramaya ikinci kez devam edilemez, çöken süreçten kalana
+    edilebilir.
+    """
+
+    def __init__(self, path, meta=None, shard_count=1, interval=CHECKPOINT_INTERVAL):
+        self.path = path
+        self.meta = meta or {}
+        self.shard_count = shard_count
+        self.interval = interval
+        self.positions = [0] * shard_count
+        self.results = {}
+        self.trackers = {}
+        self._down_hosts = None
+        self._next_save = time.monotonic() + interval
+        self._lock_fd = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, interval=CHECKPOINT_INTERVAL):
+        with open(path, encoding='utf-8') as handle:
+            state = json.load(handle)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {path}")
+        checkpoint = cls(path, state['meta'], len(state['positions']), interval)
+        checkpoint.positions = state['positions']
+        checkpoint.results = {target: set(found) for target, found in state['results'].items()}
+        return checkpoint
+
+    @classmethod
+    def open(cls, path, meta=None, shard_count=1, interval=CHECKPOINT_INTERVAL):
+        # Dosya varsa kaldığı yerden, yoksa baştan
+        if os.path.exists(path):
+            return cls.load(path, interval)
+        return cls(path, meta, shard_count, interval)
+
+    def acquire(self):
+        """Checkpoint'i bu süreç adına kilitler; başkası tutuyorsa ``CheckpointInUse``."""
+        if fcntl is None or self._lock_fd is not None:
+            return self
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            raise CheckpointInUse(f"Checkpoint {self.path} is held by a running scan")
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._lock_fd = fd
+        return self
+
+    def release(self):
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def position(self, shard=0):
+        return self.positions[shard]
+
+    @property
+    def resumed(self):
+        return any(self.positions) or bool(self.results)
+
+    def track(self, probes, shard=0, key=None):
+        tracker = ProbeTracker(self.positions[shard], key)
+        self.trackers[shard] = tracker
+        return tracker.track(probes)
+
+    def tap(self, results, shard=0, down_hosts=None):
+        # Port taraması sonuçları: {'target', 'port', 'state'}
+        self._down_hosts = down_hosts
+        tracker = self.trackers.get(shard)
+        for result in results:
+            if tracker is not None:
+                tracker.done((result['target'], result['port']))
+            if result['state'] == OPEN:
+                self.add(result['target'], result['port'])
+            self.maybe_save()
+            yield result
+
+    def done(self, key, shard=0):
+        self.trackers[shard].done(key)
+        self.maybe_save()
+
+    def add(self, target, found=None):
+        with self.lock:
+            entry = self.results.setdefault(target, set())
+            if found is not None:
+                entry.add(found)
+
+    def found(self, target):
+        return sorted(self.results.get(target, ()))
+
+    def set_position(self, shard, position):
+        self.positions[shard] = position
+
+    def maybe_save(self):
+        if time.monotonic() >= self._next_save:
+            self.save()
+
+    def save(self):
+        if self._down_hosts is not None:
+            down = self._down_hosts()
+            for tracker in self.trackers.values():
+                tracker.drop_targets(down)
+        for shard, tracker in self.trackers.items():
+            self.positions[shard] = tracker.watermark
+
+        with self.lock:
+            state = {
+                'version': CHECKPOINT_VERSION,
+                'meta': self.meta,
+                'positions': self.positions,
+                'results': {target: sorted(found) for target, found in self.results.items()},
+                'saved_at': time.time()
+            }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                json.dump(state, handle, separators=(',', ':'))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._next_save = time.monotonic() + self.interval
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Başarıyla biten tarama dosyayı siler; hata/kesintide ilerleme yazılır
+        if exc_type is None:
+            self.remove()
+        else:
+            self.save()
+        return False
+
+    def remove(self):
+        # Tarama tamamlandı; devam edilecek bir şey kalmadı. Kilit dosyası
+        # kilit bırakılmadan silinir ki araya başka bir devam girmesin
+        paths = [self.path] if self._lock_fd is None else [self.path, self.path + LOCK_SUFFIX]
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.release()
@@ -0,0 +1,121 @@
+import threading
+import time
+
+from core.rtt_estimator import RESPONSIVE_ERRNOS
+
+class CongestionWindow:
+    """Tarama motorları için AIMD eşzamanlılık penceresi.
+
+    Cevap alınan her prob pencereyi büyütür: ``ssthresh`` altında prob başına
+    +1 (slow start), üstünde prob başına ``+1/pencere`` (RTT başına ~+1).
+    Problar ``sample_size`` büyüklüğünde dönemler halinde değerlendirilir; bir
+    dönemin timeout oranı ``loss_threshold``'u aşar ve önceki dönemden yüksekse
+    pencere ``decrease_factor`` ile çarpılır. Tamamen filtreli bir host sabit
+    %100 timeout üretir; oran yükselmediği için pencere her dönem yeniden
+    küçülmez.
+    """
+
+    def __init__(self, initial=64, minimum=1, maximum=5000, adaptive=True,
+                 decrease_factor=0.5, loss_threshold=0.2, sample_size=200):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.adaptive = adaptive
+        self.decrease_factor = decrease_factor
+        self.loss_threshold = loss_threshold
+        self.sample_size = sample_size
+
+        start = initial if adaptive else self.maximum
+        self.window = float(min(max(start, self.minimum), self.maximum))
+        self.ssthresh = float(self.maximum)
+        self.peak = self.window
+
+        self._responses = 0
+        self._timeouts = 0
+        self._last_loss_rate = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def size(self):
+        return int(self.window)
+
+    def on_response(self):
+        if not self.adaptive:
+            return
+        with self.lock:
+            if self.window < self.ssthresh:
+                self.window += 1
+            else:
+                self.window += 1 / self.window
+            self.window = min(self.window, self.maximum)
+            self.peak = max(self.peak, self.window)
+            self._responses += 1
+            self._end_epoch()
+
+    def on_timeout(self):
+        if not self.adaptive:
+            return
+        with self.lock:
+            self._timeouts += 1
+            self._end_epoch()
+
+    def on_result(self, err):
+        if err in RESPONSIVE_ERRNOS:
+            self.on_response()
+        else:
+            self.on_timeout()
+
+    def _end_epoch(self):
+        total = self._responses + self._timeouts
+        if total < self.sample_size:
+            return
+
+        loss_rate = self._timeouts / total
+        if loss_rate > self.loss_threshold and loss_rate > self._last_loss_rate:
+            self.ssthresh = max(self.window * self.decrease_factor, self.minimum)
+            self.window = self.ssthresh
+
+        self._last_loss_rate = loss_rate
+        self._responses = 0
+        self._timeouts = 0
+
+class ScanProgress:
+    def __init__(self, congestion, total=None, callback=None, interval=1.0):
+        self.congestion = congestion
+        self.total = total
+        self.callback = callback
+        self.interval = interval
+        self.completed = 0
+        self.open_found = 0
+        self._next_report = time.monotonic() + interval
+
+    def snapshot(self):
+        return {
+            'completed': self.completed,
+            'total': self.total,
+            'open_found': self.open_found,
+            'congestion_window': self.congestion.size,
+            'peak_congestion_window': int(self.congestion.peak)
+        }
+
+    def tick(self, completed=1, open_found=0):
+        self.completed += completed
+        self.open_found += open_found
+
+        now = time.monotonic()
+        if now < self._next_report:
+            return
+        self._next_report = now + self.interval
+
+        stats = self.snapshot()
+        total = f"/{self.total}" if self.total else ""
+        print(f"📈 İlerleme: {stats['completed']}{total} prob, "
+              f"{stats['open_found']} açık, pencere: {stats['congestion_window']}")
+        if self.callback:
+            self.callback(stats)
+
+def congestion_stats(congestion, progress):
+    return {
+        'probes_completed': progress.completed if progress else 0,
+        'congestion_window': congestion.size,
+        'peak_congestion_window': int(congestion.peak)
+    }
@@ -0,0 +1,258 @@
+import os
+import re
+import threading
+
+from core.service_registry import UNKNOWN_SERVICE, service_name
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'service_fingerprints.txt')
+
+# Ek imza dosyaları (ör. nmap-service-probes), os.pathsep ile ayrılmış
+EXTRA_DB_ENV = 'FINGERPRINT_DB_PATH'
+
+MAX_KEY_LENGTH = 8
+
+_LINE = re.compile(r'^(match|softmatch)\s+(\S+)\s+m(.)')
+_FIELD = re.compile(r'\s*([a-z]+)([/|])(.*?)\2')
+_GROUP_REF = re.compile(r'\$(\d)')
+_ESCAPES = {'r': '\r', 'n': '\n', 't': '\t', '0': '\0'}
+_QUANTIFIERS = '*?{'
+_META = '.[]()*+?{}|$^\\'
+
+def _literal_prefix(pattern):
+    """``^`` ile başlayan regex'in eşleşmede kesin bulunan sabit başlangıcı."""
+    if not pattern.startswith('^') or _has_top_level_alternation(pattern):
+        return ''
+
+    prefix = []
+    i = 1
+    while i < len(pattern) and len(prefix) < MAX_KEY_LENGTH:
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern):
+                break
+            escaped = pattern[i + 1]
+            if escaped in _ESCAPES:
+                literal, width = _ESCAPES[escaped], 2
+            elif escaped == 'x' and i + 3 < len(pattern):
+                try:
+                    literal, width = chr(int(pattern[i + 2:i + 4], 16)), 4
+                except ValueError:
+                    break
+            elif not escaped.isalnum():
+                literal, width = escaped, 2
+            else:
+                break
+        elif char in _META:
+            break
+        else:
+            literal, width = char, 1
+
+        following = pattern[i + width:i + width + 1]
+        if following and following in _QUANTIFIERS:
+            # Sıfır tekrar olabilir; bu karakter kesin değil
+            break
+        prefix.append(literal)
+        i += width
+        if following == '+':
+            break
+    return ''.join(prefix)
+
+def _has_top_level_alternation(pattern):
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+        i += 1
+    return False
+
+class Signature:
+    __slots__ = ('index', 'service', 'regex', 'product', 'version', 'info', 'ports')
+
+    def __init__(self, index, service, regex, product=None, version=None, info=None, ports=()):
+        self.index = index
+        self.service = service
+        self.regex = regex
+        self.product = product
+        self.version = version
+        self.info = info
+        self.ports = ports
+
+    def identify(self, banner):
+        match = self.regex.match(banner)
+        if not match:
+            return None
+
+        def group(ref):
+            number = int(ref.group(1))
+            return (match.group(number) or '') if number <= self.regex.groups else ''
+
+        def expand(template):
+            if not template:
+                return None
+            return ' '.join(_GROUP_REF.sub(group, template).split()) or None
+
+        return {
+            'service': self.service,
+            'product': expand(self.product),
+            'version': expand(self.version),
+            'info': expand(self.info)
+        }
+
+class FingerprintDB:
+    """Banner → servis/ürün/sürüm eşleştiren indeksli imza veritabanı.
+
+    İmzalar yüklenirken sabit başlangıçlarına (``^SSH-``, ``^220``) göre
+    kovalanır; sabit başlangıcı olmayanlar port ipucuna, o da yoksa genel
+    listeye düşer. Bir banner için yalnızca başlangıcıyla eşleşen kovalar,
+    portun ipucu kovası ve genel liste denenir; imza sayısı büyüse de banner
+    başına denenen regex sayısı küçük kalır. Dosya sırası korunur, ilk eşleşen kazanır.
+    """
+
+    def __init__(self):
+        self.signatures = []
+        self._prefix_index = {}     # anahtar uzunluğu -> {önek: [imza]}
+        self._prefix_index_ci = {}  # büyük/küçük harf duyarsız imzalar
+        self._port_index = {}
+        self._generic = []
+        self.skipped = 0
+
+    def load(self, path):
+        with open(path, encoding='latin-1') as handle:
+            for line in handle:
+                self.add_line(line)
+        return self
+
+    def add_line(self, line):
+        line = line.strip()
+        parsed = _LINE.match(line)
+        if not parsed:
+            return None
+
+        _kind, service, delimiter = parsed.groups()
+        start = parsed.end()
+        end = line.find(delimiter, start)
+        if end < 0:
+            self.skipped += 1
+            return None
+        pattern = line[start:end]
+
+        rest = line[end + 1:]
+        flags_text = rest.split(' ', 1)[0]
+        flags = 0
+        if 'i' in flags_text:
+            flags |= re.IGNORECASE
+        if 's' in flags_text:
+            flags |= re.DOTALL
+
+        fields = {key: value for key, _, value in _FIELD.findall(rest[len(flags_text):])}
+        ports = tuple(int(p) for p in fields.get('ports', '').split(',') if p.strip().isdigit())
+        return self.add(service, pattern, flags, fields.get('p'), fields.get('v'), fields.get('i'), ports)
+
+    def add(self, service, pattern, flags=0, product=None, version=None, info=None, ports=()):
+        try:
+            regex = re.compile(pattern, flags)
+        except re.error:
+            # nmap'in Perl'e özgü bazı regex'leri Python'da derlenmez
+            self.skipped += 1
+            return None
+
+        signature = Signature(len(self.signatures), service, regex, product, version, info, ports)
+        self.signatures.append(signature)
+
+        prefix = _literal_prefix(pattern)
+        if prefix:
+            index = self._prefix_index
+            if flags & re.IGNORECASE:
+                index, prefix = self._prefix_index_ci, prefix.lower()
+            index.setdefault(len(prefix), {}).setdefault(prefix, []).append(signature)
+        elif ports:
+            for port in ports:
+                self._port_index.setdefault(port, []).append(signature)
+        else:
+            self._generic.append(signature)
+        return signature
+
+    def candidates(self, banner, port=None):
+        buckets = []
+        for index, key in ((self._prefix_index, banner), (self._prefix_index_ci, None)):
+            if key is None:
+                if not index:
+                    continue
+                key = banner[:MAX_KEY_LENGTH].lower()
+            for length, bucket in index.items():
+                found = bucket.get(key[:length])
+                if found:
+                    buckets.append(found)
+        if port is not None and port in self._port_index:
+            buckets.append(self._port_index[port])
+        buckets.append(self._generic)
+
+        if len(buckets) == 1:
+            return buckets[0]
+        return sorted((s for bucket in buckets for s in bucket), key=lambda s: s.index)
+
+    def identify(self, banner, port=None):
+        """Banner'ı (str veya bytes) tanır; {'service', 'product', 'version', 'info'} ya da None."""
+        if not banner:
+            return None
+        if isinstance(banner, bytes):
+            banner = banner.decode('latin-1')
+        for signature in self.candidates(banner, port):
+            result = signature.identify(banner)
+            if result:
+                return result
+        return None
+
+    def __len__(self):
+        return len(self.signatures)
+
+_default_db = None
+_default_lock = threading.Lock()
+
+def get_fingerprint_db():
+    """Paylaşılan veritabanı; ilk çağrıda bir kez yüklenir."""
+    global _default_db
+    if _default_db is None:
+        with _default_lock:
+            if _default_db is None:
+                db = FingerprintDB().load(DEFAULT_DB_PATH)
+                for path in filter(None, os.environ.get(EXTRA_DB_ENV, '').split(os.pathsep)):
+                    db.load(path)
+                _default_db = db
+    return _default_db
+
+def identify_banner(banner, port=None):
+    return get_fingerprint_db().identify(banner, port)
+
+def describe_service(port, match=None, banner=None):
+    """Açık port için {'service', 'product', 'version', 'info'}.
+
+    Ad port kayıt tablosundan gelir; tabloda yoksa banner imzasının servisi
+    kullanılır. ``match`` banner okuyucunun zaten bulduğu imzadır; verilmezse
+    ``banner`` burada eşleştirilir.
+    """
+    if match is None and banner:
+        match = identify_banner(banner, port)
+    name = service_name(port)
+    if match and name is UNKNOWN_SERVICE:
+        name = match['service']
+    return {
+        'service': name,
+        'product': match['product'] if match else None,
+        'version': match['version'] if match else None,
+        'info': match['info'] if match else None
+    }
@@ -0,0 +1,163 @@
+import errno
+import select
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from core.rtt_estimator import RESPONSIVE_ERRNOS
+
+# Timeout veya hosta ulaşılamadığını gösteren sonuçlar; None = cevapsız prob
+UNRESPONSIVE_ERRNOS = {
+    None, errno.EAGAIN, errno.ETIMEDOUT, errno.EHOSTUNREACH, errno.ENETUNREACH,
+    getattr(errno, 'EHOSTDOWN', errno.EHOSTUNREACH),
+    getattr(errno, 'WSAETIMEDOUT', errno.ETIMEDOUT)
+}
+IN_PROGRESS_ERRNOS = {errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+# Host kapalı sayılmadan önce canlılığı doğrulamak için denenen portlar
+LIVENESS_PORTS = (80, 443, 22, 3389, 445, 8080)
+LIVENESS_TIMEOUT = 1.0
+LIVENESS_WORKERS = 32
+
+def _answered(err):
+    # SYN-ACK (0) veya RST/başka bir hata: host ayakta
+    return err == 0 or err in RESPONSIVE_ERRNOS or err not in UNRESPONSIVE_ERRNOS
+
+def tcp_alive(target, ports=LIVENESS_PORTS, timeout=LIVENESS_TIMEOUT):
+    """Host ``ports``'tan herhangi birinde SYN-ACK veya RST ile cevap veriyor mu.
+
+    Bağlantılar bloklamadan aynı anda açılır; toplam bekleme ``timeout``
+    saniyeyi geçmez. Çözümlenemeyen hedef ayakta sayılmaz.
+    """
+    try:
+        address = socket.gethostbyname(target)
+    except OSError:
+        return False
+    pending = {}
+    try:
+        for port in ports:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex((address, port))
+            if err in IN_PROGRESS_ERRNOS:
+                pending[sock] = port
+                continue
+            sock.close()
+            if _answered(err):
+                return True
+
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _, writable, _ = select.select([], list(pending), [], remaining)
+            for sock in writable:
+                del pending[sock]
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                sock.close()
+                if _answered(err):
+                    return True
+        return False
+    finally:
+        for sock in pending:
+            sock.close()
+
+_checker = None
+_checker_lock = threading.Lock()
+
+def _executor():
+    global _checker
+    with _checker_lock:
+        if _checker is None:
+            _checker = ThreadPoolExecutor(max_workers=LIVENESS_WORKERS, thread_name_prefix='liveness')
+        return _checker
+
+def confirm_down(targets, liveness_check=tcp_alive):
+    """Canlılık kontrolünden de cevap alınamayan hedefler (kontroller paralel yürür)."""
+    targets = list(targets)
+    if liveness_check is None or not targets:
+        return targets
+    alive = list(_executor().map(liveness_check, targets))
+    return [target for target, up in zip(targets, alive) if not up]
+
+class HostHealth:
+    """Cevap vermeyen hostları tarama sırasında tespit eder.
+
+    Bir hosttan art arda ``down_after`` prob cevapsız kalırsa ve o hosttan
+    henüz hiç cevap (SYN-ACK, RST ya da başka bir hata) görülmediyse host
+    şüpheli olur ve arka planda ``liveness_check`` (varsayılan: yaygın
+    portlara TCP bağlantısı) çalıştırılır. Yalnızca bu kontrol de cevapsız
+    kalırsa host kapalı sayılır ve kalan probları atlanır; kontrol cevap
+    alırsa host "ayakta" işaretlenir ve taramaya devam edilir. Böylece
+    yalnızca birkaç portu açık, gerisini düşüren (firewall'lu) hostlar
+    kapalı sayılmaz. Tek bir cevap hostu kalıcı olarak "ayakta" işaretler.
+    ``down_after`` 0/None ise (varsayılan) tespit kapalıdır.
+    """
+
+    def __init__(self, down_after=0, liveness_check=tcp_alive):
+        self.down_after = down_after
+        self.liveness_check = liveness_check
+        self._timeouts = {}   # hedef -> art arda cevapsız prob; -1 = cevap görüldü
+        self._down = set()
+        self._checks = {}     # hedef -> sürmekte olan canlılık kontrolü
+        self.lock = threading.Lock()
+
+    def observe(self, target, err):
+        if not self.down_after:
+            return
+        with self.lock:
+            count = self._timeouts.get(target, 0)
+            if count < 0:
+                return
+            if err in RESPONSIVE_ERRNOS or err not in UNRESPONSIVE_ERRNOS:
+                # Kapalı işaretlendikten sonra gelen geç cevap da hostu ayağa kaldırır
+                self._timeouts[target] = -1
+                self._down.discard(target)
+                return
+            count += 1
+            self._timeouts[target] = count
+            if count != self.down_after:
+                return
+            if self.liveness_check is None:
+                self._down.add(target)
+                return
+            # Kontrol tarama döngüsünü bloklamaz; bu sırada problar sürer
+            self._checks[target] = _executor().submit(self._confirm, target)
+
+    def _confirm(self, target):
+        try:
+            alive = self.liveness_check(target)
+        except Exception:
+            alive = False
+        with self.lock:
+            self._checks.pop(target, None)
+            if alive:
+                self._timeouts[target] = -1
+            elif self._timeouts.get(target, 0) >= 0:
+                self._down.add(target)
+
+    def wait(self, timeout=None):
+        # Sürmekte olan canlılık kontrollerinin bitmesini bekler
+        with self.lock:
+            checks = list(self._checks.values())
+        if checks:
+            wait(checks, timeout=timeout)
+
+    def is_down(self, target):
+        return target in self._down
+
+    def down_hosts(self):
+        return sorted(self._down)
+
+    def responded_hosts(self):
+        with self.lock:
+            return sorted(target for target, count in self._timeouts.items() if count < 0)
+
+    def filter_probes(self, probes):
+        # Kapalı işaretlenen hostların kalan problarını üretmeden atlar
+        down = self._down
+        for probe in probes:
+            if probe[0] not in down:
+                yield probe
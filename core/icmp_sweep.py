@@ -0,0 +1,161 @@
+import os
+import select
+import socket
+import struct
+import time
+from collections import OrderedDict
+
+from core.rate_limiter import probe_limiter
+from core.syn_scanner import _checksum
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMP_HEADER = struct.Struct('!BBHHH')
+
+DEFAULT_RATE = 5000
+
+def open_icmp_socket():
+    """ICMP soketi açar: önce yetkisiz datagram, olmazsa raw.
+
+    Linux'ta datagram ICMP soketine ``net.ipv4.ping_group_range`` izin verir;
+    kimliği çekirdek atar ve yalnızca bu sokete ait cevaplar gelir. Raw soket
+    için root/CAP_NET_RAW gerekir ve tüm ICMP trafiği okunur.
+    Dönüş: (soket, raw mı).
+    """
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP), False
+    except OSError:
+        pass
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP), True
+    except PermissionError:
+        raise PermissionError("ICMP taraması için ping_group_range izni, root yetkisi veya CAP_NET_RAW gerekli")
+
+class IcmpSweeper:
+    """Tek soketten ICMP echo taraması (ping sweep).
+
+    Echo istekleri hız limitiyle gönderilir, cevaplar aynı döngüde
+    bloklamadan okunur. Her hosta gönderilen sıra numarası ve paket içindeki
+    rastgele anahtar saklanır; cevap kaynak IP, sıra numarası ve anahtarla
+    eşleşmezse yok sayılır (raw sokette ayrıca kimlik kontrol edilir).
+    ``timeout`` içinde cevap vermeyen hosta ``retries`` kez yeniden gönderilir.
+    Sonuçlar her host için ``(ip, canlı mı)`` olarak gönderim sırasıyla değil
+    kesinleştikçe akışa düşer.
+    """
+
+    def __init__(self, timeout=1.0, rate=DEFAULT_RATE, retries=1, limiter=None):
+        self.timeout = timeout
+        self.rate = rate
+        self.retries = retries
+        self.share = (limiter or probe_limiter()).share()
+        self.ident = os.getpid() & 0xffff
+        self.token = os.urandom(8)
+        self.sock = None
+        self.raw = False
+        self.sent = 0
+
+    def open(self):
+        if self.sock is None:
+            self.sock, self.raw = open_icmp_socket()
+            self.sock.setblocking(False)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        return self
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def build_echo(self, seq):
+        header = ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, self.ident, seq)
+        checksum = _checksum(header + self.token)
+        return header[:2] + struct.pack('H', checksum) + header[4:] + self.token
+
+    def _parse_reply(self, packet, source_ip):
+        # Raw soket (ve bazı sistemlerde datagram soket) IP başlığıyla döner
+        if packet and packet[0] >> 4 == 4:
+            packet = packet[(packet[0] & 0x0f) * 4:]
+        if len(packet) < ICMP_HEADER.size + len(self.token):
+            return None
+        icmp_type, _code, _checksum_, ident, seq = ICMP_HEADER.unpack_from(packet)
+        if icmp_type != ICMP_ECHO_REPLY or packet[ICMP_HEADER.size:ICMP_HEADER.size + len(self.token)] != self.token:
+            return None
+        # Datagram sokette kimliği çekirdek yeniden yazar
+        if self.raw and ident != self.ident:
+            return None
+        return source_ip, seq
+
+    def _drain(self, pending, timeout):
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        while readable:
+            try:
+                packet, address = self.sock.recvfrom(65535)
+            except (BlockingIOError, InterruptedError):
+                return
+            reply = self._parse_reply(packet, address[0])
+            if reply is not None:
+                ip, seq = reply
+                entry = pending.get(ip)
+                if entry is not None and entry[2] == seq:
+                    del pending[ip]
+                    yield ip, True
+            readable, _, _ = select.select([self.sock], [], [], 0)
+
+    def _send(self, ip, seq, pending, attempts):
+        try:
+            self.sock.sendto(self.build_echo(seq), (ip, 0))
+        except OSError:
+            # Yönlendirme yok / arabellek dolu: bu deneme cevapsız sayılır
+            pass
+        self.sent += 1
+        pending[ip] = (time.monotonic() + self.timeout, attempts, seq)
+        pending.move_to_end(ip)
+
+    def _expire(self, pending):
+        # Bekleyenler son geçerlilik sırasıyla tutulur; baştan taramak yeter
+        now = time.monotonic()
+        while pending:
+            ip, (deadline, attempts, seq) = next(iter(pending.items()))
+            if deadline > now:
+                return
+            if attempts <= self.retries:
+                self._send(ip, (seq + 1) & 0xffff, pending, attempts + 1)
+            else:
+                del pending[ip]
+                yield ip, False
+
+    def _pace(self, started, pending):
+        # Hız limiti: yerel hız ve süreç geneli limiter'dan hız token'ı
+        while self.sent >= (time.monotonic() - started) * self.rate:
+            yield from self._drain(pending, 0.002)
+        wait = self.share.try_acquire(hold=False)
+        while wait:
+            yield from self._drain(pending, wait)
+            wait = self.share.try_acquire(hold=False)
+
+    def iter_sweep(self, targets):
+        self.open()
+        pending = OrderedDict()   # ip -> (son geçerlilik, deneme, sıra no)
+        self.sent = 0
+        started = time.monotonic()
+
+        with self.share:
+            try:
+                for index, target in enumerate(targets):
+                    yield from self._pace(started, pending)
+                    ip = str(target)
+                    self._send(ip, index & 0xffff, pending, 1)
+                    if self.sent % 64 == 0:
+                        yield from self._drain(pending, 0)
+                        yield from self._expire(pending)
+
+                # Son isteklerin cevapları ve yeniden denemeler
+                while pending:
+                    deadline = next(iter(pending.values()))[0]
+                    yield from self._drain(pending, max(0.0, min(deadline - time.monotonic(), 0.05)))
+                    yield from self._expire(pending)
+            finally:
+                self.close()
+
+    def sweep(self, targets):
+        return sorted((ip for ip, alive in self.iter_sweep(targets) if alive), key=socket.inet_aton)
@@ -2,13 +2,48 @@ import subprocess
 import socket
 import ipaddress
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 import platform
+from collections import deque
+from contextlib import nullcontext
+
+from core.batch_scanner import BatchPortScanner
+from core.icmp_sweep import DEFAULT_RATE, IcmpSweeper
+from core.reverse_dns import DEFAULT_DEADLINE, shared_resolver
+from core.streaming import FILTERED, bounded_map
+
+# ICMP'yi düşüren ağlarda canlılık kanıtı için denenen portlar
+DEFAULT_TCP_PORTS = (22, 80, 443, 3389)
+# auto: ICMP, cevap vermeyenlere TCP; icmp: yalnızca ICMP; tcp: yalnızca TCP
+DISCOVERY_METHODS = ('auto', 'icmp', 'tcp')
+# TCP keşfinde host başına denenecek en fazla port
+MAX_DISCOVERY_PORTS = 32
 
 class NetworkDiscovery:
-    def __init__(self):
+    def __init__(self, timeout=1.0, rate=DEFAULT_RATE, retries=1, method='auto',
+                 tcp_ports=DEFAULT_TCP_PORTS, tcp_concurrency=1024, resolver=None):
+        if method not in DISCOVERY_METHODS:
+            raise ValueError(f"Geçersiz keşif yöntemi: {method}")
         self.alive_hosts = []
         self.lock = threading.Lock()
+        self.timeout = timeout
+        self.rate = rate
+        self.retries = retries
+        self.discovery = method
+        self.tcp_ports = tuple(tcp_ports)
+        self.tcp_concurrency = tcp_concurrency
+        self.method = None
+        self.resolver = resolver or shared_resolver()
+        self.prefetch_names = False
+    
+    def _mark_alive(self, ip, via=None):
+        with self.lock:
+            self.alive_hosts.append(str(ip))
+            print(f"✅ {ip} - CANLI" + (f" ({via})" if via else ""))
+        if self.prefetch_names:
+            # PTR sorgusu tarama sürerken arka planda başlar
+            self.resolver.prefetch(ip)
     
     def ping_host(self, ip):
         try:
@@ -22,17 +57,97 @@ class NetworkDiscovery:
                                   stderr=subprocess.DEVNULL)
             
             if result.returncode == 0:
-                with self.lock:
-                    self.alive_hosts.append(str(ip))
-                    print(f"✅ {ip} - CANLI")
+                self._mark_alive(ip)
+                return True
                     
         except Exception:
             pass
+        return False
     
-    def discover_network(self, network="192.168.1.0/24", max_threads=50):
+    def _ping_job(self, ip):
+        return str(ip), self.ping_host(ip)
+    
+    def _probe_hosts(self, hosts, max_threads, high_water):
+        # Tek soketten ICMP echo; soket açılamazsa host başına ping süreci
+        sweeper = IcmpSweeper(timeout=self.timeout, rate=self.rate, retries=self.retries)
+        try:
+            sweeper.open()
+        except PermissionError as e:
+            print(f"⚠️  {e}; ping komutuna dönülüyor")
+            self.method = 'ping'
+            with ThreadPoolExecutor(max_workers=max_threads) as executor:
+                yield from bounded_map(executor, self._ping_job, ((ip,) for ip in hosts), high_water or max_threads * 2)
+            return
+        
+        self.method = 'icmp_raw' if sweeper.raw else 'icmp_dgram'
+        for ip, alive in sweeper.iter_sweep(hosts):
+            if alive:
+                self._mark_alive(ip)
+            yield ip, alive
+    
+    def _tcp_probe(self, resolved):
+        # ``resolved`` akışında canlı çıkmayan hostlar TCP ile yeniden denenir:
+        # herhangi bir porttan SYN-ACK ya da RST gelmesi hostun canlı olduğunu gösterir
+        scanner = BatchPortScanner(batch_size=self.tcp_concurrency, timeout=self.timeout,
+                                   max_timeout=self.timeout, adaptive=False, host_down_after=0)
+        ready = deque()
+        remaining = {}   # host -> sonucu beklenen TCP prob sayısı
+        
+        def probes():
+            for ip, alive in resolved:
+                if alive:
+                    ready.append((ip, True))
+                    continue
+                remaining[ip] = len(self.tcp_ports)
+                for port in self.tcp_ports:
+                    yield ip, port
+        
+        for result in scanner.iter_probes(probes()):
+            while ready:
+                yield ready.popleft()
+            ip = result['target']
+            count = remaining.get(ip)
+            if count is None:
+                # Başka bir porttan zaten canlı bulundu
+                continue
+            if result['state'] != FILTERED:
+                del remaining[ip]
+                self._mark_alive(ip, f"TCP {result['port']}")
+                yield ip, True
+            elif count == 1:
+                del remaining[ip]
+                yield ip, False
+            else:
+                remaining[ip] = count - 1
+        while ready:
+            yield ready.popleft()
+        # Soket açılamayan problar sonuç üretmez; kalanlar cevapsızdır
+        for ip in list(remaining):
+            yield ip, False
+        self.method = f"{self.method}+tcp" if self.method else 'tcp'
+    
+    def _resolve_hosts(self, hosts, max_threads, high_water):
+        if self.discovery == 'tcp':
+            return self._tcp_probe((str(ip), False) for ip in hosts)
+        resolved = self._probe_hosts(hosts, max_threads, high_water)
+        if self.discovery == 'icmp' or not self.tcp_ports:
+            return resolved
+        return self._tcp_probe(resolved)
+    
+    @staticmethod
+    def _hosts_from(net, start):
+        # net.hosts() ile aynı sıra; ilk ``start`` host üretilmeden atlanır
+        first = int(net.network_address) + (1 if net.num_addresses > 2 else 0)
+        count = net.num_addresses - 2 if net.num_addresses > 2 else net.num_addresses
+        return (ipaddress.IPv4Address(first + i) for i in range(start, count))
+    
+    def discover_network(self, network="192.168.1.0/24", max_threads=50, high_water=None, checkpoint=None,
+                         resolve_names=False):
         print(f"\n🔍 AĞ KEŞFİ")
         print(f"🌐 Hedef ağ: {network}")
-        print(f"🧵 Thread sayısı: {max_threads}")
+        print(f"📨 ICMP hızı: {self.rate} istek/sn (ping yedeği: {max_threads} thread)")
+        if self.discovery != 'icmp' and self.tcp_ports:
+            print(f"🔌 TCP keşif portları: {', '.join(map(str, self.tcp_ports))}")
         print("-" * 50)
         
         try:
@@ -43,15 +158,25 @@ class NetworkDiscovery:
             print("-" * 50)
             
             self.alive_hosts = []  # Reset
+            self.method = None
+            self.prefetch_names = resolve_names
+            start = 0
+            if checkpoint is not None:
+                start = checkpoint.position()
+                self.alive_hosts = list(checkpoint.results)
+                if checkpoint.resumed:
+                    print(f"♻️  Kaldığı yerden devam: {start} IP zaten tarandı, {len(self.alive_hosts)} canlı")
             
-            with ThreadPoolExecutor(max_workers=max_threads) as executor:
-                futures = []
-                for ip in net.hosts(): 
-                    future = executor.submit(self.ping_host, ip)
-                    futures.append(future)
-                
-                for future in futures:
-                    future.result()
+            # Hostlar tembel üretilir; bellekte yalnızca cevap beklenenler tutulur
+            with checkpoint or nullcontext():
+                hosts = self._hosts_from(net, start)
+                if checkpoint is not None:
+                    hosts = checkpoint.track(hosts, key=str)
+                for ip, alive in self._resolve_hosts(hosts, max_threads, high_water):
+                    if checkpoint is not None:
+                        if alive:
+                            checkpoint.add(ip)
+                        checkpoint.done(ip)
             
             print("-" * 50)
             print(f"🎉 Toplam {len(self.alive_hosts)} canlı host bulundu")
@@ -61,26 +186,33 @@ class NetworkDiscovery:
         except Exception as e:
             print(f"❌ Hata: {e}")
             return []
+        finally:
+            self.prefetch_names = False
     
     def get_hostname(self, ip):
-        try:
-            hostname = socket.gethostbyaddr(ip)[0]
-            return hostname
-        except:
-            return "Bilinmiyor"
+        return self.resolver.resolve(ip) or "Bilinmiyor"
+    
+    def resolve_hostnames(self, hosts, deadline=DEFAULT_DEADLINE):
+        """Canlı hostların PTR adları ({ip: ad veya None}); sorgular paralel, önbellekli."""
+        started = time.monotonic()
+        hostnames = self.resolver.resolve_many(hosts, deadline)
+        named = sum(1 for hostname in hostnames.values() if hostname)
+        print(f"🔤 {named}/{len(hostnames)} host adı {time.monotonic() - started:.2f} sn'de çözüldü")
+        return hostnames
     
     def detailed_discovery(self, network="192.168.1.0/24"):
         print(f"\n🔍 DETAYLI AĞ KEŞFİ")
-        alive_hosts = self.discover_network(network)
+        alive_hosts = self.discover_network(network, resolve_names=True)
         
         if alive_hosts:
+            hostnames = self.resolve_hostnames(alive_hosts)
             print(f"\n📋 DETAYLI RAPOR:")
             print("-" * 70)
             print(f"{'IP Adresi':<15} {'Hostname':<25} {'Durum'}")
             print("-" * 70)
             
             for ip in alive_hosts:
-                hostname = self.get_hostname(ip)
+                hostname = hostnames.get(ip) or "Bilinmiyor"
                 print(f"{ip:<15} {hostname:<25} Canlı")
 
 def get_local_network():
@@ -1,44 +1,115 @@
 import socket
+import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+from core.banner_grabber import BannerGrabber
+from core.fingerprints import describe_service
+from core.host_health import HostHealth
+from core.port_state import PortStateMap
+from core.rate_limiter import probe_limiter
+from core.socket_limits import fast_teardown
+from core.service_registry import service_name
+from core.top_ports import top_ports
+from core.rtt_estimator import RTTEstimator
+from core.streaming import FILTERED, OPEN, aiterate_sync, classify, port_result
 
 class PortScanner:
-    def __init__(self, timeout: int = 3):
+    def __init__(self, timeout: float = 3, min_timeout: float = 0.1, max_timeout: Optional[float] = None,
+                 host_down_after: int = 0, limiter=None, fast_teardown: bool = True):
         self.timeout = timeout
+        self.fast_teardown = fast_teardown
+        self.rtt = RTTEstimator(initial_timeout=timeout, min_timeout=min_timeout, max_timeout=max_timeout)
+        self.health = HostHealth(down_after=host_down_after)
+        self.share = (limiter or probe_limiter()).share()
         
-    def scan_port(self, target_ip: str, port: int) -> bool:
+    def probe_port(self, target_ip: str, port: int) -> str:
+        self.share.acquire()
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            result = sock.connect_ex((target_ip, port))
-            sock.close()
-            return result == 0
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                if self.fast_teardown:
+                    fast_teardown(sock)
+                sock.settimeout(self.rtt.timeout_for(target_ip))
+                started = time.monotonic()
+                result = sock.connect_ex((target_ip, port))
+            self.rtt.observe_result(target_ip, result, time.monotonic() - started)
+            self.health.observe(target_ip, result)
+            return classify(result)
         except Exception:
-            return False
+            self.health.observe(target_ip, None)
+            return FILTERED
+        finally:
+            self.share.release()
+    
+    def scan_port(self, target_ip: str, port: int) -> bool:
+        return self.probe_port(target_ip, port) == OPEN
+    
+    def identify_service(self, port: int, banner: Optional[str] = None, match: Optional[Dict] = None) -> Dict:
+        # Port adı + banner imzasından ürün/sürüm (get_service_name'in zenginleştirilmiş hali)
+        return describe_service(port, match=match, banner=banner)
     
     def get_service_name(self, port: int) -> str:
-        services = {
-            21: "FTP", 22: "SSH", 23: "Telnet", 25: "SMTP",
-            53: "DNS", 80: "HTTP", 443: "HTTPS", 3000: "Node.js",
-            3306: "MySQL", 5432: "PostgreSQL"
-        }
-        return services.get(port, "Unknown")
+        return service_name(port)
+    
+    def down_hosts(self) -> List[str]:
+        return self.health.down_hosts()
     
-    def scan_ports(self, target_ip: str, ports: List[int]) -> Dict:
+    def iter_scan(self, target_ip: str, ports: Iterable[int]) -> Iterator[Dict]:
+        with self.share:
+            for port in ports:
+                if self.health.is_down(target_ip):
+                    # Cevapsız host: kalan portlar beklenmeden bırakılır
+                    break
+                result = port_result(target_ip, port, self.probe_port(target_ip, port))
+                if result['state'] == OPEN:
+                    result['service'] = self.get_service_name(port)
+                yield result
+    
+    def aiter_scan(self, target_ip: str, ports: Iterable[int]) -> AsyncIterator[Dict]:
+        return aiterate_sync(lambda: self.iter_scan(target_ip, ports))
+    
+    def scan_top_ports(self, target_ip: str, count: int = 1000,
+                       banner_grabber: Optional[BannerGrabber] = None) -> Dict:
+        # En olası açık portlar önce denenir
+        return self.scan_ports(target_ip, top_ports(count), banner_grabber=banner_grabber)
+    
+    def scan_ports(self, target_ip: str, ports: Iterable[int],
+                   banner_grabber: Optional[BannerGrabber] = None) -> Dict:
         results = {
             'target': target_ip,
             'scan_time': datetime.now().isoformat(),
             'open_ports': [],
-            'closed_ports': []
+            'closed_ports_count': 0,
+            'port_states': PortStateMap(),
+            'host_down': False
         }
         
-        for port in ports:
-            if self.scan_port(target_ip, port):
+        scan = self.iter_scan(target_ip, ports)
+        if banner_grabber is not None:
+            # Banner okuma tarama sürerken arka planda yürür
+            scan = banner_grabber.tap(scan)
+        
+        for result in scan:
+            results['port_states'].set(result['port'], result['state'])
+            if result['state'] == OPEN:
                 results['open_ports'].append({
-                    'port': port,
-                    'service': self.get_service_name(port)
+                    'port': result['port'],
+                    'service': result['service']
                 })
             else:
-                results['closed_ports'].append(port)
+                results['closed_ports_count'] += 1
+        
+        # Taranmayan portlar port_states'te bilinmiyor olarak kalır; sürmekte
+        # olan canlılık kontrolü hükmü belirler
+        self.health.wait()
+        results['host_down'] = self.health.is_down(target_ip)
+        
+        if banner_grabber is not None:
+            banner_grabber.wait()
+            banners = banner_grabber.banners_for(target_ip)
+            services = banner_grabber.services_for(target_ip)
+            for port_info in results['open_ports']:
+                port_info['banner'] = banners.get(port_info['port'])
+                port_info.update(self.identify_service(port_info['port'], match=services.get(port_info['port'])))
                 
         return results
\ No newline at end of file
@@ -0,0 +1,201 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+from core.top_ports import top_ports
+
+MIN_PORT = 1
+MAX_PORT = 65535
+
+PROTOCOL_PREFIXES = {'T': 'tcp', 'U': 'udp'}
+
+def _merge(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return tuple(merged)
+
+def _subtract(ranges, removed):
+    # İki birleştirilmiş aralık listesinin farkı
+    result = []
+    index = 0
+    for start, end in ranges:
+        while index < len(removed) and removed[index][1] < start:
+            index += 1
+        cursor = index
+        while start <= end and cursor < len(removed) and removed[cursor][0] <= end:
+            cut_start, cut_end = removed[cursor]
+            if cut_start > start:
+                result.append((start, cut_start - 1))
+            start = max(start, cut_end + 1)
+            cursor += 1
+        if start <= end:
+            result.append((start, end))
+    return result
+
+def _parse_port(text, token):
+    try:
+        port = int(text)
+    except ValueError:
+        raise ValueError(f"Invalid port in '{token}'")
+    if not MIN_PORT <= port <= MAX_PORT:
+        raise ValueError(f"Port {port} must be between {MIN_PORT} and {MAX_PORT}")
+    return port
+
+def _parse_range(token):
+    if '-' not in token:
+        port = _parse_port(token, token)
+        return port, port
+
+    start, _, end = token.partition('-')
+    start = _parse_port(start, token) if start else MIN_PORT
+    end = _parse_port(end, token) if end else MAX_PORT
+    if end < start:
+        raise ValueError(f"Port range '{token}' is reversed")
+    return start, end
+
+def _top_ranges(protocol, token):
+    try:
+        count = int(token[4:])
+    except ValueError:
+        raise ValueError(f"Invalid top-ports count in '{token}'")
+    if not 1 <= count <= MAX_PORT:
+        raise ValueError(f"top:N must be between 1 and {MAX_PORT}")
+    return [(port, port) for port in top_ports(count, protocol)]
+
+class PortSet:
+    """Protokol başına birleştirilmiş port aralıklarından oluşan tembel küme.
+
+    Spec sözdizimi nmap ile aynıdır: ``1-1024,3306,8000-,top:100,U:53,161``.
+    ``T:``/``U:`` öneki kendinden sonraki tüm parçalar için protokolü belirler
+    (varsayılan TCP). Doğrulama ve tekilleştirme aralık sayısıyla orantılıdır;
+    iterasyon, ``len`` ve indeksleme port listesi oluşturmadan yapılır.
+    Tarayıcılar TCP portlarını gezer; UDP portları ``ports('udp')`` ile alınır.
+    """
+
+    __slots__ = ('tcp', 'udp', '_offsets')
+
+    def __init__(self, tcp=(), udp=()):
+        self.tcp = _merge(tcp)
+        self.udp = _merge(udp)
+        # TCP aralıklarının kümülatif uzunlukları (indeksleme için)
+        self._offsets = tuple(accumulate(end - start + 1 for start, end in self.tcp))
+
+    @classmethod
+    def parse(cls, spec):
+        ranges = {'tcp': [], 'udp': []}
+        protocol = 'tcp'
+        for token in str(spec).replace(' ', '').split(','):
+            if not token:
+                continue
+            if len(token) > 1 and token[1] == ':' and token[0].upper() in PROTOCOL_PREFIXES:
+                protocol = PROTOCOL_PREFIXES[token[0].upper()]
+                token = token[2:]
+                if not token:
+                    continue
+            if token.lower().startswith('top:'):
+                ranges[protocol].extend(_top_ranges(protocol, token))
+            else:
+                ranges[protocol].append(_parse_range(token))
+
+        port_set = cls(**ranges)
+        if not port_set:
+            raise ValueError('Port specification cannot be empty')
+        return port_set
+
+    @classmethod
+    def from_range(cls, start, end):
+        return cls(tcp=[(start, end)])
+
+    @classmethod
+    def from_ports(cls, ports, protocol='tcp'):
+        for port in ports:
+            if not MIN_PORT <= port <= MAX_PORT:
+                raise ValueError(f"Port {port} must be between {MIN_PORT} and {MAX_PORT}")
+        return cls(**{protocol: [(port, port) for port in ports]})
+
+    @classmethod
+    def coerce(cls, ports):
+        """Spec string, port listesi, ``range`` veya ``PortSet`` kabul eder."""
+        if isinstance(ports, cls):
+            return ports
+        if isinstance(ports, str):
+            return cls.parse(ports)
+        if isinstance(ports, range) and ports.step == 1 and len(ports):
+            return cls.from_range(ports.start, ports.stop - 1)
+        return cls.from_ports(list(ports))
+
+    def ports(self, protocol='tcp'):
+        for start, end in getattr(self, protocol):
+            yield from range(start, end + 1)
+
+    def count(self, protocol='tcp'):
+        return sum(end - start + 1 for start, end in getattr(self, protocol))
+
+    def __iter__(self):
+        return self.ports('tcp')
+
+    def __len__(self):
+        return self._offsets[-1] if self._offsets else 0
+
+    def __bool__(self):
+        return bool(self.tcp or self.udp)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('PortSet index out of range')
+        segment = bisect_right(self._offsets, index)
+        before = self._offsets[segment - 1] if segment else 0
+        return self.tcp[segment][0] + index - before
+
+    def __contains__(self, port):
+        segment = bisect_right(self.tcp, (port, MAX_PORT + 1)) - 1
+        return segment >= 0 and self.tcp[segment][1] >= port
+
+    def __or__(self, other):
+        return PortSet(tcp=self.tcp + other.tcp, udp=self.udp + other.udp)
+
+    def __sub__(self, other):
+        return PortSet(tcp=_subtract(self.tcp, other.tcp), udp=_subtract(self.udp, other.udp))
+
+    def __eq__(self, other):
+        if not isinstance(other, PortSet):
+            return NotImplemented
+        return self.tcp == other.tcp and self.udp == other.udp
+
+    def __hash__(self):
+        return hash((self.tcp, self.udp))
+
+    def __getstate__(self):
+        return self.tcp, self.udp
+
+    def __setstate__(self, state):
+        self.tcp, self.udp = state
+        self._offsets = tuple(accumulate(end - start + 1 for start, end in self.tcp))
+
+    def first(self):
+        return self.tcp[0][0] if self.tcp else None
+
+    def last(self):
+        return self.tcp[-1][1] if self.tcp else None
+
+    def to_spec(self):
+        def fmt(ranges):
+            return ','.join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+        parts = []
+        if self.tcp:
+            parts.append(fmt(self.tcp))
+        if self.udp:
+            parts.append('U:' + fmt(self.udp))
+        return ','.join(parts)
+
+    __str__ = to_spec
+
+    def __repr__(self):
+        return f"PortSet('{self.to_spec()}')"
@@ -0,0 +1,207 @@
+from core.streaming import CLOSED, FILTERED, OPEN
+
+UNKNOWN = 'unknown'
+
+# Durum kodu = (hi bit << 1) | lo bit
+STATE_CODES = {UNKNOWN: 0, OPEN: 1, CLOSED: 2, FILTERED: 3}
+CODE_STATES = {code: state for state, code in STATE_CODES.items()}
+
+MAX_PORT = 65535
+
+def _iter_bits(mask):
+    # Yalnızca set edilmiş bitleri gezer
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class PortStateMap:
+    """Bir host için port başına 2 bitlik durum tablosu.
+
+    Durumlar iki bit düzleminde tutulur (``lo`` ve ``hi``, port başına birer bit);
+    65535 portluk tam tarama ~16 KB yer kaplar. Durum sorguları ve karşılaştırmalar
+    düzlemler büyük tamsayıya çevrilip bit işlemleriyle yapılır. Saklama ve API
+    çıktısı için bilinen portlar ``[başlangıç, bitiş, durum]`` koşularına sıkıştırılır.
+    """
+
+    __slots__ = ('_lo', '_hi')
+
+    def __init__(self, results=None):
+        self._lo = bytearray()
+        self._hi = bytearray()
+        if results is not None:
+            self.update(results)
+
+    def _grow(self, port):
+        needed = (port >> 3) + 1
+        if needed > len(self._lo):
+            extra = needed - len(self._lo)
+            self._lo.extend(bytes(extra))
+            self._hi.extend(bytes(extra))
+
+    def set(self, port, state):
+        if not 0 <= port <= MAX_PORT:
+            raise ValueError(f"Invalid port: {port}")
+        code = STATE_CODES[state]
+        self._grow(port)
+        index, bit = port >> 3, 1 << (port & 7)
+        if code & 1:
+            self._lo[index] |= bit
+        else:
+            self._lo[index] &= ~bit
+        if code & 2:
+            self._hi[index] |= bit
+        else:
+            self._hi[index] &= ~bit
+
+    def get(self, port):
+        index = port >> 3
+        if index >= len(self._lo):
+            return UNKNOWN
+        bit = 1 << (port & 7)
+        code = (1 if self._lo[index] & bit else 0) | (2 if self._hi[index] & bit else 0)
+        return CODE_STATES[code]
+
+    __getitem__ = get
+    __setitem__ = set
+
+    def update(self, results):
+        # Tarama akışındaki {'port', 'state'} sonuçlarını işler
+        for result in results:
+            self.set(result['port'], result['state'])
+        return self
+
+    @classmethod
+    def from_ports(cls, open_ports=(), closed_ports=(), filtered_ports=()):
+        states = cls()
+        for ports, state in ((closed_ports, CLOSED), (filtered_ports, FILTERED), (open_ports, OPEN)):
+            for port in ports:
+                states.set(port, state)
+        return states
+
+    def _planes(self):
+        return int.from_bytes(self._lo, 'little'), int.from_bytes(self._hi, 'little')
+
+    def mask(self, state):
+        """İstenen durumdaki portların bit maskesi (bit i = port i)."""
+        lo, hi = self._planes()
+        if state == OPEN:
+            return lo & ~hi
+        if state == CLOSED:
+            return hi & ~lo
+        if state == FILTERED:
+            return lo & hi
+        if state == UNKNOWN:
+            return ~(lo | hi) & ((1 << (MAX_PORT + 1)) - 1)
+        raise ValueError(f"Unknown port state: {state}")
+
+    def ports(self, state):
+        return list(_iter_bits(self.mask(state)))
+
+    def count(self, state):
+        return bin(self.mask(state)).count('1')
+
+    def counts(self):
+        return {state: self.count(state) for state in (OPEN, CLOSED, FILTERED)}
+
+    def __len__(self):
+        lo, hi = self._planes()
+        return bin(lo | hi).count('1')
+
+    def __contains__(self, port):
+        return self.get(port) != UNKNOWN
+
+    def __eq__(self, other):
+        if not isinstance(other, PortStateMap):
+            return NotImplemented
+        return self._planes() == other._planes()
+
+    def merge(self, other):
+        """``other``'da bilinen portların durumunu bu tabloya yazar."""
+        if other._lo:
+            self._grow((len(other._lo) << 3) - 1)
+        lo, hi = self._planes()
+        other_lo, other_hi = other._planes()
+        known = other_lo | other_hi
+        size = len(self._lo)
+        self._lo[:] = ((lo & ~known) | other_lo).to_bytes(size, 'little')
+        self._hi[:] = ((hi & ~known) | other_hi).to_bytes(size, 'little')
+        return self
+
+    def changed(self, other):
+        """İki taramada durumu farklı olan portların bit maskesi."""
+        lo, hi = self._planes()
+        other_lo, other_hi = other._planes()
+        return (lo ^ other_lo) | (hi ^ other_hi)
+
+    def diff(self, previous):
+        """``previous`` taramasına göre yeni açılan ve artık açık olmayan portlar.
+
+        Yalnızca iki taramada da durumu bilinen portlar karşılaştırılır;
+        ``previous``'ın hiç denemediği portlardan açık bulunanlar "yeni açıldı"
+        değil ``first_seen`` olarak raporlanır.
+        """
+        now_open = self.mask(OPEN)
+        was_open = previous.mask(OPEN)
+        unprobed = previous.mask(UNKNOWN)
+        return {
+            'opened': list(_iter_bits(now_open & ~was_open & ~unprobed)),
+            'closed': list(_iter_bits(was_open & ~now_open & ~self.mask(UNKNOWN))),
+            'first_seen': list(_iter_bits(now_open & unprobed))
+        }
+
+    def runs(self):
+        """Bilinen portları ``(başlangıç, bitiş, durum)`` koşuları olarak üretir."""
+        lo, hi = self._lo, self._hi
+        run_start, run_code = None, 0
+        for index in range(len(lo)):
+            lo_byte, hi_byte = lo[index], hi[index]
+            # Hızlı yol: 8 portun hepsi aynı durumdaysa tek adımda geç
+            if lo_byte in (0, 0xff) and hi_byte in (0, 0xff):
+                code = (lo_byte & 1) | (hi_byte & 2)
+                if code != run_code:
+                    if run_code:
+                        yield run_start, (index << 3) - 1, CODE_STATES[run_code]
+                    run_start, run_code = index << 3, code
+                continue
+            for offset in range(8):
+                code = ((lo_byte >> offset) & 1) | (((hi_byte >> offset) & 1) << 1)
+                if code != run_code:
+                    port = (index << 3) + offset
+                    if run_code:
+                        yield run_start, port - 1, CODE_STATES[run_code]
+                    run_start, run_code = port, code
+        if run_code:
+            yield run_start, (len(lo) << 3) - 1, CODE_STATES[run_code]
+
+    def to_runs(self):
+        return [[start, end, state] for start, end, state in self.runs()]
+
+    @classmethod
+    def from_runs(cls, runs):
+        lo = hi = 0
+        last = -1
+        for start, end, state in runs:
+            code = STATE_CODES[state]
+            span = ((1 << (end + 1)) - 1) ^ ((1 << start) - 1)
+            if code & 1:
+                lo |= span
+            if code & 2:
+                hi |= span
+            last = max(last, end)
+
+        states = cls()
+        size = (last >> 3) + 1 if last >= 0 else 0
+        states._lo = bytearray(lo.to_bytes(size, 'little'))
+        states._hi = bytearray(hi.to_bytes(size, 'little'))
+        return states
+
+    def to_dict(self):
+        return {
+            'counts': self.counts(),
+            'runs': self.to_runs()
+        }
+
+    def __repr__(self):
+        counts = self.counts()
+        return f"<PortStateMap(open={counts[OPEN]}, closed={counts[CLOSED]}, filtered={counts[FILTERED]})>"
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+
+# Ortam değişkeniyle süreç genelinde varsayılan sınırlar; 0 = sınırsız
+DEFAULT_PROBE_RATE = float(os.environ.get('PROBE_RATE_LIMIT') or 0)
+DEFAULT_MAX_INFLIGHT = int(os.environ.get('MAX_INFLIGHT_PROBES') or 0)
+
+# Token kovası bu kadar saniyelik hızı biriktirebilir (ani patlama payı)
+BURST_SECONDS = 0.05
+# Uçuştaki prob sınırına takılan bekleme için yoklama aralığı
+POLL_INTERVAL = 0.01
+
+class ProbeLimiter:
+    """Süreç genelinde prob hızı (token bucket) ve uçuştaki prob sınırı.
+
+    Aynı süreçte eşzamanlı çalışan tüm taramalar tek limiter'dan çeker. Her
+    tarama ``share()`` ile bir pay alır; ``with share:`` bloğu boyunca aktif
+    sayılır. N aktif tarama varsa her biri saniyede ``rate / N`` prob ve en
+    fazla ``max_inflight / N`` uçuştaki prob hakkına sahiptir; toplam hiçbir
+    zaman ``max_inflight``'ı aşmaz. ``rate`` veya ``max_inflight`` 0 ise o
+    sınır uygulanmaz.
+    """
+
+    def __init__(self, rate=DEFAULT_PROBE_RATE, max_inflight=DEFAULT_MAX_INFLIGHT):
+        self.rate = rate
+        self.max_inflight = max_inflight
+        self.in_flight = 0
+        self._shares = set()
+        self.cond = threading.Condition()
+
+    def configure(self, rate=0, max_inflight=0):
+        with self.cond:
+            self.rate = rate
+            self.max_inflight = max_inflight
+            self.cond.notify_all()
+
+    def share(self):
+        return ScanShare(self)
+
+    @property
+    def active_scans(self):
+        return len(self._shares)
+
+    def fair_rate(self):
+        return self.rate / max(1, len(self._shares))
+
+    def fair_inflight(self):
+        return max(1, self.max_inflight // max(1, len(self._shares)))
+
+    def stats(self):
+        with self.cond:
+            return {
+                'rate': self.rate,
+                'max_inflight': self.max_inflight,
+                'in_flight': self.in_flight,
+                'active_scans': len(self._shares)
+            }
+
+class ScanShare:
+    """Bir taramanın limiter'daki payı: kendi token kovası ve uçuştaki sayacı."""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.in_flight = 0
+        self.tokens = 1.0
+        self.stamp = time.monotonic()
+
+    def __enter__(self):
+        with self.limiter.cond:
+            self.limiter._shares.add(self)
+            self.tokens, self.stamp = 1.0, time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self.limiter.cond:
+            self.limiter._shares.discard(self)
+            # Ayrılan taramanın payı diğerlerine geçer
+            self.limiter.cond.notify_all()
+        return False
+
+    def _take(self, now, hold):
+        # Kilit çağıran tarafından tutulur; izin verilirse 0, yoksa bekleme süresi
+        limiter = self.limiter
+        if hold and limiter.max_inflight:
+            if limiter.in_flight >= limiter.max_inflight or self.in_flight >= limiter.fair_inflight():
+                return POLL_INTERVAL
+        if limiter.rate:
+            rate = limiter.fair_rate()
+            self.tokens = min(self.tokens + (now - self.stamp) * rate, max(1.0, rate * BURST_SECONDS))
+            self.stamp = now
+            if self.tokens < 1:
+                return (1 - self.tokens) / rate
+            self.tokens -= 1
+        if hold:
+            self.in_flight += 1
+            limiter.in_flight += 1
+        return 0.0
+
+    def try_acquire(self, hold=True):
+        """Bloklamadan prob hakkı ister; alınırsa 0, alınamazsa önerilen bekleme.
+
+        ``hold`` False ise yalnızca hız token'ı alınır (durumsuz SYN gibi
+        uçuşta bağlantı tutmayan problar için); ``release`` çağrılmaz.
+        """
+        if not hold and not self.limiter.rate:
+            return 0.0
+        with self.limiter.cond:
+            return self._take(time.monotonic(), hold)
+
+    def acquire(self, hold=True):
+        limiter = self.limiter
+        with limiter.cond:
+            while True:
+                wait = self._take(time.monotonic(), hold)
+                if not wait:
+                    return
+                limiter.cond.wait(wait)
+
+    def release(self):
+        limiter = self.limiter
+        with limiter.cond:
+            self.in_flight -= 1
+            limiter.in_flight -= 1
+            limiter.cond.notify()
+
+_limiter = ProbeLimiter()
+
+def probe_limiter():
+    """Motorların varsayılan olarak paylaştığı süreç geneli limiter."""
+    return _limiter
+
+def configure_limiter(rate=0, max_inflight=0):
+    _limiter.configure(rate, max_inflight)
+    return _limiter
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 60.0
+DEFAULT_MAX_ENTRIES = 100000
+
+class ResultCache:
+    """(ip, port, protokol) -> son prob sonucu; kısa ömürlü, boyutu sınırlı.
+
+    Aynı hedef/portlar birkaç dakika içinde tekrar sorulduğunda ağa yeniden
+    prob gönderilmez. Kayıtlar ``ttl`` saniye sonra geçersiz olur; kayıt
+    sayısı ``max_entries``'i aşınca en uzun süredir kullanılmayan atılır
+    (LRU). Değer ``{'state', ...}`` sözlüğüdür; açık portlar için servis ve
+    banner bilgisi de saklanır. ``ttl`` 0 ise önbellek kapalıdır.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # anahtar -> (son geçerlilik, değer)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.ttl) and self.max_entries > 0
+
+    def get(self, ip, port, protocol='tcp'):
+        key = (ip, port, protocol)
+        now = time.monotonic()
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def lookup(self, ip, ports, protocol='tcp'):
+        """Önbellekte geçerli sonucu olan portlar için {port: değer}."""
+        if not self.enabled:
+            return {}
+        found = {}
+        for port in ports:
+            value = self.get(ip, port, protocol)
+            if value is not None:
+                found[port] = value
+        return found
+
+    def put(self, ip, port, state, protocol='tcp', **info):
+        if not self.enabled:
+            return
+        key = (ip, port, protocol)
+        with self.lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(info, state=state))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, ip=None):
+        with self.lock:
+            if ip is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == ip]:
+                del self._entries[key]
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self):
+        return len(self._entries)
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def shared_cache(ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+    """Süreç genelinde tek önbellek; ilk çağrıdaki ayarlarla oluşturulur."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ResultCache(ttl, max_entries)
+        return _shared
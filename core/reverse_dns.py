@@ -0,0 +1,159 @@
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
+
+DEFAULT_POSITIVE_TTL = 3600.0
+DEFAULT_NEGATIVE_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 50000
+DEFAULT_WORKERS = 256
+# Toplu çözümlemede cevap beklenecek en uzun süre (saniye)
+DEFAULT_DEADLINE = 10.0
+
+# Önbellekte kayıt yok (None = "PTR kaydı yok" negatif sonucudur)
+MISSING = object()
+
+class ReverseDnsResolver:
+    """Sınırlı thread havuzuyla eşzamanlı PTR (ters DNS) çözümleyici.
+
+    ``socket.gethostbyaddr`` bloklayan bir çağrıdır ve cevapsız sorgu
+    saniyelerce sürebilir; sorgular en fazla ``workers`` thread'de paralel
+    yürür. Sonuçlar IP başına önbelleğe yazılır: bulunan adlar
+    ``positive_ttl``, PTR kaydı olmayan / cevap vermeyen IP'ler
+    ``negative_ttl`` saniye saklanır; kayıt sayısı ``max_entries``'i aşınca
+    en uzun süredir kullanılmayan atılır (LRU). Aynı IP için uçuşta olan
+    sorgu tekrar gönderilmez. Toplu çözümlemede ``deadline``'a yetişmeyen
+    sorgular arka planda bitip önbelleğe yazılmaya devam eder.
+    """
+
+    def __init__(self, positive_ttl=DEFAULT_POSITIVE_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES, workers=DEFAULT_WORKERS):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.workers = workers
+        self._entries = OrderedDict()   # ip -> (son geçerlilik, host adı veya None)
+        self._pending = {}              # ip -> Future
+        self.executor = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, ip):
+        """Önbellekteki geçerli sonuç; yoksa ``MISSING``."""
+        now = time.monotonic()
+        with self.lock:
+            entry = self._entries.get(ip)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[ip]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(ip)
+            self.hits += 1
+            return entry[1]
+
+    def _store(self, ip, hostname):
+        ttl = self.positive_ttl if hostname else self.negative_ttl
+        with self.lock:
+            self._pending.pop(ip, None)
+            if not ttl or self.max_entries <= 0:
+                return
+            self._entries[ip] = (time.monotonic() + ttl, hostname)
+            self._entries.move_to_end(ip)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, ip):
+        try:
+            hostname = socket.gethostbyaddr(ip)[0]
+        except OSError:
+            # herror (kayıt yok), gaierror ve zaman aşımı negatif sonuçtur
+            hostname = None
+        self._store(ip, hostname)
+        return hostname
+
+    def submit(self, ip):
+        """Sorguyu bloklamadan başlatır (ya da uçuştakini döndürür); Future döner."""
+        ip = str(ip)
+        with self.lock:
+            future = self._pending.get(ip)
+            if future is None:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='rdns')
+                future = self.executor.submit(self._lookup, ip)
+                self._pending[ip] = future
+        return future
+
+    def prefetch(self, ip):
+        # Keşif sırasında canlı bulunan host için önden sorgu
+        if self.get(str(ip)) is MISSING:
+            self.submit(ip)
+
+    def resolve(self, ip, timeout=None):
+        ip = str(ip)
+        hostname = self.get(ip)
+        if hostname is not MISSING:
+            return hostname
+        try:
+            return self.submit(ip).result(timeout)
+        except FutureTimeout:
+            return None
+
+    def iter_resolve(self, ips, deadline=DEFAULT_DEADLINE):
+        """``(ip, host adı veya None)`` çiftleri; önbellektekiler hemen, diğerleri çözüldükçe."""
+        futures = {}
+        seen = set()
+        for ip in ips:
+            ip = str(ip)
+            if ip in seen:
+                continue
+            seen.add(ip)
+            hostname = self.get(ip)
+            if hostname is not MISSING:
+                yield ip, hostname
+                continue
+            futures[self.submit(ip)] = ip
+
+        remaining = dict(futures)
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                yield remaining.pop(future), future.result()
+        except FutureTimeout:
+            for future, ip in remaining.items():
+                yield ip, future.result() if future.done() else None
+
+    def resolve_many(self, ips, deadline=DEFAULT_DEADLINE):
+        return dict(self.iter_resolve(ips, deadline))
+
+    def invalidate(self, ip=None):
+        with self.lock:
+            if ip is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(ip), None)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self._entries),
+                'pending': len(self._pending),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def shared_resolver(positive_ttl=DEFAULT_POSITIVE_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                    max_entries=DEFAULT_MAX_ENTRIES, workers=DEFAULT_WORKERS):
+    """Süreç genelinde tek çözümleyici; ilk çağrıdaki ayarlarla oluşturulur."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ReverseDnsResolver(positive_ttl, negative_ttl, max_entries, workers)
+        return _shared
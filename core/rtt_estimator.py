@@ -0,0 +1,50 @@
+import errno
+import threading
+
+# Bu sonuçlar hedefin gerçekten cevap verdiğini gösterir (SYN-ACK veya RST)
+RESPONSIVE_ERRNOS = {0, errno.ECONNREFUSED, getattr(errno, 'WSAECONNREFUSED', errno.ECONNREFUSED)}
+
+class RTTEstimator:
+    """Hedef başına yumuşatılmış RTT ve varyans ile prob timeout'u hesaplar.
+
+    RFC 6298'deki TCP RTO hesabının aynısı: her başarılı ya da reddedilen
+    bağlantıdan sonra ``srtt`` ve ``rttvar`` güncellenir, timeout
+    ``srtt + 4 * rttvar`` olup ``[min_timeout, max_timeout]`` aralığına kırpılır.
+    Henüz ölçüm yoksa ``initial_timeout`` kullanılır.
+    """
+
+    ALPHA = 0.125
+    BETA = 0.25
+    K = 4
+
+    def __init__(self, initial_timeout=1.0, min_timeout=0.1, max_timeout=None):
+        self.max_timeout = max_timeout if max_timeout is not None else initial_timeout
+        self.min_timeout = min(min_timeout, self.max_timeout)
+        self.initial_timeout = min(max(initial_timeout, self.min_timeout), self.max_timeout)
+        self._stats = {}
+        self.lock = threading.Lock()
+
+    def observe(self, target, rtt):
+        with self.lock:
+            stats = self._stats.get(target)
+            if stats is None:
+                self._stats[target] = [rtt, rtt / 2]
+                return
+            srtt, rttvar = stats
+            stats[1] = (1 - self.BETA) * rttvar + self.BETA * abs(srtt - rtt)
+            stats[0] = (1 - self.ALPHA) * srtt + self.ALPHA * rtt
+
+    def observe_result(self, target, err, rtt):
+        if err in RESPONSIVE_ERRNOS:
+            self.observe(target, rtt)
+
+    def timeout_for(self, target):
+        stats = self._stats.get(target)
+        if stats is None:
+            return self.initial_timeout
+        srtt, rttvar = stats
+        return min(max(srtt + self.K * rttvar, self.min_timeout), self.max_timeout)
+
+    def srtt(self, target):
+        stats = self._stats.get(target)
+        return stats[0] if stats else None
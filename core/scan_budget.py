@@ -0,0 +1,102 @@
+import math
+import time
+
+from core.port_spec import PortSet
+
+# Bütçenin bu kadarı ölçüm/yazma payı olarak ayrılır
+SAFETY_MARGIN = 0.05
+
+class ScanBudget:
+    """Tarama için duvar saati bütçesi ("60 saniyede bitir").
+
+    ``tune`` bütçeye sığacak eşzamanlılık ve prob timeout'unu seçer: en kötü
+    durumda her prob bir timeout sürer, akıştan çekilmiş son problar için de
+    boşaltma payı (uçuştakiler ve motor kuyruğundakiler) ayrılır. ``limit`` prob akışını bu paya gelindiğinde
+    keser ve üretilen prob sayısını sayar. Problar sıralı (``shuffle=False``)
+    bir planlayıcıdan geldiğinde taranmayan portlar bu sayılardan tam olarak
+    hesaplanır; kalan akışı gezmek gerekmez.
+    """
+
+    def __init__(self, seconds, reserve=0.0):
+        self.seconds = seconds
+        self.reserve = reserve
+        self.drain = 0.0
+        self.deadline = None
+        self.issued = [0]
+
+    def _usable(self, floor):
+        return max(self.seconds * (1 - SAFETY_MARGIN) - self.reserve, floor)
+
+    def tune(self, probe_count, timeout, min_timeout, concurrency, max_concurrency, drain_rounds=1):
+        """Bütçeye göre (eşzamanlılık, timeout) döndürür.
+
+        ``drain_rounds``: akıştan çekilmiş ama bitmemiş probların kaç timeout'ta
+        boşaldığı; uçuştakilerin yanında kuyrukta prob bekleten motorlarda
+        (thread havuzu) kuyruk derinliği / eşzamanlılık kadar artar.
+        """
+        usable = self._usable(min_timeout * (drain_rounds + 1))
+        timeout = max(min(timeout, usable / (drain_rounds + 1)), min_timeout)
+        needed = math.ceil(probe_count * timeout / (usable - drain_rounds * timeout)) if probe_count else 1
+        if needed > max_concurrency:
+            # Pencere yetmiyor: C slot, T timeout ile usable = T * (P / C + R)
+            timeout = max(min_timeout, usable / (probe_count / max_concurrency + drain_rounds))
+            needed = max_concurrency
+        self.drain = timeout * drain_rounds + self.reserve
+        return min(max(concurrency, needed), max_concurrency), timeout
+
+    def tune_rate(self, probe_count, wait, rate, max_rate):
+        """Durumsuz (SYN) motor için saniyedeki paket hızını seçer."""
+        usable = self._usable(wait * 2)
+        self.drain = wait + self.reserve
+        needed = math.ceil(probe_count / (usable - wait)) if probe_count else 1
+        return min(max(rate, needed), max_rate)
+
+    def start(self):
+        self.deadline = time.monotonic() + self.seconds * (1 - SAFETY_MARGIN)
+        return self
+
+    def remaining(self):
+        if self.deadline is None:
+            return self.seconds
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= self.drain
+
+    def limit(self, probes, shard_index=0):
+        # Yeni prob, uçuştakilerin bitmesine yetecek süre kaldıkça üretilir
+        if self.deadline is None:
+            self.start()
+        while len(self.issued) <= shard_index:
+            self.issued.append(0)
+        cutoff = self.deadline - self.drain
+        # Checkpoint'ten devam eden akış ``issued`` ayarlanmış olarak başlar
+        base = self.issued[shard_index]
+        for count, probe in enumerate(probes):
+            if time.monotonic() >= cutoff:
+                break
+            self.issued[shard_index] = base + count + 1
+            yield probe
+
+    def unscanned(self, planner):
+        """Sıralı planlayıcı için {hedef: PortSet}; her şey tarandıysa boş."""
+        total = len(planner)
+        shard_count = len(self.issued)
+        # Shard s'nin ilk üretmediği indeks; s, s + S, s + 2S, ... sırasıyla ilerler
+        frontiers = [shard + count * shard_count for shard, count in enumerate(self.issued)]
+        low, high = min(frontiers), max(frontiers)
+        if low >= total:
+            return {}
+
+        target_count = planner.target_count
+        ports = planner.ports
+        unscanned = {}
+        for t_index in range(target_count):
+            start = max(0, -(-(low - t_index) // target_count))
+            ragged_end = max(start, -(-(high - t_index) // target_count))
+            missing = [ports[j] for j in range(start, min(ragged_end, len(ports)))
+                       if j * target_count + t_index >= frontiers[(j * target_count + t_index) % shard_count]]
+            missing.extend(ports[j] for j in range(ragged_end, len(ports)))
+            if missing:
+                unscanned[planner.target_at(t_index)] = PortSet.from_ports(missing)
+        return unscanned
@@ -0,0 +1,103 @@
+import ipaddress
+import math
+import random
+from bisect import bisect_right
+
+from core.port_spec import PortSet
+from core.top_ports import LikelihoodOrder
+
+def _coprime_step(n, rng):
+    if n <= 2:
+        return 1
+    while True:
+        step = rng.randrange(1, n)
+        if math.gcd(step, n) == 1:
+            return step
+
+class ScanPlanner:
+    """Hedef × port uzayını hostlar arasında serpiştirilmiş bir prob akışına çevirir.
+
+    Prob indeksi ``i`` için hedef ``i % hedef_sayısı``, port ``i // hedef_sayısı``
+    olur. İndeksler ``(offset + k * step) mod N`` ile gezilir; step N ile aralarında
+    asal olduğundan her (hedef, port) çifti tam bir kez üretilir ve ardışık problar
+    farklı hostlara düşer. Hedef listesi CIDR blokları için açılmaz, indeksten
+    hesaplanır. ``shuffle=False`` ile step 1 olur: port sırası (ör. olasılık
+    sırası) korunur, her port tüm hedeflere sırayla gönderilir.
+    """
+
+    def __init__(self, targets, ports, seed=None, shuffle=True):
+        self._segment_starts = []
+        self._segments = []
+        self.target_count = 0
+
+        for target in targets:
+            self._add_target(target)
+
+        self.ports = ports if isinstance(ports, (range, PortSet, LikelihoodOrder)) else list(ports)
+
+        rng = random.Random(seed)
+        total = len(self)
+        if shuffle:
+            self.step = _coprime_step(total, rng)
+            self.offset = rng.randrange(total) if total else 0
+        else:
+            self.step, self.offset = 1, 0
+
+    def _add_target(self, target):
+        target = str(target).strip()
+        try:
+            net = ipaddress.ip_network(target, strict=False)
+        except ValueError:
+            # Hostname: tek hedef olarak ekle
+            first, count = target, 1
+        else:
+            if net.num_addresses > 2 and net.version == 4:
+                first, count = int(net.network_address) + 1, net.num_addresses - 2
+            else:
+                first, count = int(net.network_address), net.num_addresses
+
+        self._segment_starts.append(self.target_count)
+        self._segments.append((first, count))
+        self.target_count += count
+
+    def target_at(self, index):
+        segment = bisect_right(self._segment_starts, index) - 1
+        first, count = self._segments[segment]
+        if isinstance(first, str):
+            return first
+        return str(ipaddress.ip_address(first + index - self._segment_starts[segment]))
+
+    def probe_at(self, index):
+        return self.target_at(index % self.target_count), self.ports[index // self.target_count]
+
+    def __len__(self):
+        return self.target_count * len(self.ports)
+
+    def shard_size(self, shard_index=0, shard_count=1):
+        return max(0, (len(self) - shard_index + shard_count - 1) // shard_count)
+
+    def iter_indices(self, shard_index=0, shard_count=1, start=0):
+        # Permütasyon dizisindeki k. eleman: (offset + k * step) mod N.
+        # Shard i, k ≡ i (mod shard_count) olan elemanları alır; ilk ``start`` tanesi atlanır.
+        total = len(self)
+        if not total:
+            return
+        index = (self.offset + (shard_index + start * shard_count) * self.step) % total
+        stride = (shard_count * self.step) % total
+        for _ in range(self.shard_size(shard_index, shard_count) - start):
+            yield index
+            index += stride
+            if index >= total:
+                index -= total
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+    def iter_from(self, start):
+        # Checkpoint'ten devam: ilk ``start`` prob üretilmeden atlanır
+        for index in self.iter_indices(start=start):
+            yield self.probe_at(index)
+
+    def targets(self):
+        for index in range(self.target_count):
+            yield self.target_at(index)
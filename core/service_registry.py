@@ -0,0 +1,74 @@
+import os
+
+UNKNOWN_SERVICE = "Unknown"
+SYSTEM_SERVICES_PATH = '/etc/services'
+PORT_SLOTS = 65536
+
+# Paketle gelen görünen adlar; /etc/services'teki adlardan önceliklidir
+BUNDLED_SERVICES = {
+    'tcp': {
+        7: "Echo", 9: "Discard", 13: "Daytime", 20: "FTP-Data", 21: "FTP",
+        22: "SSH", 23: "Telnet", 25: "SMTP", 37: "Time", 43: "WHOIS",
+        53: "DNS", 69: "TFTP", 79: "Finger", 80: "HTTP", 81: "HTTP-Alt",
+        88: "Kerberos", 106: "POP3PW", 110: "POP3", 111: "RPCBind", 113: "Ident",
+        119: "NNTP", 123: "NTP", 135: "MSRPC", 139: "NetBIOS-SSN", 143: "IMAP",
+        179: "BGP", 199: "SMUX", 389: "LDAP", 427: "SLP", 443: "HTTPS",
+        445: "SMB", 465: "SMTPS", 513: "Rlogin", 514: "RSH", 515: "LPD",
+        543: "Klogin", 544: "Kshell", 548: "AFP", 554: "RTSP", 587: "SMTP-Submission",
+        631: "IPP", 636: "LDAPS", 646: "LDP", 873: "Rsync", 990: "FTPS",
+        993: "IMAPS", 995: "POP3S", 1025: "MS-RPC", 1080: "SOCKS", 1194: "OpenVPN",
+        1433: "MSSQL", 1521: "Oracle", 1720: "H.323", 1723: "PPTP", 1883: "MQTT",
+        1900: "UPnP", 2049: "NFS", 2121: "FTP-Proxy", 2181: "ZooKeeper", 2375: "Docker",
+        2376: "Docker-TLS", 3000: "Node.js", 3128: "Squid", 3306: "MySQL", 3389: "RDP",
+        3690: "SVN", 4369: "EPMD", 5000: "UPnP/Flask", 5060: "SIP", 5222: "XMPP",
+        5432: "PostgreSQL", 5601: "Kibana", 5666: "NRPE", 5672: "AMQP", 5900: "VNC",
+        5984: "CouchDB", 6000: "X11", 6379: "Redis", 6443: "Kubernetes-API", 6667: "IRC",
+        7001: "WebLogic", 8000: "HTTP-Alt", 8008: "HTTP-Alt", 8080: "HTTP-Proxy", 8081: "HTTP-Alt",
+        8443: "HTTPS-Alt", 8888: "HTTP-Alt", 9000: "PHP-FPM", 9042: "Cassandra", 9092: "Kafka",
+        9100: "JetDirect", 9200: "Elasticsearch", 9300: "Elasticsearch-Node", 9418: "Git", 10000: "Webmin",
+        11211: "Memcached", 15672: "RabbitMQ-Mgmt", 27017: "MongoDB", 50000: "SAP",
+    },
+    'udp': {
+        53: "DNS", 67: "DHCP", 68: "DHCP-Client", 69: "TFTP", 123: "NTP",
+        137: "NetBIOS-NS", 138: "NetBIOS-DGM", 161: "SNMP", 162: "SNMP-Trap", 500: "IKE",
+        514: "Syslog", 520: "RIP", 1194: "OpenVPN", 1434: "MSSQL-Monitor", 1900: "SSDP",
+        4500: "IPsec-NAT-T", 5060: "SIP", 5353: "mDNS", 11211: "Memcached", 51820: "WireGuard",
+    }
+}
+
+def _load_system_services(path, tables):
+    # Satır biçimi: "ssh  22/tcp  # yorum"; ilk kayıt kazanır
+    try:
+        with open(path, encoding='utf-8', errors='replace') as handle:
+            for line in handle:
+                fields = line.split('#', 1)[0].split()
+                if len(fields) < 2 or '/' not in fields[1]:
+                    continue
+                port, _, protocol = fields[1].partition('/')
+                table = tables.get(protocol)
+                if table is None or not port.isdigit() or int(port) >= PORT_SLOTS:
+                    continue
+                if table[int(port)] is UNKNOWN_SERVICE:
+                    table[int(port)] = fields[0]
+    except OSError:
+        pass
+
+def build_tables(system_path=SYSTEM_SERVICES_PATH):
+    tables = {protocol: [UNKNOWN_SERVICE] * PORT_SLOTS for protocol in BUNDLED_SERVICES}
+    for protocol, services in BUNDLED_SERVICES.items():
+        for port, name in services.items():
+            tables[protocol][port] = name
+    if system_path and os.path.exists(system_path):
+        _load_system_services(system_path, tables)
+    return tables
+
+# Import sırasında bir kez kurulur; sorgular tek liste indekslemesidir
+SERVICE_TABLES = build_tables()
+TCP_SERVICES = SERVICE_TABLES['tcp']
+UDP_SERVICES = SERVICE_TABLES['udp']
+
+def service_name(port, protocol='tcp'):
+    try:
+        return SERVICE_TABLES[protocol][port]
+    except (KeyError, IndexError, TypeError):
+        return UNKNOWN_SERVICE
@@ -0,0 +1,259 @@
+import json
+import multiprocessing
+import os
+import struct
+import time
+from datetime import datetime
+from multiprocessing.connection import wait
+
+from core.batch_scanner import BatchPortScanner
+from core.checkpoint import ProbeTracker
+from core.rate_limiter import ProbeLimiter, probe_limiter
+from core.scan_planner import ScanPlanner
+from core.socket_limits import ephemeral_cap
+from core.streaming import OPEN, aiterate_sync, collect_open, port_result
+from core.top_ports import top_ports
+
+# Worker -> parent mesajları: 1 byte etiket + gövde
+#   R: paketlenmiş (hedef indeksi, port) kayıtları, kayıt başına 6 byte
+#   P: ilerleme (JSON), S: shard sonu istatistikleri (JSON)
+#   W: checkpoint için tamamlanmış prob öneki (JSON)
+RECORD = struct.Struct('!IH')
+RECORDS_PER_MESSAGE = 4096
+FLUSH_INTERVAL = 0.5
+
+def _scan_shard(planner, shard_index, shard_count, options, conn, budget=None, start=None, limits=(0, 0)):
+    def report(stats):
+        conn.send_bytes(b'P' + json.dumps(stats).encode())
+
+    target_index = {}
+    # start None ise checkpoint tutulmaz
+    tracker = ProbeTracker(start) if start is not None else None
+
+    def probes():
+        target_count = planner.target_count
+        for index in planner.iter_indices(shard_index, shard_count, start or 0):
+            t_index = index % target_count
+            target = planner.target_at(t_index)
+            target_index.setdefault(target, t_index)
+            yield target, planner.ports[index // target_count]
+
+    try:
+        # Worker ayrı süreç: parent'taki payın shard'a düşen kısmı kendi limiter'ında
+        scanner = BatchPortScanner(progress_callback=report, limiter=ProbeLimiter(*limits), **options)
+        shard_probes = probes() if budget is None else budget.limit(probes(), shard_index)
+        if tracker is not None:
+            shard_probes = tracker.track(shard_probes)
+        total = planner.shard_size(shard_index, shard_count) - (start or 0)
+        results = scanner.iter_probes(shard_probes, total=total)
+
+        def send_position():
+            # Kapalı hostların atlanan probları sonuç üretmez, önekten düşülür
+            tracker.drop_targets(scanner.down_hosts())
+            conn.send_bytes(b'W' + json.dumps(tracker.watermark).encode())
+
+        # Açık portlar bulundukça (doluluk ya da süre eşiğinde) parent'a aktarılır
+        buffer = bytearray(b'R')
+        next_flush = time.monotonic() + FLUSH_INTERVAL
+        for result in results:
+            if tracker is not None:
+                tracker.done((result['target'], result['port']))
+            if result['state'] == OPEN:
+                buffer += RECORD.pack(target_index[result['target']], result['port'])
+            full = len(buffer) >= 1 + RECORD.size * RECORDS_PER_MESSAGE
+            if full or time.monotonic() >= next_flush:
+                # Açık kayıtlar, onları kapsayan devam noktasından önce gider
+                if len(buffer) > 1:
+                    conn.send_bytes(buffer)
+                    buffer = bytearray(b'R')
+                if tracker is not None:
+                    send_position()
+                next_flush = time.monotonic() + FLUSH_INTERVAL
+        if len(buffer) > 1:
+            conn.send_bytes(buffer)
+        if tracker is not None:
+            send_position()
+
+        stats = scanner.congestion_stats()
+        stats['down_hosts'] = scanner.down_hosts()
+        stats['responded_hosts'] = scanner.health.responded_hosts()
+        if budget is not None:
+            stats['issued'] = budget.issued[shard_index]
+        conn.send_bytes(b'S' + json.dumps(stats).encode())
+    finally:
+        conn.close()
+
+class ShardedScanner:
+    def __init__(self, workers=None, batch_size=4096, timeout=1, min_timeout=0.1, max_timeout=None,
+                 adaptive=True, progress_callback=None, host_down_after=0, budget=None, checkpoint=None,
+                 limiter=None, fast_teardown=True):
+        self.workers = workers or os.cpu_count() or 1
+        # fd limiti süreç başına, ephemeral port aralığı worker'lar arasında ortak
+        batch_size = max(1, min(batch_size, ephemeral_cap(batch_size * self.workers) // self.workers))
+        self.share = (limiter or probe_limiter()).share()
+        self.progress_callback = progress_callback
+        # Worker'lar probları kendileri ürettiği için bütçe sınırı shard içinde uygulanır
+        self.budget = budget
+        self.checkpoint = checkpoint
+        self.options = {
+            'batch_size': batch_size,
+            'timeout': timeout,
+            'min_timeout': min_timeout,
+            'max_timeout': max_timeout,
+            'adaptive': adaptive,
+            'host_down_after': host_down_after,
+            'fast_teardown': fast_teardown
+        }
+        self.shard_stats = {}
+        self.results = {}
+
+    def congestion_stats(self):
+        stats = list(self.shard_stats.values())
+        return {
+            'probes_completed': sum(s['probes_completed'] for s in stats),
+            'congestion_window': sum(s['congestion_window'] for s in stats),
+            'peak_congestion_window': sum(s['peak_congestion_window'] for s in stats)
+        }
+
+    def down_hosts(self):
+        # Her shard hostun problarının bir kısmını görür; herhangi bir
+        # shard'da cevap veren host ayakta sayılır
+        down, responded = set(), set()
+        for stats in self.shard_stats.values():
+            down.update(stats.get('down_hosts', ()))
+            responded.update(stats.get('responded_hosts', ()))
+        return sorted(down - responded)
+
+    def _report_progress(self, progress, total):
+        if not self.progress_callback:
+            return
+        shards = list(progress.values())
+        self.progress_callback({
+            'completed': sum(s['completed'] for s in shards),
+            'total': total,
+            'open_found': sum(s['open_found'] for s in shards),
+            'congestion_window': sum(s['congestion_window'] for s in shards),
+            'peak_congestion_window': sum(s['peak_congestion_window'] for s in shards)
+        })
+
+    def iter_probes(self, planner, total=None):
+        # Shard'lar yalnızca açık portları raporlar; akış açık sonuçlardan oluşur
+        shard_count = max(1, min(self.workers, len(planner)))
+        checkpoint = self.checkpoint
+        if checkpoint is not None:
+            if checkpoint.resumed:
+                # Devam noktaları shard'a özgü; shard sayısı checkpoint'ten gelir
+                shard_count = checkpoint.shard_count
+            else:
+                checkpoint.shard_count = shard_count
+                checkpoint.positions = [0] * shard_count
+        self.shard_stats = {}
+        if self.budget is not None and self.budget.deadline is None:
+            self.budget.start()
+        if self.budget is not None and checkpoint is not None:
+            self.budget.issued = list(checkpoint.positions)
+        progress = {}
+
+        with self.share:
+            yield from self._run_shards(planner, shard_count, checkpoint, progress)
+
+    def _shard_limits(self, shard_count):
+        # Pay tarama başında sabitlenir; worker'lar parent'la kilit paylaşmaz
+        limiter = self.share.limiter
+        rate = limiter.fair_rate() / shard_count if limiter.rate else 0
+        max_inflight = max(1, limiter.fair_inflight() // shard_count) if limiter.max_inflight else 0
+        return rate, max_inflight
+
+    def _run_shards(self, planner, shard_count, checkpoint, progress):
+        limits = self._shard_limits(shard_count)
+        ctx = multiprocessing.get_context()
+        readers = {}
+        processes = []
+        for shard_index in range(shard_count):
+            reader, writer = ctx.Pipe(duplex=False)
+            process = ctx.Process(
+                target=_scan_shard,
+                args=(planner, shard_index, shard_count, self.options, writer, self.budget,
+                      checkpoint.position(shard_index) if checkpoint is not None else None, limits),
+                daemon=True
+            )
+            process.start()
+            writer.close()
+            readers[reader] = shard_index
+            processes.append(process)
+
+        try:
+            while readers:
+                for reader in wait(list(readers)):
+                    shard_index = readers[reader]
+                    try:
+                        message = reader.recv_bytes()
+                    except EOFError:
+                        del readers[reader]
+                        continue
+
+                    tag, body = message[:1], memoryview(message)[1:]
+                    if tag == b'R':
+                        for t_index, port in RECORD.iter_unpack(body):
+                            if checkpoint is not None:
+                                checkpoint.add(planner.target_at(t_index), port)
+                            yield port_result(planner.target_at(t_index), port, OPEN)
+                    elif tag == b'W':
+                        checkpoint.set_position(shard_index, json.loads(bytes(body)))
+                        checkpoint.maybe_save()
+                    elif tag == b'P':
+                        progress[shard_index] = json.loads(bytes(body))
+                        self._report_progress(progress, len(planner))
+                    elif tag == b'S':
+                        self.shard_stats[shard_index] = json.loads(bytes(body))
+        finally:
+            # Tüketici akışı erken bırakırsa kalan worker'ları durdur
+            for process in processes:
+                if readers and process.is_alive():
+                    process.terminate()
+                process.join()
+            for reader in readers:
+                reader.close()
+
+        failed = [p.exitcode for p in processes if p.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"{len(failed)} shard worker(s) failed (exit codes: {failed})")
+        if self.budget is not None:
+            self.budget.issued = [self.shard_stats.get(i, {}).get('issued', 0) for i in range(shard_count)]
+
+    def aiter_probes(self, planner, total=None):
+        return aiterate_sync(lambda: self.iter_probes(planner, total=total))
+
+    def scan_probes(self, planner, total=None):
+        self.results = collect_open(self.iter_probes(planner, total=total))
+        return self.results
+
+    def scan(self, targets, ports, seed=None, shuffle=True):
+        return self.scan_probes(ScanPlanner(targets, ports, seed=seed, shuffle=shuffle))
+
+    def scan_ports(self, target_ip, ports, shuffle=True):
+        return self.scan([target_ip], ports, shuffle=shuffle).get(target_ip, [])
+
+    def scan_top_ports(self, target_ip, count=1000):
+        return self.scan_ports(target_ip, top_ports(count), shuffle=False)
+
+    def scan_port_range(self, target_ip, start_port, end_port):
+        print(f"\n🚀 SHARDED (ÇOK ÇEKİRDEK) TARAMA MODU")
+        print(f"🎯 Hedef: {target_ip}")
+        print(f"📡 Port aralığı: {start_port}-{end_port}")
+        print(f"🧩 Worker süreç sayısı: {self.workers}")
+        print(f"⏰ Başlangıç: {datetime.now().strftime('%H:%M:%S')}")
+        print("-" * 60)
+
+        start_time = time.time()
+
+        open_ports = self.scan([target_ip], range(start_port, end_port + 1)).get(target_ip, [])
+
+        duration = time.time() - start_time
+
+        print("-" * 60)
+        print(f"⚡ Tarama süresi: {duration:.2f} saniye")
+        print(f"📊 Bulunan açık portlar: {len(open_ports)}")
+        print(f"🎉 Açık portlar: {open_ports}")
+
+        return open_ports
@@ -0,0 +1,60 @@
+import socket
+import struct
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FD_RESERVE = 64
+# Diğer süreçlerin giden bağlantıları için ephemeral porttan ayrılan pay
+PORT_RESERVE = 1024
+# /proc okunamazsa: IANA dinamik port aralığı
+DEFAULT_EPHEMERAL_RANGE = (49152, 65535)
+IP_LOCAL_PORT_RANGE = '/proc/sys/net/ipv4/ip_local_port_range'
+# l_onoff=1, l_linger=0: close() FIN yerine RST gönderir, TIME_WAIT oluşmaz
+LINGER_RST = struct.pack('ii', 1, 0)
+
+def raise_fd_limit(concurrency):
+    # Her eşzamanlı bağlantı bir dosya tanımlayıcısı harcar; soft limiti
+    # mümkünse yükselt, değilse eşzamanlılığı limite göre kırp
+    if resource is None:
+        return concurrency
+    try:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = concurrency + FD_RESERVE
+        if soft != resource.RLIM_INFINITY and soft < wanted:
+            new_soft = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+            resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+            soft = new_soft
+        if soft == resource.RLIM_INFINITY:
+            return concurrency
+        return max(1, min(concurrency, soft - FD_RESERVE))
+    except (ValueError, OSError):
+        return concurrency
+
+def ephemeral_port_range():
+    try:
+        with open(IP_LOCAL_PORT_RANGE) as handle:
+            low, high = (int(value) for value in handle.read().split())
+        return low, high
+    except (OSError, ValueError):
+        return DEFAULT_EPHEMERAL_RANGE
+
+def ephemeral_cap(concurrency):
+    # Uçuştaki her connect bir yerel port tutar; aralık tükenirse connect
+    # EADDRNOTAVAIL ile düşer ve tarama sonuçları bozulur
+    low, high = ephemeral_port_range()
+    return max(1, min(concurrency, high - low + 1 - PORT_RESERVE))
+
+def concurrency_cap(concurrency):
+    """Eşzamanlılığı dosya tanımlayıcı limiti ve ephemeral port aralığıyla sınırlar."""
+    return ephemeral_cap(raise_fd_limit(concurrency))
+
+def fast_teardown(sock):
+    # Prob soketinin kapanışı RST ile: yerel port TIME_WAIT'te beklemeden geri döner
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RST)
+    except OSError:
+        pass
+    return sock
@@ -0,0 +1,157 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from core.rtt_estimator import RESPONSIVE_ERRNOS
+from core.service_registry import TCP_SERVICES
+
+OPEN = 'open'
+CLOSED = 'closed'
+FILTERED = 'filtered'
+
+_DONE = object()
+
+def classify(err):
+    if err == 0:
+        return OPEN
+    if err in RESPONSIVE_ERRNOS:
+        return CLOSED
+    return FILTERED
+
+def port_result(target_ip, port, state):
+    return {'target': target_ip, 'port': port, 'state': state}
+
+def collect_open(results):
+    # Akışı tüketip eski {hedef: [açık portlar]} şekline çevirir
+    found = {}
+    for result in results:
+        if result['state'] == OPEN:
+            found.setdefault(result['target'], []).append(result['port'])
+            print(f"✅ {result['target']} Port {result['port']:5d} AÇIK ({TCP_SERVICES[result['port']]})")
+    return {target: sorted(ports) for target, ports in found.items()}
+
+async def acollect_open(results):
+    found = {}
+    async for result in results:
+        if result['state'] == OPEN:
+            found.setdefault(result['target'], []).append(result['port'])
+            print(f"✅ {result['target']} Port {result['port']:5d} AÇIK ({TCP_SERVICES[result['port']]})")
+    return {target: sorted(ports) for target, ports in found.items()}
+
+def bounded_map(executor, fn, items, high_water):
+    """``fn(*item)`` işlerini executor'a en fazla ``high_water`` bekleyen iş olacak şekilde verir.
+
+    Sonuçlar tamamlanma sırasıyla üretilir; bellek iş sayısıyla değil ``high_water``
+    ile orantılıdır. Tüketici erken bırakırsa bekleyen işler iptal edilir.
+    """
+    pending = set()
+    items = iter(items)
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < high_water:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(fn, *item))
+
+            if not pending:
+                return
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+def iterate_async(agen_factory, maxsize=1024):
+    """Async generator'ı ayrı bir thread'deki event loop'ta çalıştırıp senkron iterator olarak sunar."""
+    items = queue.Queue(maxsize)
+    stop = threading.Event()
+    error = []
+
+    async def pump():
+        agen = agen_factory()
+        try:
+            async for item in agen:
+                while not stop.is_set():
+                    try:
+                        items.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    break
+        finally:
+            await agen.aclose()
+
+    def run():
+        try:
+            asyncio.run(pump())
+        except BaseException as e:
+            error.append(e)
+        finally:
+            while not stop.is_set():
+                try:
+                    items.put(_DONE, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                break
+            yield item
+        if error:
+            raise error[0]
+    finally:
+        stop.set()
+        thread.join()
+
+async def aiterate_sync(iter_factory, maxsize=1024):
+    """Senkron (bloklayan) bir iterator'ı thread'de çalıştırıp async iterator olarak sunar."""
+    loop = asyncio.get_running_loop()
+    items = asyncio.Queue(maxsize)
+    stop = threading.Event()
+    error = []
+
+    def run():
+        iterator = iter_factory()
+        try:
+            for item in iterator:
+                if stop.is_set():
+                    break
+                asyncio.run_coroutine_threadsafe(items.put(item), loop).result()
+        except BaseException as e:
+            error.append(e)
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+            if not stop.is_set():
+                asyncio.run_coroutine_threadsafe(items.put(_DONE), loop).result()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await items.get()
+            if item is _DONE:
+                break
+            yield item
+        if error:
+            raise error[0]
+    finally:
+        stop.set()
+        # Dolu kuyrukta bekleyen put'ları serbest bırak
+        while not items.empty():
+            items.get_nowait()
+        await loop.run_in_executor(None, thread.join)
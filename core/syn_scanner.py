@@ -0,0 +1,289 @@
+import hashlib
+import os
+import random
+import select
+import socket
+import struct
+import time
+from array import array
+from datetime import datetime
+
+from core.host_health import confirm_down
+from core.rate_limiter import probe_limiter
+from core.streaming import CLOSED, OPEN, aiterate_sync, collect_open, port_result
+from core.top_ports import top_ports
+
+TCP_SYN = 0x02
+TCP_RST = 0x04
+TCP_ACK = 0x10
+
+# Linux varsayılan ephemeral aralığının (32768-60999) dışında kalan kaynak portlar
+SOURCE_PORT_RANGE = (61000, 65000)
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(array('H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+def route_source_ip(target_ip):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.connect((target_ip, 9))
+        return sock.getsockname()[0]
+    finally:
+        sock.close()
+
+class SynPortScanner:
+    """Raw socket üzerinden yarı açık (SYN) tarama.
+
+    Prob başına soket ayrılmaz ve durum tutulmaz: SYN paketinin sıra numarası
+    (kaynak IP, hedef IP, hedef port, kaynak port) üzerinden anahtarlı bir
+    hash'tir. Gelen SYN-ACK/RST'nin ack numarası ``cookie + 1`` değilse paket
+    bize ait değildir. SYN-ACK açık, RST kapalı; cevapsız problar filtreli sayılır.
+    Raw soket için root/CAP_NET_RAW gerekir.
+    """
+
+    def __init__(self, rate=10000, wait=1.0, progress_callback=None, host_down_after=0, limiter=None):
+        self.rate = rate
+        # Bağlantı tutulmadığından süreç geneli limiter'dan yalnızca hız token'ı alınır
+        self.share = (limiter or probe_limiter()).share()
+        self.wait = wait
+        self.host_down_after = host_down_after
+        self.progress_callback = progress_callback
+        self.secret = os.urandom(16)
+        self.source_port = random.randint(*SOURCE_PORT_RANGE)
+        self.sent = 0
+        self.results = {}
+        self.open_found = {}
+        self.closed = {}
+        self.sent_per_target = {}
+        self.liveness = {}   # hedef -> canlılık kontrolü sonucu
+        self._addresses = {}
+        self._names = {}
+
+    @staticmethod
+    def open_raw_socket():
+        try:
+            return socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP)
+        except PermissionError:
+            raise PermissionError("SYN taraması için root yetkisi veya CAP_NET_RAW gerekli")
+
+    def congestion_stats(self):
+        return {
+            'probes_completed': self.sent,
+            'congestion_window': None,
+            'peak_congestion_window': None
+        }
+
+    def _cookie(self, source_ip, target_ip, port):
+        digest = hashlib.blake2s(
+            f"{source_ip}|{target_ip}|{port}|{self.source_port}".encode(),
+            key=self.secret,
+            digest_size=4
+        ).digest()
+        return struct.unpack('!I', digest)[0]
+
+    def _address(self, target):
+        """Hedef için (kaynak IP, hedef IP); çözülemeyen/yönlendirilemeyen hedefte None.
+
+        Hostname hedefler ilk görüldüğünde bir kez çözülür; cevaplar IP'den
+        gelir ve ``_names`` ile taramaya verilen hedef adına geri eşlenir.
+        """
+        if target not in self._addresses:
+            try:
+                target_ip = socket.gethostbyname(target)
+                address = (route_source_ip(target_ip), target_ip)
+                self._names.setdefault(target_ip, target)
+            except OSError:
+                address = None
+            self._addresses[target] = address
+        return self._addresses[target]
+
+    def build_syn(self, source_ip, target_ip, port):
+        seq = self._cookie(source_ip, target_ip, port)
+        # MSS seçeneği olmayan SYN'leri düşüren yığınlar var
+        options = struct.pack('!BBH', 2, 4, 1460)
+        header = struct.pack('!HHIIBBHHH', self.source_port, port, seq, 0,
+                             (6 << 4), TCP_SYN, 1024, 0, 0) + options
+        pseudo = socket.inet_aton(source_ip) + socket.inet_aton(target_ip) + struct.pack('!BBH', 0, socket.IPPROTO_TCP, len(header))
+        checksum = _checksum(pseudo + header)
+        return header[:16] + struct.pack('H', checksum) + header[18:]
+
+    def _handle_reply(self, packet):
+        if len(packet) < 20:
+            return
+        ihl = (packet[0] & 0x0f) * 4
+        if len(packet) < ihl + 14:
+            return
+
+        sport, dport, _seq, ack, _offset, flags = struct.unpack_from('!HHIIBB', packet, ihl)
+        if dport != self.source_port or not flags & (TCP_RST | TCP_ACK):
+            return
+
+        target_ip = socket.inet_ntoa(packet[12:16])
+        source_ip = socket.inet_ntoa(packet[16:20])
+        if (ack - 1) & 0xffffffff != self._cookie(source_ip, target_ip, sport):
+            return
+        target_ip = self._names.get(target_ip, target_ip)
+
+        # Yeniden iletilen SYN-ACK/RST'ler tekrar raporlanmaz
+        if flags & TCP_SYN and flags & TCP_ACK:
+            seen, state = self.open_found.setdefault(target_ip, set()), OPEN
+        elif flags & TCP_RST:
+            seen, state = self.closed.setdefault(target_ip, set()), CLOSED
+        else:
+            return None
+        if sport in seen:
+            return None
+        seen.add(sport)
+        return port_result(target_ip, sport, state)
+
+    def _drain(self, sock, timeout):
+        readable, _, _ = select.select([sock], [], [], timeout)
+        while readable:
+            try:
+                packet = sock.recv(65535)
+            except BlockingIOError:
+                return
+            result = self._handle_reply(packet)
+            if result is not None:
+                yield result
+            readable, _, _ = select.select([sock], [], [], 0)
+
+    def iter_probes(self, probes, total=None):
+        # Durumsuz motor: yalnızca cevap gelen problar (açık/kapalı) akışa düşer,
+        # cevapsız (filtreli) problar raporlanmaz
+        sock = self.open_raw_socket()
+        sock.setblocking(False)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+
+        self.open_found = {}  # Reset
+        self.closed = {}
+        self.sent_per_target = {}
+        self.liveness = {}
+        self.sent = 0
+        started = time.monotonic()
+        next_report = started + 1.0
+
+        with self.share:
+            try:
+                for target_ip, port in probes:
+                    # Hız limiti: geçen süreye göre izin verilen paket sayısını aşma
+                    while self.sent >= (time.monotonic() - started) * self.rate:
+                        yield from self._drain(sock, 0.005)
+                    wait = self.share.try_acquire(hold=False)
+                    while wait:
+                        yield from self._drain(sock, wait)
+                        wait = self.share.try_acquire(hold=False)
+
+                    address = self._address(target_ip)
+                    if address is not None:
+                        source_ip, destination = address
+                        packet = self.build_syn(source_ip, destination, port)
+                        try:
+                            sock.sendto(packet, (destination, 0))
+                        except BlockingIOError:
+                            yield from self._drain(sock, 0.01)
+                            try:
+                                sock.sendto(packet, (destination, 0))
+                            except OSError:
+                                pass
+                        except OSError:
+                            # ENETUNREACH vb. yalnızca bu hedefi etkiler; prob cevapsız sayılır
+                            pass
+                    self.sent += 1
+                    self.sent_per_target[target_ip] = self.sent_per_target.get(target_ip, 0) + 1
+
+                    if self.sent % 256 == 0:
+                        yield from self._drain(sock, 0)
+                        now = time.monotonic()
+                        if now >= next_report:
+                            next_report = now + 1.0
+                            self._report_progress(total)
+
+                # Son problara gelen geç cevapları topla
+                deadline = time.monotonic() + self.wait
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    yield from self._drain(sock, remaining)
+            finally:
+                sock.close()
+
+    def down_hosts(self):
+        # Gönderim durumsuz olduğundan problar kesilmez; tarama sonunda hiç
+        # SYN-ACK/RST gelmeyen ve canlılık kontrolüne de cevap vermeyen
+        # hostlar kapalı raporlanır
+        if not self.host_down_after:
+            return []
+        silent = [
+            target for target, sent in self.sent_per_target.items()
+            if sent >= self.host_down_after and target not in self.open_found and target not in self.closed
+        ]
+        unchecked = [target for target in silent if target not in self.liveness]
+        down = set(confirm_down(unchecked))
+        self.liveness.update((target, target not in down) for target in unchecked)
+        return sorted(target for target in silent if not self.liveness[target])
+
+    def aiter_probes(self, probes, total=None):
+        return aiterate_sync(lambda: self.iter_probes(probes, total=total))
+
+    def scan_probes(self, probes, total=None):
+        self.results = collect_open(self.iter_probes(probes, total=total))
+        return self.results
+
+    def _report_progress(self, total):
+        open_found = sum(len(ports) for ports in self.open_found.values())
+        print(f"📈 İlerleme: {self.sent}{f'/{total}' if total else ''} SYN, {open_found} açık")
+        if self.progress_callback:
+            self.progress_callback({
+                'completed': self.sent,
+                'total': total,
+                'open_found': open_found,
+                'congestion_window': None,
+                'peak_congestion_window': None
+            })
+
+    def scan_ports(self, target_ip, ports):
+        total = len(ports) if hasattr(ports, '__len__') else None
+        return self.scan_probes(((target_ip, port) for port in ports), total=total).get(target_ip, [])
+
+    def scan_top_ports(self, target_ip, count=1000):
+        return self.scan_ports(target_ip, top_ports(count))
+
+    def scan_port_range(self, target_ip, start_port, end_port):
+        print(f"\n🚀 SYN (YARI AÇIK) TARAMA MODU")
+        print(f"🎯 Hedef: {target_ip}")
+        print(f"📡 Port aralığı: {start_port}-{end_port}")
+        print(f"📤 Gönderim hızı: {self.rate} paket/sn")
+        print(f"⏰ Başlangıç: {datetime.now().strftime('%H:%M:%S')}")
+        print("-" * 60)
+
+        start_time = time.time()
+
+        open_ports = self.scan_ports(target_ip, range(start_port, end_port + 1))
+
+        duration = time.time() - start_time
+
+        print("-" * 60)
+        print(f"⚡ Tarama süresi: {duration:.2f} saniye")
+        print(f"📊 Bulunan açık portlar: {len(open_ports)}")
+        print(f"🎉 Açık portlar: {open_ports}")
+
+        return open_ports
+
+if __name__ == "__main__":
+    print("🚀 SYN Port Scanner v1.0 (root gerekli)")
+    print("=" * 60)
+
+    target = input("Hedef IP (Enter=localhost): ").strip() or "127.0.0.1"
+    start = int(input("Başlangıç port: "))
+    end = int(input("Bitiş port: "))
+    rate = int(input("Paket/sn (Enter=10000): ") or "10000")
+
+    scanner = SynPortScanner(rate=rate)
+    scanner.scan_port_range(target, start, end)
@@ -4,46 +4,123 @@ import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from core.congestion import CongestionWindow, ScanProgress, congestion_stats
+from core.host_health import HostHealth
+from core.rate_limiter import probe_limiter
+from core.rtt_estimator import RTTEstimator
+from core.scan_planner import ScanPlanner
+from core.service_registry import TCP_SERVICES
+from core.socket_limits import concurrency_cap, fast_teardown
+from core.top_ports import top_ports
+from core.streaming import FILTERED, OPEN, aiterate_sync, bounded_map, classify, collect_open, port_result
+
 class FastPortScanner:
-    def __init__(self, max_threads=100):
-        self.max_threads = max_threads
+    # Varsayılan kuyruk derinliği thread sayısının bu katıdır
+    QUEUE_FACTOR = 2
+
+    def __init__(self, max_threads=100, timeout=1, min_timeout=0.1, max_timeout=None,
+                 adaptive=True, progress_callback=None, high_water=None, host_down_after=0, limiter=None,
+                 fast_teardown=True):
+        # Her thread bir soket tutar: fd limiti ve ephemeral port aralığıyla sınırlı
+        self.max_threads = concurrency_cap(max_threads)
+        self.fast_teardown = fast_teardown
+        # Kuyrukta bekleyen en fazla iş; bellek port sayısıyla değil bununla orantılı
+        self.high_water = high_water or self.max_threads * self.QUEUE_FACTOR
+        self.rtt = RTTEstimator(initial_timeout=timeout, min_timeout=min_timeout, max_timeout=max_timeout)
+        self.congestion = CongestionWindow(initial=min(16, self.max_threads), maximum=self.max_threads, adaptive=adaptive)
+        self.health = HostHealth(down_after=host_down_after)
+        # Süreç geneli hız/uçuştaki prob sınırından bu taramanın payı
+        self.share = (limiter or probe_limiter()).share()
+        self.progress_callback = progress_callback
+        self.progress = None
         self.open_ports = []
+        self.results = {}
         self.lock = threading.Lock() 
+        self.window_cond = threading.Condition()
+        self.in_flight = 0
+    
+    def congestion_stats(self):
+        return congestion_stats(self.congestion, self.progress)
+    
+    def down_hosts(self):
+        return self.health.down_hosts()
+    
+    def _acquire_window(self):
+        # Thread havuzu sabit, uçuştaki prob sayısını AIMD penceresi belirler
+        with self.window_cond:
+            while self.in_flight >= self.congestion.size:
+                self.window_cond.wait()
+            self.in_flight += 1
+    
+    def _release_window(self):
+        with self.window_cond:
+            self.in_flight -= 1
+            self.window_cond.notify(2)
         
-    def scan_single_port(self, target_ip, port):
+    def probe_port(self, target_ip, port):
+        self._acquire_window()
+        self.share.acquire()
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1) 
-            result = sock.connect_ex((target_ip, port))
-            sock.close()
-            
-            if result == 0:
-                with self.lock:
-                    self.open_ports.append(port)
-                    print(f"✅ Port {port:5d} AÇIK")
-                    
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                if self.fast_teardown:
+                    fast_teardown(sock)
+                sock.settimeout(self.rtt.timeout_for(target_ip))
+                started = time.monotonic()
+                result = sock.connect_ex((target_ip, port))
+            self.rtt.observe_result(target_ip, result, time.monotonic() - started)
+            self.congestion.on_result(result)
+            self.health.observe(target_ip, result)
+            return classify(result)
         except Exception:
-            pass
+            self.health.observe(target_ip, None)
+            return FILTERED
+        finally:
+            self.share.release()
+            self._release_window()
+        
+    def scan_single_port(self, target_ip, port):
+        if self.probe_port(target_ip, port) != OPEN:
+            return False
+        
+        with self.lock:
+            self.open_ports.append(port)
+            self.results.setdefault(target_ip, []).append(port)
+            print(f"✅ {target_ip} Port {port:5d} AÇIK ({TCP_SERVICES[port]})")
+        return True
+    
+    def _probe(self, target_ip, port):
+        # Kuyruğa girdikten sonra kapalı işaretlenen hostun probu atlanır
+        if self.health.is_down(target_ip):
+            return None
+        return port_result(target_ip, port, self.probe_port(target_ip, port))
+    
+    def iter_probes(self, probes, total=None):
+        if total is None and hasattr(probes, '__len__'):
+            total = len(probes)
+        self.progress = ScanProgress(self.congestion, total=total, callback=self.progress_callback)
+        
+        with self.share, ThreadPoolExecutor(max_workers=self.max_threads) as executor:
+            for result in bounded_map(executor, self._probe, self.health.filter_probes(probes), self.high_water):
+                if result is None:
+                    continue
+                self.progress.tick(open_found=1 if result['state'] == OPEN else 0)
+                yield result
+    
+    def aiter_probes(self, probes, total=None):
+        return aiterate_sync(lambda: self.iter_probes(probes, total=total))
     
-    def scan_port_range_threaded(self, target_ip, start_port, end_port):
+    def scan_port_range_threaded(self, target_ip, start_port, end_port, checkpoint=None):
         print(f"\n🚀 HIZLI TARAMA MODU")
         print(f"🎯 Hedef: {target_ip}")
         print(f"📡 Port aralığı: {start_port}-{end_port}")
         print(f"🧵 Thread sayısı: {self.max_threads}")
         print(f"⏰ Başlangıç: {datetime.now().strftime('%H:%M:%S')}")
+        if checkpoint is not None and checkpoint.resumed:
+            print(f"♻️  Kaldığı yerden devam: {checkpoint.position()} port zaten tarandı")
         print("-" * 60)
         
         start_time = time.time()
-        self.open_ports = []  # Reset
-        
-        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            futures = []
-            for port in range(start_port, end_port + 1):
-                future = executor.submit(self.scan_single_port, target_ip, port)
-                futures.append(future)
-            
-            for future in futures:
-                future.result()
+        self.scan_ports(target_ip, range(start_port, end_port + 1), checkpoint=checkpoint)
 
         end_time = time.time()
         duration = end_time - start_time
@@ -51,9 +128,34 @@ class FastPortScanner:
         print("-" * 60)
         print(f"⚡ Tarama süresi: {duration:.2f} saniye")
         print(f"📊 Bulunan açık portlar: {len(self.open_ports)}")
-        print(f"🎉 Açık portlar: {sorted(self.open_ports)}")
+        print(f"🎉 Açık portlar: {self.open_ports}")
+        print(f"🪟 Son pencere: {self.congestion.size} (en yüksek: {int(self.congestion.peak)})")
         
-        return sorted(self.open_ports)
+        return self.open_ports
+
+    def scan_probes(self, probes, total=None):
+        self.results = collect_open(self.iter_probes(probes, total=total))
+        return self.results
+    
+    def scan_ports(self, target_ip, ports, checkpoint=None):
+        if checkpoint is None:
+            total = len(ports) if hasattr(ports, '__len__') else None
+            self.open_ports = self.scan_probes(((target_ip, port) for port in ports), total=total).get(target_ip, [])
+            return self.open_ports
+        
+        # Checkpoint'li tarama: tamamlanan önek atlanır, önceki bulgular korunur
+        planner = ScanPlanner([target_ip], ports, shuffle=False)
+        start = checkpoint.position()
+        with checkpoint:
+            probes = checkpoint.track(planner.iter_from(start))
+            results = self.iter_probes(probes, total=len(planner) - start)
+            collect_open(checkpoint.tap(results, down_hosts=self.down_hosts))
+        self.open_ports = checkpoint.found(target_ip)
+        self.results = {target_ip: self.open_ports} if self.open_ports else {}
+        return self.open_ports
+    
+    def scan_top_ports(self, target_ip, count=1000):
+        return self.scan_ports(target_ip, top_ports(count))
 
 def compare_speeds(target_ip="127.0.0.1"):
     print("🏁 HIZ KARŞILAŞTIRMASI")
@@ -0,0 +1,137 @@
+import os
+from bisect import bisect_left, bisect_right
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'top_ports.txt')
+
+MAX_PORT = 65535
+
+def _expand(spec):
+    for token in spec.split(','):
+        start, _, end = token.partition('-')
+        yield from range(int(start), int(end or start) + 1)
+
+def load_table(path=DEFAULT_TABLE_PATH):
+    """Paketle gelen sıklık tablosu: {protokol: en olasıdan başlayarak portlar}.
+
+    Her protokol için önce ölçülmüş sıralı baş (``ranked``), ardından en sık
+    1000 portun kalanı (``top1000``) gelir.
+    """
+    sections = {}
+    fields = key = None
+    with open(path, encoding='utf-8') as handle:
+        for raw in handle:
+            line = raw.split('#', 1)[0].rstrip()
+            if not line.strip():
+                continue
+            if line.startswith('['):
+                fields = sections.setdefault(line.strip('[] '), {})
+            elif line[0].isspace():
+                # Devam satırı
+                fields[key] += line.strip()
+            else:
+                key, _, value = line.partition('=')
+                key = key.strip()
+                fields[key] = value.strip()
+
+    table = {}
+    for protocol, fields in sections.items():
+        ranked = list(_expand(fields['ranked']))
+        seen = set(ranked)
+        table[protocol] = tuple(ranked + [port for port in _expand(fields['top1000']) if port not in seen])
+    return table
+
+TOP_PORTS = load_table()
+TOP_TCP_PORTS = TOP_PORTS['tcp']
+TOP_UDP_PORTS = TOP_PORTS['udp']
+
+_orders = {}
+
+def likelihood_order(protocol='tcp'):
+    """1-65535 portlarının açık bulunma olasılığına göre sırası.
+
+    Sıklık tablosu başta gelir, tablonun dışındaki portlar artan sırayla
+    eklenir; sonuç her makinede aynıdır.
+    """
+    order = _orders.get(protocol)
+    if order is None:
+        ranked = TOP_PORTS[protocol]
+        seen = set(ranked)
+        order = ranked + tuple(port for port in range(1, MAX_PORT + 1) if port not in seen)
+        _orders[protocol] = order
+    return order
+
+def top_ports(count, protocol='tcp'):
+    ranked = TOP_PORTS[protocol]
+    if count <= len(ranked):
+        return ranked[:count]
+    return likelihood_order(protocol)[:count]
+
+class LikelihoodOrder:
+    """Sıralı bir port kümesinin olasılık sırasıyla tembel görünümü.
+
+    Kümede bulunan tablo portları tablo sırasıyla başta gelir; geri kalanı
+    artan sırayla, liste oluşturulmadan kümenin kendi indekslemesinden
+    hesaplanır. Bellek kümenin boyutuyla değil tablo boyutuyla orantılıdır.
+    ``ports`` artan sıralı, ``len``/indeksleme/``in`` destekleyen bir dizidir
+    (``PortSet`` veya ``range``).
+    """
+
+    __slots__ = ('ports', 'head', '_skip')
+
+    def __init__(self, ports, protocol='tcp'):
+        self.ports = ports
+        self.head = tuple(port for port in TOP_PORTS[protocol] if port in ports)
+        # Baştaki portların kümedeki sıraları; kuyrukta atlanır
+        self._skip = sorted(bisect_left(ports, port) for port in self.head)
+
+    def __len__(self):
+        return len(self.ports)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('LikelihoodOrder index out of range')
+        if index < len(self.head):
+            return self.head[index]
+        # Kuyruğun k. elemanı: p = k + (p'ye kadar atlanan sayısı) denkleminin en küçük çözümü
+        k = index - len(self.head)
+        position = k
+        while True:
+            moved = k + bisect_right(self._skip, position)
+            if moved == position:
+                return self.ports[position]
+            position = moved
+
+    def __iter__(self):
+        yield from self.head
+        head = set(self.head)
+        for port in self.ports:
+            if port not in head:
+                yield port
+
+    def __contains__(self, port):
+        return port in self.ports
+
+    def __getstate__(self):
+        return self.ports, self.head, self._skip
+
+    def __setstate__(self, state):
+        self.ports, self.head, self._skip = state
+
+    def __repr__(self):
+        return f"LikelihoodOrder({self.ports!r})"
+
+def order_by_likelihood(ports, protocol='tcp'):
+    """Port kümesini en olası açık port önce gelecek şekilde (tembel) sıralar."""
+    # port_spec bu modülü içe aktarır; döngüsel importu önlemek için burada
+    from core.port_spec import PortSet
+
+    if isinstance(ports, PortSet):
+        if protocol != 'tcp':
+            ports = PortSet(tcp=getattr(ports, protocol))
+    elif not (isinstance(ports, range) and ports.step == 1):
+        ports = PortSet.from_ports(sorted(set(ports)))
+    return LikelihoodOrder(ports, protocol)
@@ -6,6 +6,10 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from core.port_scanner import PortScanner
 from core.network_discovery import NetworkDiscovery
 from core.threaded_scanner import FastPortScanner
+from core.port_spec import PortSet
+from core.banner_grabber import BannerGrabber
+from core.checkpoint import DEFAULT_CHECKPOINT_DIR, ScanCheckpoint, checkpoint_in_use
+from core.top_ports import order_by_likelihood, top_ports
 
 def show_banner():
     print("""
@@ -25,6 +29,7 @@ def main_menu():
         print("2. 🌐 Ağ Keşfi")
         print("3. ⚡ Hızlı Tarama (Threading)")
         print("4. 📊 Detaylı Rapor")
+        print("5. 🧩 Çok Çekirdekli Tarama (Sharded)")
         print("0. ❌ Çıkış")
         
         choice = input("\nSeçiminiz: ").strip()
@@ -37,6 +42,8 @@ def main_menu():
             fast_scan_menu()
         elif choice == "4":
             detailed_report_menu()
+        elif choice == "5":
+            sharded_scan_menu()
         elif choice == "0":
             print("👋 Güle güle!")
             break
@@ -48,36 +55,67 @@ def port_scan_menu():
     target = input("🎯 Hedef IP: ").strip() or "127.0.0.1"
     
     print("\n📡 Tarama türü:")
-    print("1. Yaygın portlar")
+    print("1. Yaygın portlar (en olası 100)")
     print("2. Port aralığı")
-    print("3. Özel port listesi")
+    print("3. Özel port listesi (örn: 22,80,8000-8100,top:100)")
+    print("4. En olası N port (top:N)")
     
     scan_type = input("Seçim: ").strip()
     
     if scan_type == "1":
-        ports = [21, 22, 23, 25, 53, 80, 443, 3000, 3306, 5432]
+        ports = top_ports(100)
+    elif scan_type == "4":
+        ports = top_ports(int(input("Port sayısı (Enter=1000): ") or "1000"))
     elif scan_type == "2":
         start = int(input("Başlangıç: "))
         end = int(input("Bitiş: "))
-        ports = list(range(start, end + 1))
+        ports = PortSet.from_range(start, end)
     elif scan_type == "3":
-        port_input = input("Portlar (virgülle ayır): ")
-        ports = [int(p.strip()) for p in port_input.split(",")]
+        port_input = input("Portlar: ")
+        try:
+            ports = PortSet.parse(port_input)
+        except ValueError as e:
+            print(f"❌ Geçersiz port listesi: {e}")
+            return
+        if ports.udp:
+            print("❌ UDP portları taranmıyor, yalnızca TCP portları girin")
+            return
     else:
         return
     
+    if scan_type in ("2", "3") and input("Olası portlar önce taransın mı? (e/H): ").strip().lower() == "e":
+        ports = order_by_likelihood(ports)
+    
+    grab = input("Banner okunsun mu? (e/H): ").strip().lower() == "e"
+    
     print(f"\n🚀 {target} taranıyor...")
-    results = scanner.scan_ports(target, ports)
+    results = scanner.scan_ports(target, ports, banner_grabber=BannerGrabber() if grab else None)
     
     print(f"\n📊 SONUÇLAR:")
+    if results['host_down']:
+        print(f"⚠️  {target} cevap vermiyor, kalan portlar atlandı")
     print(f"Açık portlar: {len(results['open_ports'])}")
     for port_info in results['open_ports']:
-        print(f"✅ {port_info['port']} - {port_info['service']}")
+        banner = f" | {port_info['banner'].splitlines()[0]}" if port_info.get('banner') else ""
+        print(f"✅ {port_info['port']} - {port_info['service']}{banner}")
+
+def cli_checkpoint(name):
+    # Aynı parametrelerle yarım kalmış tarama varsa devam etmeyi önerir
+    path = os.path.join(DEFAULT_CHECKPOINT_DIR, f"cli-{name}.json")
+    if checkpoint_in_use(path):
+        print("⚠️  Aynı tarama başka bir süreçte sürüyor; checkpoint tutulmadan taranıyor")
+        return None
+    if os.path.exists(path):
+        checkpoint = ScanCheckpoint.load(path)
+        answer = input(f"♻️  Yarım kalan tarama bulundu ({checkpoint.position()} tamamlandı). Devam edilsin mi? (E/h): ")
+        if answer.strip().lower() != "h":
+            return checkpoint.acquire()
+        os.remove(path)
+    return ScanCheckpoint(path).acquire()
 
 def network_discovery_menu():
     from core.network_discovery import NetworkDiscovery, get_local_network
     
-    discovery = NetworkDiscovery()
     network, local_ip = get_local_network()
     
     print(f"\n🏠 Kendi IP'n: {local_ip}")
@@ -85,22 +123,89 @@ def network_discovery_menu():
     
     choice = input(f"\n1. Bu ağı tara ({network})\n2. Özel ağ gir\nSeçim: ")
     
-    if choice == "1":
-        discovery.discover_network(network)
-    elif choice == "2":
-        custom_network = input("Ağ aralığı (örn: 192.168.0.0/24): ")
-        discovery.discover_network(custom_network)
+    if choice == "2":
+        network = input("Ağ aralığı (örn: 192.168.0.0/24): ")
+    elif choice != "1":
+        return
+    
+    method = input("Yöntem (1=ICMP, cevapsızlara TCP  2=Yalnızca ICMP  3=Yalnızca TCP, Enter=1): ").strip() or "1"
+    discovery = NetworkDiscovery(method={"2": "icmp", "3": "tcp"}.get(method, "auto"))
+    
+    resolve_names = input("Host adları çözülsün mü? (e/H): ").strip().lower() == "e"
+    
+    checkpoint = cli_checkpoint(f"discovery-{network.replace('/', '_')}")
+    alive_hosts = discovery.discover_network(network, checkpoint=checkpoint, resolve_names=resolve_names)
+    if resolve_names and alive_hosts:
+        hostnames = discovery.resolve_hostnames(alive_hosts)
+        for ip in alive_hosts:
+            print(f"   {ip:<15} {hostnames.get(ip) or 'Bilinmiyor'}")
 
 def fast_scan_menu():
     from core.threaded_scanner import FastPortScanner
     
     target = input("🎯 Hedef IP: ").strip() or "127.0.0.1"
-    start = int(input("Başlangıç port: "))
-    end = int(input("Bitiş port: "))
+    mode = input("1. Port aralığı\n2. En olası N port (top:N)\nSeçim (Enter=1): ").strip() or "1"
+    if mode == "2":
+        count = int(input("Port sayısı (Enter=1000): ") or "1000")
+    else:
+        start = int(input("Başlangıç port: "))
+        end = int(input("Bitiş port: "))
     threads = int(input("Thread sayısı (Enter=100): ") or "100")
+    budget_text = input("Süre bütçesi, saniye (Enter=sınırsız): ").strip()
+    
+    if budget_text:
+        port_set = PortSet.parse(f"top:{count}") if mode == "2" else PortSet.from_range(start, end)
+        budget_scan(target, port_set, threads, float(budget_text))
+        return
     
     scanner = FastPortScanner(max_threads=threads)
-    scanner.scan_port_range_threaded(target, start, end)
+    if mode == "2":
+        print(f"\n🚀 {target} üzerinde en olası {count} port taranıyor...")
+        open_ports = scanner.scan_top_ports(target, count)
+        print(f"\n📊 Bulunan açık portlar: {open_ports}")
+    else:
+        checkpoint = cli_checkpoint(f"fast-{target}-{start}-{end}")
+        scanner.scan_port_range_threaded(target, start, end, checkpoint=checkpoint)
+
+def budget_scan(target, port_set, threads, seconds):
+    from core.scan_budget import ScanBudget
+    from core.scan_planner import ScanPlanner
+    
+    # Olası portlar önce: süre biterse kalanlar en az olası olanlardır
+    planner = ScanPlanner([target], order_by_likelihood(port_set), shuffle=False)
+    budget = ScanBudget(seconds).start()
+    threads, timeout = budget.tune(len(planner), 1, 0.1, threads, 500, drain_rounds=FastPortScanner.QUEUE_FACTOR)
+    scanner = FastPortScanner(max_threads=threads, timeout=timeout, max_timeout=timeout, adaptive=False)
+    
+    print(f"\n⏱️  {seconds:g} sn bütçe: {threads} thread, {timeout:.2f} sn timeout")
+    open_ports = scanner.scan_probes(budget.limit(planner), total=len(planner)).get(target, [])
+    unscanned = budget.unscanned(planner).get(target)
+    
+    print(f"\n📊 Bulunan açık portlar: {open_ports}")
+    if unscanned:
+        print(f"⚠️  Süre bitti, taranmayan {len(unscanned)} port: {unscanned}")
+
+def sharded_scan_menu():
+    from core.sharded_scanner import ShardedScanner
+    
+    targets = input("🎯 Hedefler (IP/CIDR, virgülle ayır): ").strip() or "127.0.0.1"
+    start = int(input("Başlangıç port: "))
+    end = int(input("Bitiş port: "))
+    workers = int(input(f"Worker süreç sayısı (Enter={os.cpu_count()}): ") or os.cpu_count())
+    
+    scanner = ShardedScanner(workers=workers)
+    target_list = [t.strip() for t in targets.split(",") if t.strip()]
+    
+    if len(target_list) == 1 and "/" not in target_list[0]:
+        scanner.scan_port_range(target_list[0], start, end)
+        return
+    
+    print(f"\n🚀 {len(target_list)} hedef {workers} süreçte taranıyor...")
+    results = scanner.scan(target_list, PortSet.from_range(start, end))
+    
+    print(f"\n📊 SONUÇLAR:")
+    for target, open_ports in sorted(results.items()):
+        print(f"✅ {target}: {open_ports}")
 
 def detailed_report_menu():
     print("🚧 Bu özellik yakında gelecek!")
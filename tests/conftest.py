@@ -0,0 +1,70 @@
+import errno
+import socket
+import time
+
+import pytest
+
+_real_socket = socket.socket
+
+class FakeNetwork:
+    """Sahte IPv4 TCP ağı: ``open_ports``'a bağlantı kabul edilir, gerisi sessizce düşer.
+
+    ``socket.socket`` yerine geçer; cevapsız bağlantıda ``connect_ex`` EAGAIN
+    (timeout) döner, ``sleep`` açıksa önce soket timeout'u kadar bekler.
+    IPv4 dışındaki soketler (ör. event loop'un soket çifti) gerçektir.
+    """
+
+    def __init__(self, open_ports=(), sleep=False):
+        self.open_ports = set(open_ports)
+        self.sleep = sleep
+        self.probed = []
+
+    def answers(self, port):
+        return port in self.open_ports
+
+    def socket(self, family=-1, *args, **kwargs):
+        if family not in (-1, socket.AF_INET):
+            return _real_socket(family, *args, **kwargs)
+        return FakeSocket(self)
+
+class FakeSocket:
+    def __init__(self, network):
+        self.network = network
+        self.timeout = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def setsockopt(self, *args):
+        pass
+
+    def setblocking(self, flag):
+        pass
+
+    def settimeout(self, timeout):
+        self.timeout = timeout
+
+    def connect_ex(self, address):
+        port = address[1]
+        self.network.probed.append(port)
+        if self.network.answers(port):
+            return 0
+        if self.network.sleep and self.timeout:
+            time.sleep(self.timeout)
+        return errno.EAGAIN
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    """``fake_network(open_ports, sleep=False)`` sahte ağı kurar ve döndürür."""
+    def install(open_ports=(), sleep=False):
+        network = FakeNetwork(open_ports, sleep)
+        monkeypatch.setattr(socket, 'socket', network.socket)
+        return network
+    return install
@@ -0,0 +1,48 @@
+import asyncio
+import errno
+import socket
+
+import pytest
+
+from core import async_scanner
+from core.async_scanner import AsyncPortScanner
+from core.streaming import FILTERED, OPEN
+
+@pytest.fixture
+def listener():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(16)
+    yield server.getsockname()[1]
+    server.close()
+
+def _states(scanner, probes):
+    async def collect():
+        return [result['state'] async for result in scanner.aiter_probes(probes)]
+    # Akış kilitlenirse test asılı kalmak yerine başarısız olur
+    return asyncio.run(asyncio.wait_for(collect(), 10))
+
+def test_socket_exhaustion_reports_probe_filtered(monkeypatch, listener):
+    real_socket = socket.socket
+    calls = []
+
+    def exhausted_once(family=-1, *args, **kwargs):
+        # Event loop'un kendi soketleri etkilenmez; yalnızca ilk prob soketi
+        if family == socket.AF_INET and not calls:
+            calls.append(family)
+            raise OSError(errno.EMFILE, 'Too many open files')
+        return real_socket(family, *args, **kwargs)
+
+    monkeypatch.setattr(async_scanner.socket, 'socket', exhausted_once)
+    scanner = AsyncPortScanner(max_concurrency=1, timeout=1)
+    states = _states(scanner, [('127.0.0.1', listener), ('127.0.0.1', listener)])
+    assert states == [FILTERED, OPEN]
+    assert scanner.progress.completed == 2
+
+def test_failing_probe_stream_raises_instead_of_hanging(listener):
+    def probes():
+        yield '127.0.0.1', listener
+        raise RuntimeError('probe source failed')
+
+    with pytest.raises(RuntimeError, match='probe source failed'):
+        _states(AsyncPortScanner(max_concurrency=4, timeout=1), probes())
@@ -0,0 +1,83 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from core.checkpoint import CheckpointInUse, ScanCheckpoint, checkpoint_in_use
+from core.threaded_scanner import FastPortScanner
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Probları yavaşlatılmış, checkpoint'li tarama; ebeveyn yarıda öldürür
+CHILD = '''
+import socket, sys, time
+from core import threaded_scanner
+from core.checkpoint import ScanCheckpoint
+from core.threaded_scanner import FastPortScanner
+
+class SlowSocket(socket.socket):
+    def connect_ex(self, address):
+        time.sleep(0.02)
+        return super().connect_ex(address)
+
+threaded_scanner.socket.socket = SlowSocket
+path, low, high = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+checkpoint = ScanCheckpoint(path, interval=0.05).acquire()
+checkpoint.save()
+FastPortScanner(max_threads=4, timeout=0.5, adaptive=False).scan_ports('127.0.0.1', range(low, high + 1), checkpoint=checkpoint)
+'''
+
+@pytest.fixture
+def listeners():
+    servers = []
+    for _ in range(2):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(16)
+        servers.append(server)
+    yield sorted(server.getsockname()[1] for server in servers)
+    for server in servers:
+        server.close()
+
+def _position(path):
+    try:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)['positions'][0]
+    except (OSError, ValueError):
+        return 0
+
+def test_killed_scan_is_resumed_once(tmp_path, listeners):
+    path = str(tmp_path / 'scan.json')
+    low, high = max(1, listeners[0] - 300), min(65535, listeners[-1] + 300)
+    child = subprocess.Popen([sys.executable, '-c', CHILD, path, str(low), str(high)], cwd=ROOT,
+                             stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 20
+        while _position(path) < 50:
+            assert child.poll() is None and time.monotonic() < deadline, "tarama ilerlemedi"
+            time.sleep(0.05)
+
+        # Süren tarama devam ettirilemez
+        assert checkpoint_in_use(path)
+        with pytest.raises(CheckpointInUse):
+            ScanCheckpoint.load(path).acquire()
+    finally:
+        child.send_signal(signal.SIGKILL)
+        child.wait()
+
+    assert not checkpoint_in_use(path)
+    checkpoint = ScanCheckpoint.load(path).acquire()
+    start = checkpoint.position()
+    assert 0 < start < high - low + 1
+
+    found = FastPortScanner(max_threads=32, timeout=0.5).scan_ports('127.0.0.1', range(low, high + 1),
+                                                                   checkpoint=checkpoint)
+    assert set(listeners) <= set(found)
+    assert not os.path.exists(path)
+    assert not os.path.exists(path + '.lock')
+    assert not checkpoint_in_use(path)
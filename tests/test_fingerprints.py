@@ -0,0 +1,18 @@
+from core.fingerprints import describe_service
+from core.port_scanner import PortScanner
+
+OPENSSH = 'SSH-2.0-OpenSSH_8.9p1'
+
+def test_registry_name_wins_and_banner_adds_version():
+    service = describe_service(22, banner=OPENSSH)
+    assert (service['service'], service['product'], service['version']) == ('SSH', 'OpenSSH', '8.9p1')
+
+def test_banner_names_unregistered_port():
+    assert describe_service(40022, banner=OPENSSH)['service'] == 'ssh'
+
+def test_no_banner_falls_back_to_registry():
+    assert describe_service(80) == {'service': 'HTTP', 'product': None, 'version': None, 'info': None}
+
+def test_port_scanner_uses_grabber_match():
+    match = {'service': 'ssh', 'product': 'OpenSSH', 'version': '9.6', 'info': None}
+    assert PortScanner().identify_service(40022, match=match) == match
@@ -0,0 +1,74 @@
+import errno
+import socket
+
+import pytest
+
+from core.host_health import LIVENESS_PORTS, HostHealth, tcp_alive
+from core.port_scanner import PortScanner
+
+TARGET = '198.51.100.7'
+
+def _scanner(network, **kwargs):
+    scanner = PortScanner(timeout=0.01, **kwargs)
+    # Canlılık kontrolü de aynı sahte ağdan cevap bekler
+    scanner.health.liveness_check = lambda target: any(network.answers(port) for port in LIVENESS_PORTS)
+    return scanner
+
+def test_firewalled_host_is_scanned_fully_by_default(fake_network):
+    network = fake_network(open_ports=(80, 443))
+    results = _scanner(network).scan_ports(TARGET, range(1, 1025))
+    assert [entry['port'] for entry in results['open_ports']] == [80, 443]
+    assert results['host_down'] is False
+    assert len(network.probed) == 1024
+
+def test_firewalled_host_survives_opt_in_abort(fake_network):
+    network = fake_network(open_ports=(80, 443))
+    scanner = _scanner(network, host_down_after=50)
+    results = scanner.scan_ports(TARGET, range(1, 1025))
+    assert [entry['port'] for entry in results['open_ports']] == [80, 443]
+    assert results['host_down'] is False
+    assert scanner.down_hosts() == []
+
+def test_silent_host_marked_down_after_failed_liveness_check(fake_network):
+    scanner = _scanner(fake_network(), host_down_after=50)
+    results = scanner.scan_ports(TARGET, range(1, 1025))
+    assert results['open_ports'] == []
+    assert results['host_down'] is True
+    assert scanner.down_hosts() == [TARGET]
+
+def test_liveness_check_reply_keeps_host_up():
+    health = HostHealth(down_after=3, liveness_check=lambda target: True)
+    for _ in range(3):
+        health.observe(TARGET, None)
+    health.wait()
+    assert not health.is_down(TARGET)
+    assert health.responded_hosts() == [TARGET]
+
+def test_late_reply_overrides_failed_liveness_check():
+    health = HostHealth(down_after=2, liveness_check=lambda target: False)
+    health.observe(TARGET, None)
+    health.observe(TARGET, errno.ETIMEDOUT)
+    health.wait()
+    assert health.is_down(TARGET)
+    health.observe(TARGET, errno.ECONNREFUSED)
+    assert not health.is_down(TARGET)
+
+def test_default_disables_detection():
+    health = HostHealth()
+    for _ in range(1000):
+        health.observe(TARGET, None)
+    assert not health.is_down(TARGET)
+
+@pytest.fixture
+def closed_port():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+def test_tcp_alive_counts_rst_as_reply(closed_port):
+    assert tcp_alive('127.0.0.1', ports=(closed_port,))
+
+def test_tcp_alive_unresolvable_target():
+    assert not tcp_alive('no-such-host.invalid')
@@ -0,0 +1,99 @@
+import pytest
+
+from core.port_spec import MAX_PORT, PortSet
+from core.top_ports import top_ports
+
+@pytest.mark.parametrize('spec', [
+    '80',
+    '1-1024',
+    '22,80,443,8000-8100',
+    '1-65535',
+    '22,U:53,161',
+    'U:53',
+])
+def test_canonical_spec_round_trips(spec):
+    port_set = PortSet.parse(spec)
+    assert port_set.to_spec() == spec
+    assert PortSet.parse(port_set.to_spec()) == port_set
+
+@pytest.mark.parametrize('spec, canonical', [
+    ('443, 80 ,22', '22,80,443'),
+    ('1-100,50-150', '1-150'),
+    ('1-10,11-20,21', '1-21'),
+    ('100-200,1-50,51-99', '1-200'),
+    ('80,80,80', '80'),
+    ('8000-', '8000-65535'),
+    ('-100', '1-100'),
+    ('T:22,U:53,T:80', '22,80,U:53'),
+    ('U:53,T:22', '22,U:53'),
+    ('u:161,162', 'U:161-162'),
+])
+def test_overlapping_and_adjacent_ranges_merge(spec, canonical):
+    assert PortSet.parse(spec).to_spec() == canonical
+
+def test_len_index_and_membership_follow_merged_ranges():
+    port_set = PortSet.parse('20-25,80,443')
+    assert len(port_set) == 8
+    assert list(port_set) == [20, 21, 22, 23, 24, 25, 80, 443]
+    assert [port_set[i] for i in range(len(port_set))] == list(port_set)
+    assert port_set[-1] == 443
+    assert 80 in port_set and 79 not in port_set
+    assert (port_set.first(), port_set.last()) == (20, 443)
+    with pytest.raises(IndexError):
+        port_set[8]
+
+def test_top_ports_merge_with_explicit_ports():
+    top = set(top_ports(100))
+    port_set = PortSet.parse('top:100,80,50000-50002')
+    assert set(port_set) == top | {80, 50000, 50001, 50002}
+    assert len(port_set) == len(top | {80, 50000, 50001, 50002})
+    assert PortSet.parse(port_set.to_spec()) == port_set
+
+def test_udp_top_ports():
+    port_set = PortSet.parse('U:top:10')
+    assert not port_set.tcp
+    assert list(port_set.ports('udp')) == sorted(top_ports(10, 'udp'))
+
+@pytest.mark.parametrize('spec', [
+    '0',
+    '65536',
+    '1-70000',
+    '100-50',
+    'abc',
+    '80-http',
+    '1.5',
+    'top:0',
+    'top:abc',
+    f'top:{MAX_PORT + 1}',
+    '',
+    ' , ',
+    'U:',
+])
+def test_invalid_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        PortSet.parse(spec)
+
+@pytest.mark.parametrize('ports, spec', [
+    ('22,80', '22,80'),
+    ([443, 22, 22, 80], '22,80,443'),
+    (range(1, 1025), '1-1024'),
+    (PortSet.parse('8080'), '8080'),
+])
+def test_coerce_accepts_specs_lists_and_ranges(ports, spec):
+    assert PortSet.coerce(ports).to_spec() == spec
+
+@pytest.mark.parametrize('ports', [[0], [65536], [-1]])
+def test_coerce_rejects_out_of_range_list(ports):
+    with pytest.raises(ValueError):
+        PortSet.coerce(ports)
+
+def test_tcp_port_spec_rejects_udp():
+    pytest.importorskip('pydantic')
+    from app.schemas.scan_dtos import tcp_port_spec
+
+    assert tcp_port_spec('443,22,20-21') == '20-22,443'
+    assert tcp_port_spec([80, 443]) == '80,443'
+    with pytest.raises(ValueError, match='UDP'):
+        tcp_port_spec('22,U:53')
+    with pytest.raises(ValueError, match='UDP'):
+        tcp_port_spec('U:53,161')
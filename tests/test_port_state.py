@@ -0,0 +1,30 @@
+from core.port_spec import PortSet
+from core.port_state import PortStateMap
+from core.streaming import CLOSED, OPEN
+
+def _baseline(probed, open_ports):
+    # Port durumları saklanmamış önceki tarama: denenen aralık + açık portlar
+    states = PortStateMap.from_runs([[start, end, CLOSED] for start, end in probed.tcp])
+    for port in open_ports:
+        states.set(port, OPEN)
+    return states
+
+def test_diff_ignores_ports_the_baseline_never_probed():
+    previous = _baseline(PortSet.parse('1-1024'), [22, 80])
+    current = PortStateMap.from_ports(open_ports=[22, 443, 8080], closed_ports=[80], filtered_ports=[9000])
+    assert current.diff(previous) == {'opened': [443], 'closed': [80], 'first_seen': [8080]}
+
+def test_diff_against_open_ports_only_baseline():
+    previous = PortStateMap.from_ports(open_ports=[22])
+    current = PortStateMap.from_ports(open_ports=[22, 80], closed_ports=[23])
+    assert current.diff(previous) == {'opened': [], 'closed': [], 'first_seen': [80]}
+
+def test_diff_skips_ports_not_rescanned():
+    previous = PortStateMap.from_ports(open_ports=[22, 80], closed_ports=[443])
+    current = PortStateMap.from_ports(open_ports=[443], filtered_ports=[22])
+    assert current.diff(previous) == {'opened': [443], 'closed': [22], 'first_seen': []}
+
+def test_port_set_difference():
+    probed = PortSet.parse('1-100,200-300,U:53') - PortSet.parse('95-205,250')
+    assert probed.to_spec() == '1-94,206-249,251-300,U:53'
+    assert list(PortSet.parse('1-10') - PortSet.parse('1-10')) == []
@@ -0,0 +1,101 @@
+import threading
+import time
+
+from core.rate_limiter import ProbeLimiter
+
+def _hammer(share, seconds, hold, on_acquire=None):
+    # Süre boyunca bloklayarak prob hakkı alır; alınan hak sayısını döndürür
+    count = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        share.acquire(hold=hold)
+        count += 1
+        if hold:
+            if on_acquire is not None:
+                on_acquire(share)
+            time.sleep(0.001)
+            share.release()
+    return count
+
+def _run_shares(limiter, share_count, target):
+    shares = [limiter.share().__enter__() for _ in range(share_count)]
+    results = [None] * share_count
+
+    def worker(index):
+        results[index] = target(shares[index])
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(share_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for share in shares:
+        share.__exit__(None, None, None)
+    return results
+
+def test_total_in_flight_never_exceeds_limit():
+    limiter = ProbeLimiter(rate=0, max_inflight=8)
+    peaks = {'total': 0, 'share': 0}
+    lock = threading.Lock()
+
+    def observe(share):
+        with lock:
+            peaks['total'] = max(peaks['total'], limiter.in_flight)
+            peaks['share'] = max(peaks['share'], share.in_flight)
+
+    def target(share):
+        # Her pay kendi içinde birden çok thread'le yarışır
+        counts = []
+        threads = [threading.Thread(target=lambda: counts.append(_hammer(share, 0.3, True, observe)))
+                   for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sum(counts)
+
+    counts = _run_shares(limiter, 2, target)
+    assert all(counts)
+    assert peaks['total'] <= 8
+    assert peaks['share'] <= 4
+    assert limiter.in_flight == 0
+
+def test_rate_is_split_between_active_shares():
+    limiter = ProbeLimiter(rate=400, max_inflight=0)
+    counts = _run_shares(limiter, 2, lambda share: _hammer(share, 1.0, False))
+    # Pay başına ~rate/2 = 200 token (+ başlangıç/patlama payı)
+    for count in counts:
+        assert 150 <= count <= 250
+    assert sum(counts) <= 400 * 1.15
+
+def test_departing_share_hands_back_its_quota():
+    limiter = ProbeLimiter(rate=0, max_inflight=4)
+    with limiter.share() as staying:
+        leaving = limiter.share().__enter__()
+        assert limiter.active_scans == 2
+        staying.acquire()
+        staying.acquire()
+        # Adil pay 4 / 2 = 2: üçüncü hak beklemeli
+        assert staying.try_acquire() > 0
+
+        acquired = threading.Event()
+        waiter = threading.Thread(target=lambda: (staying.acquire(), acquired.set()))
+        waiter.start()
+        assert not acquired.wait(0.1)
+
+        leaving.__exit__(None, None, None)
+        assert acquired.wait(1.0)
+        waiter.join()
+        assert limiter.active_scans == 1
+        assert limiter.fair_inflight() == 4
+        assert staying.in_flight == limiter.in_flight == 3
+        for _ in range(3):
+            staying.release()
+    assert limiter.active_scans == 0
+
+def test_departing_share_hands_back_its_rate():
+    limiter = ProbeLimiter(rate=300, max_inflight=0)
+    with limiter.share():
+        with limiter.share():
+            assert limiter.fair_rate() == 150
+        assert limiter.fair_rate() == 300
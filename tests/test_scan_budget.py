@@ -0,0 +1,23 @@
+import time
+
+from core.scan_budget import ScanBudget
+from core.scan_planner import ScanPlanner
+from core.threaded_scanner import FastPortScanner
+
+TARGET = '198.51.100.7'
+
+def test_threaded_scan_drains_queue_within_budget(fake_network):
+    # Her bağlantı timeout'a kadar bekleyip cevapsız kalır
+    fake_network(sleep=True)
+    planner = ScanPlanner([TARGET], range(1, 5001), shuffle=False)
+    budget = ScanBudget(3).start()
+    started = time.monotonic()
+    threads, timeout = budget.tune(len(planner), 1, 0.3, 100, 200, drain_rounds=FastPortScanner.QUEUE_FACTOR)
+    scanner = FastPortScanner(max_threads=threads, timeout=timeout, max_timeout=timeout, adaptive=False)
+
+    scanned = sum(1 for _ in scanner.iter_probes(budget.limit(planner), total=len(planner)))
+
+    # Kesimden sonra kuyrukta kalan problar da bütçe içinde biter
+    assert time.monotonic() - started < budget.seconds
+    unscanned = budget.unscanned(planner)[TARGET]
+    assert scanned + len(unscanned) == len(planner)
@@ -0,0 +1,69 @@
+from collections import Counter
+from itertools import product
+
+import pytest
+
+from core.port_spec import PortSet
+from core.scan_planner import ScanPlanner
+from core.top_ports import order_by_likelihood
+
+PLANS = [
+    (['127.0.0.1'], range(1, 2)),
+    (['127.0.0.1'], range(1, 1001)),
+    (['10.0.0.0/29', 'localhost'], PortSet.parse('22,80,443,8000-8010')),
+    (['192.168.1.0/30', '10.1.1.1', '10.1.1.2'], range(20, 31)),
+    (['10.0.0.0/28'], order_by_likelihood(PortSet.parse('1-200'))),
+]
+SEEDS = [0, 1, 12345]
+
+def _expected(planner):
+    return Counter(product(planner.targets(), planner.ports))
+
+@pytest.mark.parametrize('targets, ports', PLANS)
+@pytest.mark.parametrize('seed', SEEDS)
+def test_every_probe_exactly_once(targets, ports, seed):
+    planner = ScanPlanner(targets, ports, seed=seed)
+    probes = list(planner)
+    assert len(probes) == len(planner)
+    assert Counter(probes) == _expected(planner)
+
+def test_unshuffled_plan_keeps_port_order_across_targets():
+    planner = ScanPlanner(['10.0.0.1', '10.0.0.2'], [443, 22, 80], shuffle=False)
+    assert list(planner) == [('10.0.0.1', 443), ('10.0.0.2', 443), ('10.0.0.1', 22),
+                             ('10.0.0.2', 22), ('10.0.0.1', 80), ('10.0.0.2', 80)]
+
+@pytest.mark.parametrize('targets, ports', PLANS)
+@pytest.mark.parametrize('shuffle', [True, False])
+def test_iter_from_is_tail_of_full_stream(targets, ports, shuffle):
+    planner = ScanPlanner(targets, ports, seed=7, shuffle=shuffle)
+    full = list(planner)
+    for start in {0, 1, len(full) // 3, len(full) - 1, len(full)}:
+        assert list(planner.iter_from(start)) == full[start:]
+
+@pytest.mark.parametrize('targets, ports', PLANS)
+@pytest.mark.parametrize('shard_count', [1, 2, 3, 7])
+@pytest.mark.parametrize('seed', SEEDS)
+def test_shards_partition_the_plan(targets, ports, shard_count, seed):
+    planner = ScanPlanner(targets, ports, seed=seed)
+    full = list(planner)
+    union = Counter()
+    for shard in range(shard_count):
+        indices = list(planner.iter_indices(shard, shard_count))
+        assert len(indices) == planner.shard_size(shard, shard_count)
+        # Shard i tam akışın i, i + S, i + 2S, ... elemanlarıdır
+        assert [planner.probe_at(index) for index in indices] == full[shard::shard_count]
+        union.update(planner.probe_at(index) for index in indices)
+    assert union == _expected(planner)
+
+@pytest.mark.parametrize('shard_count', [2, 3])
+def test_shard_resume_is_tail_of_shard(shard_count):
+    planner = ScanPlanner(['10.0.0.0/29'], range(1, 51), seed=3)
+    for shard in range(shard_count):
+        indices = list(planner.iter_indices(shard, shard_count))
+        for start in (1, len(indices) // 2, len(indices)):
+            assert list(planner.iter_indices(shard, shard_count, start)) == indices[start:]
+
+def test_same_seed_same_order():
+    first = list(ScanPlanner(['10.0.0.0/28'], range(1, 100), seed=42))
+    assert first == list(ScanPlanner(['10.0.0.0/28'], range(1, 100), seed=42))
+    assert first != list(ScanPlanner(['10.0.0.0/28'], range(1, 100), seed=43))
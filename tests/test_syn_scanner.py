@@ -0,0 +1,51 @@
+import os
+import socket
+
+import pytest
+
+from core.streaming import CLOSED, OPEN
+from core.syn_scanner import SynPortScanner
+
+def _raw_socket_available():
+    if not hasattr(os, 'geteuid') or os.geteuid() != 0:
+        return False
+    try:
+        SynPortScanner.open_raw_socket().close()
+    except OSError:
+        return False
+    return True
+
+pytestmark = pytest.mark.skipif(not _raw_socket_available(), reason="SYN taraması root/CAP_NET_RAW gerektirir")
+
+@pytest.fixture
+def listener():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(16)
+    yield server.getsockname()[1]
+    server.close()
+
+def _closed_port():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    probe.bind(('127.0.0.1', 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+def _states(scanner, probes):
+    return {(result['target'], result['port']): result['state'] for result in scanner.iter_probes(probes)}
+
+def test_loopback_open_and_closed(listener):
+    closed = _closed_port()
+    states = _states(SynPortScanner(rate=1000, wait=0.5), [('127.0.0.1', listener), ('127.0.0.1', closed)])
+    assert states == {('127.0.0.1', listener): OPEN, ('127.0.0.1', closed): CLOSED}
+
+def test_hostname_target_reported_by_name(listener):
+    scanner = SynPortScanner(rate=1000, wait=0.5)
+    assert scanner.scan_ports('localhost', [listener]) == [listener]
+
+def test_unresolvable_target_does_not_abort_sweep(listener):
+    scanner = SynPortScanner(rate=1000, wait=0.5, host_down_after=1)
+    states = _states(scanner, [('no-such-host.invalid', 80), ('127.0.0.1', listener)])
+    assert states == {('127.0.0.1', listener): OPEN}
+    assert scanner.down_hosts() == ['no-such-host.invalid']